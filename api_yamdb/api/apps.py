@@ -3,3 +3,15 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = "api"
+
+    def ready(self):
+        from django.core.signals import request_started
+        from django.db.backends.signals import connection_created
+
+        from api_yamdb.db.connections import (count_new_connection,
+                                              reset_health_checks)
+
+        from . import signals  # noqa: F401
+
+        request_started.connect(reset_health_checks)
+        connection_created.connect(count_new_connection)
@@ -0,0 +1,100 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+TOKEN_CLAIMS = ("username", "role", "is_staff", "is_active")
+
+# Когда сняты утверждения: iat округлён до секунды, а изменение
+# в ту же секунду после выдачи токена не должно его отзывать.
+CLAIMS_TIME = "claims_time"
+
+CLAIMS_CHANGED_KEY = "jwt-claims-changed:{}"
+
+
+def add_user_claims(token, user):
+    """Кладёт в токен поля, которых хватает разрешениям и ответам API."""
+    for claim in TOKEN_CLAIMS:
+        token[claim] = getattr(user, claim)
+    token[CLAIMS_TIME] = time.time()
+    return token
+
+
+def get_claims_cache():
+    return caches[settings.CLAIMS_CACHE_ALIAS]
+
+
+def claims_cache_shared():
+    """
+    Отметку из одного процесса должны видеть все: с кешем в памяти
+    процесса утверждениям токена верить нельзя.
+    """
+    return not isinstance(get_claims_cache(), (LocMemCache, DummyCache))
+
+
+def mark_claims_changed(user_id):
+    """
+    Токены, выпущенные раньше этого момента, считаются устаревшими
+    и проверяются по базе. Отметка живёт не дольше самого токена.
+    """
+    get_claims_cache().set(
+        CLAIMS_CHANGED_KEY.format(user_id),
+        time.time(),
+        settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"].total_seconds(),
+    )
+
+
+def claims_changed_since(user_id, issued_at):
+    changed_at = get_claims_cache().get(CLAIMS_CHANGED_KEY.format(user_id))
+    return changed_at is not None and changed_at >= issued_at
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication без SELECT пользователя на каждый запрос.
+
+    Пользователь собирается из утверждений токена как экземпляр User
+    с отложенными полями: остальные поля загрузятся из базы, только
+    если к ним обратится view. Токены без утверждений или выпущенные
+    до изменения пользователя проверяются по базе как раньше; так же
+    и все токены, если кеш отметок не общий для процессов.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if (
+            user_id is None
+            or not claims_cache_shared()
+            or any(
+                claim not in validated_token
+                for claim in (*TOKEN_CLAIMS, CLAIMS_TIME)
+            )
+            or claims_changed_since(user_id, validated_token[CLAIMS_TIME])
+        ):
+            return super().get_user(validated_token)
+        if not validated_token["is_active"]:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        claims = dict(
+            {api_settings.USER_ID_FIELD: user_id},
+            **{claim: validated_token[claim] for claim in TOKEN_CLAIMS},
+        )
+        # from_db ждёт значения в порядке полей модели.
+        fields = [
+            field.attname
+            for field in self.user_model._meta.concrete_fields
+            if field.attname in claims
+        ]
+        return self.user_model.from_db(
+            router.db_for_read(self.user_model),
+            fields,
+            [claims[field] for field in fields],
+        )
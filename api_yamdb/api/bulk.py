@@ -0,0 +1,249 @@
+import math
+
+from django.db import DatabaseError, connections, router, transaction
+from django.db.models import Max
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.relations import ManyRelatedField
+from rest_framework.response import Response
+from rest_framework.validators import UniqueValidator
+
+from .cache import invalidate
+from .instrumentation import extend_query_budget
+from .serializers import PrefetchedSlugRelatedField
+
+
+def bulk_insert(model, objs, with_ids):
+    """
+    bulk_create, после которого у объектов есть id, если with_ids.
+    Postgres возвращает id из INSERT. SQLite не умеет: id вставленных
+    строк перечитываются — это строки с id больше MAX(id) до вставки.
+    Если между чтением MAX(id) и вставкой строки добавил кто-то ещё,
+    новых id будет больше, чем объектов, и транзакция откатится.
+    """
+    database = router.db_for_write(model)
+    queryset = model.objects.using(database)
+    features = connections[database].features
+    with transaction.atomic(using=database, savepoint=False):
+        if not with_ids or features.can_return_rows_from_bulk_insert:
+            queryset.bulk_create(objs)
+            return
+        last_id = queryset.aggregate(last_id=Max("id"))["last_id"] or 0
+        queryset.bulk_create(objs)
+        ids = list(
+            queryset.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        if len(ids) != len(objs):
+            raise DatabaseError(
+                f"Вставлено {len(objs)} строк {model._meta.db_table}, "
+                f"а новых id {len(ids)}"
+            )
+        for obj, obj_id in zip(objs, ids):
+            obj.id = obj_id
+
+
+def insert_batches(model, objs):
+    """Сколько INSERT сделает bulk_create для объектов без id."""
+    if not objs:
+        return 0
+    fields = [
+        field for field in model._meta.concrete_fields if not field.primary_key
+    ]
+    ops = connections[router.db_for_write(model)].ops
+    return math.ceil(len(objs) / max(ops.bulk_batch_size(fields, objs), 1))
+
+
+class BulkCreateMixin:
+    """
+    POST {список}/bulk/ со списком объектов: все проверяются за один
+    проход и вставляются через bulk_create. Слаги связанных объектов
+    (PrefetchedSlugRelatedField) разрешаются одним IN на модель,
+    уникальные поля проверяются одним IN на поле. Ответ — по элементу
+    на каждый объект: {lookup_field: ...} или {"errors": {...}}.
+    """
+
+    bulk_max_items = 1000
+    # Метки кеша ответов, которые сбрасывает вставка.
+    bulk_cache_tags = ()
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        items = self.get_bulk_items(request)
+        serializer = self.get_serializer()
+        results, valid = self.validate_items(serializer, items)
+        lookup = "id" if self.lookup_field == "pk" else self.lookup_field
+        created = self.bulk_save(
+            serializer.Meta.model, valid, with_ids=lookup == "id"
+        )
+        if created:
+            invalidate(*self.bulk_cache_tags)
+        created = iter(created)
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = {lookup: getattr(next(created), lookup)}
+
+        if len(valid) == len(items):
+            response_status = status.HTTP_201_CREATED
+        elif valid:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {
+                "created": len(valid),
+                "failed": len(items) - len(valid),
+                "results": results,
+            },
+            status=response_status,
+        )
+
+    def get_bulk_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError(
+                {"non_field_errors": ["Ожидается непустой список объектов."]}
+            )
+        if len(items) > self.bulk_max_items:
+            raise ValidationError(
+                {
+                    "non_field_errors": [
+                        f"Не больше {self.bulk_max_items} объектов за раз."
+                    ]
+                }
+            )
+        return items
+
+    def validate_items(self, serializer, items):
+        """
+        Проверяет объекты одним сериализатором. Возвращает результаты
+        (ошибки или None для прошедших проверку) и данные прошедших.
+        """
+        unique_fields = self.take_unique_validators(serializer)
+        serializer.context["related"] = self.prefetch_related_slugs(
+            serializer, items
+        )
+        taken = {
+            name: self.existing_values(serializer, name, items)
+            for name in unique_fields
+        }
+        results = []
+        valid = []
+        for item in items:
+            try:
+                data = serializer.run_validation(item)
+                self.check_unique(data, taken)
+            except ValidationError as error:
+                results.append({"errors": error.detail})
+                continue
+            results.append(None)
+            valid.append(data)
+        return results, valid
+
+    def take_unique_validators(self, serializer):
+        """
+        Убирает UniqueValidator у полей: вместо запроса на каждый объект
+        занятые значения проверяются одним IN на всю пачку.
+        """
+        unique_fields = []
+        for name, field in serializer.fields.items():
+            validators = [
+                validator
+                for validator in field.validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+            if len(validators) != len(field.validators):
+                field.validators = validators
+                unique_fields.append(name)
+        return unique_fields
+
+    def prefetch_related_slugs(self, serializer, items):
+        related = {}
+        for name, field in serializer.fields.items():
+            many = isinstance(field, ManyRelatedField)
+            if many:
+                field = field.child_relation
+            if not isinstance(field, PrefetchedSlugRelatedField):
+                continue
+            slugs = set()
+            for item in items:
+                value = item.get(name) if isinstance(item, dict) else None
+                values = value if many and isinstance(value, list) else [value]
+                slugs.update(
+                    slug for slug in values if isinstance(slug, (str, int))
+                )
+            queryset = field.get_queryset().filter(
+                **{f"{field.slug_field}__in": slugs}
+            )
+            model_related = related.setdefault(queryset.model, {})
+            for obj in queryset:
+                model_related[str(getattr(obj, field.slug_field))] = obj
+        return related
+
+    def existing_values(self, serializer, name, items):
+        field = serializer.fields[name]
+        values = {
+            item.get(name)
+            for item in items
+            if isinstance(item, dict) and isinstance(item.get(name), str)
+        }
+        model = serializer.Meta.model
+        return set(
+            model.objects.filter(
+                **{f"{field.source}__in": values}
+            ).values_list(field.source, flat=True)
+        )
+
+    def check_unique(self, data, taken):
+        for name, values in taken.items():
+            if data.get(name) in values:
+                raise ValidationError(
+                    {name: ["Объект с таким значением уже существует."]}
+                )
+        # Повтор внутри пачки — тоже ошибка этого объекта.
+        for name, values in taken.items():
+            values.add(data.get(name))
+
+    def bulk_save(self, model, valid, with_ids=False):
+        m2m_fields = [
+            field
+            for field in model._meta.many_to_many
+            if any(field.name in data for data in valid)
+        ]
+        objs = []
+        links = []
+        for data in valid:
+            data = dict(data)
+            links.append(
+                {
+                    field: list(dict.fromkeys(data.pop(field.name, ())))
+                    for field in m2m_fields
+                }
+            )
+            objs.append(model(**data))
+        if not objs:
+            return objs
+        # Бюджет запросов рассчитан на один INSERT на модель, а большие
+        # вставки делятся на части (на SQLite — по 999 параметров).
+        extend_query_budget(
+            self.request._request, insert_batches(model, objs) - 1
+        )
+        with transaction.atomic(using=router.db_for_write(model)):
+            bulk_insert(model, objs, with_ids=with_ids or bool(m2m_fields))
+            for field in m2m_fields:
+                through = field.remote_field.through
+                source = f"{field.m2m_field_name()}_id"
+                target = f"{field.m2m_reverse_field_name()}_id"
+                rows = [
+                    through(**{source: obj.id, target: related.pk})
+                    for obj, obj_links in zip(objs, links)
+                    for related in obj_links[field]
+                ]
+                extend_query_budget(
+                    self.request._request,
+                    max(insert_batches(through, rows) - 1, 0),
+                )
+                through.objects.bulk_create(rows)
+        return objs
@@ -0,0 +1,86 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+TAG_KEY = "response-tag:{}"
+BUMPED_KEY = "response-tag-bumped:{}"
+RESPONSE_KEY = "response:{}"
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def new_version():
+    return f"{time.time():.6f}"
+
+
+def tag_versions(tags):
+    """
+    Текущие версии меток: время последнего изменения в секундах.
+    Версия метки входит в ключ ответа и в ETag, поэтому смена версии
+    делает недоступными все ответы с этой меткой.
+    """
+    cache = get_cache()
+    keys = [TAG_KEY.format(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, new_version(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def request_digest(request, versions, *extra):
+    parts = [
+        request.build_absolute_uri(),
+        request.META.get("HTTP_ACCEPT", ""),
+        *extra,
+        *versions,
+    ]
+    return hashlib.md5("\n".join(parts).encode()).hexdigest()
+
+
+def response_key(request, versions):
+    return RESPONSE_KEY.format(request_digest(request, versions))
+
+
+def response_etag(request, versions):
+    # Браузерный API показывает текущего пользователя, поэтому
+    # токен тоже входит в ETag.
+    authorization = request.META.get("HTTP_AUTHORIZATION", "")
+    return '"{}"'.format(request_digest(request, versions, authorization))
+
+
+def bump_tags(tags):
+    version = new_version()
+    cache = get_cache()
+    cache.set_many({TAG_KEY.format(tag): version for tag in tags}, None)
+    if settings.DATABASE_REPLICAS:
+        cache.set_many(
+            {BUMPED_KEY.format(tag): True for tag in tags},
+            settings.REPLICA_PIN_SECONDS,
+        )
+
+
+def recently_bumped(tags):
+    """
+    Менялась ли какая-то метка за последние REPLICA_PIN_SECONDS: реплика
+    могла ещё не получить изменение, а ответ с неё закешировался бы под
+    новой версией меток.
+    """
+    if not settings.DATABASE_REPLICAS:
+        return False
+    return bool(get_cache().get_many([BUMPED_KEY.format(t) for t in tags]))
+
+
+def invalidate(*tags):
+    """
+    Сбрасывает ответы с метками сразу и ещё раз после коммита:
+    иначе читатель между записью и коммитом закеширует старые данные.
+    """
+    bump_tags(tags)
+    transaction.on_commit(lambda: bump_tags(tags))
@@ -0,0 +1,157 @@
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from .cache import get_cache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Сжимаются только ответы API: HTML браузерного API несёт CSRF-токен,
+# и сжатие открыло бы его для атаки BREACH.
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/plain",
+)
+
+
+class GzipEncoder:
+    def __init__(self):
+        self.compressor = zlib.compressobj(
+            settings.COMPRESSION_GZIP_LEVEL,
+            zlib.DEFLATED,
+            zlib.MAX_WBITS | 16,
+        )
+
+    def compress(self, content):
+        return self.compressor.compress(content) + self.compressor.flush()
+
+    def stream(self, parts):
+        # Z_SYNC_FLUSH после каждой части: клиент получает данные
+        # по мере выгрузки, а не в конце.
+        for part in parts:
+            yield self.compressor.compress(part) + self.compressor.flush(
+                zlib.Z_SYNC_FLUSH
+            )
+        yield self.compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self):
+        self.compressor = brotli.Compressor(
+            quality=settings.COMPRESSION_BROTLI_QUALITY
+        )
+
+    def compress(self, content):
+        return self.compressor.process(content) + self.compressor.finish()
+
+    def stream(self, parts):
+        for part in parts:
+            yield self.compressor.process(part) + self.compressor.flush()
+        yield self.compressor.finish()
+
+
+# В порядке предпочтения при равном q.
+ENCODERS = {"gzip": GzipEncoder}
+if brotli is not None:
+    ENCODERS = {"br": BrotliEncoder, **ENCODERS}
+
+
+def accepted_encodings(header):
+    """{кодировка: q} из заголовка Accept-Encoding."""
+    accepted = {}
+    for item in header.split(","):
+        coding, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip():
+            accepted[coding.strip().lower()] = quality
+    return accepted
+
+
+def choose_encoding(header):
+    accepted = accepted_encodings(header)
+    best, best_quality = None, 0.0
+    for encoding in ENCODERS:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(response):
+    content_type = response.get("Content-Type", "").split(";")[0].strip()
+    if (
+        response.has_header("Content-Encoding")
+        or content_type not in COMPRESSIBLE_TYPES
+    ):
+        return False
+    if response.streaming:
+        return response.status_code == 200
+    return len(response.content) >= settings.COMPRESSION_MIN_SIZE
+
+
+class CompressionMiddleware:
+    """
+    Сжимает ответы API в br (если установлен brotli) или gzip по
+    Accept-Encoding. Ответы меньше COMPRESSION_MIN_SIZE не сжимаются,
+    потоковые (выгрузки) сжимаются по частям. Для ответов из кеша
+    (CachedReadMixin задаёт compression_cache_key) сжатый вариант
+    тоже кешируется и не пересчитывается на каждое попадание.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not is_compressible(response):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = choose_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", "")
+        )
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = ENCODERS[encoding]().stream(
+                response.streaming_content
+            )
+            del response["Content-Length"]
+        else:
+            content = self.compressed_content(response, encoding)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response["Content-Length"] = str(len(content))
+
+        # Сжатый ответ не совпадает с исходным байт в байт.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = encoding
+        return response
+
+    def compressed_content(self, response, encoding):
+        key = getattr(response, "compression_cache_key", None)
+        if key is None:
+            return ENCODERS[encoding]().compress(response.content)
+        cache = get_cache()
+        key = f"{key}:{encoding}"
+        content = cache.get(key)
+        if content is None:
+            content = ENCODERS[encoding]().compress(response.content)
+            cache.set(key, content, settings.RESPONSE_CACHE_TIMEOUT)
+        return content
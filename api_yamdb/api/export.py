@@ -0,0 +1,160 @@
+import csv
+import json
+import zlib
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.db import connections, transaction
+from reviews.models import Comment, Review
+from titles.models import Category, Genre, Title
+
+# columns — пары (столбец файла, поле модели), id всегда первым.
+Dataset = namedtuple("Dataset", "model columns")
+
+# Имена и столбцы совпадают с static/data/*.csv: выгрузку можно
+# загрузить обратно командой import_csv.
+DATASETS = {
+    "category": Dataset(
+        Category, (("id", "id"), ("name", "name"), ("slug", "slug"))
+    ),
+    "genre": Dataset(
+        Genre, (("id", "id"), ("name", "name"), ("slug", "slug"))
+    ),
+    "titles": Dataset(
+        Title,
+        (
+            ("id", "id"),
+            ("name", "name"),
+            ("year", "year"),
+            ("category", "category_id"),
+            ("description", "description"),
+        ),
+    ),
+    "genre_title": Dataset(
+        Title.genre.through,
+        (("id", "id"), ("title_id", "title_id"), ("genre_id", "genre_id")),
+    ),
+    "review": Dataset(
+        Review,
+        (
+            ("id", "id"),
+            ("title_id", "title_id"),
+            ("text", "text"),
+            ("author", "author_id"),
+            ("score", "score"),
+            ("pub_date", "pub_date"),
+        ),
+    ),
+    "comments": Dataset(
+        Comment,
+        (
+            ("id", "id"),
+            ("review_id", "review_id"),
+            ("text", "text"),
+            ("author", "author_id"),
+            ("pub_date", "pub_date"),
+        ),
+    ),
+}
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+
+
+@contextmanager
+def snapshot(using):
+    """
+    Одна транзакция на всю выгрузку. В Postgres — REPEATABLE READ:
+    все пачки читаются из одного снимка, даже если каталог меняется
+    во время выгрузки.
+    """
+    connection = connections[using]
+    # Уровень изоляции задаётся только первым запросом транзакции.
+    outermost = not connection.in_atomic_block
+    with transaction.atomic(using=using):
+        if outermost and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ"
+                )
+        yield
+
+
+def format_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    return value
+
+
+def chunks(dataset, using, chunk_size):
+    """
+    Строки пачками по chunk_size по ключу id: WHERE id > последний.
+    Память не зависит от размера таблицы, запрос идёт по первичному
+    ключу и работает за pgbouncer, где серверные курсоры выключены.
+    """
+    fields = [field for _, field in dataset.columns]
+    queryset = dataset.model.objects.using(using).order_by("id")
+    last_id = 0
+    while True:
+        rows = list(
+            queryset.filter(id__gt=last_id).values_list(*fields)[:chunk_size]
+        )
+        if rows:
+            yield [tuple(map(format_value, row)) for row in rows]
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1][0]
+
+
+class Echo:
+    """Файл для csv.writer, который возвращает строку, а не пишет её."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(dataset, using, chunk_size):
+    writer = csv.writer(Echo())
+    yield writer.writerow([column for column, _ in dataset.columns])
+    for rows in chunks(dataset, using, chunk_size):
+        yield "".join(writer.writerow(row) for row in rows)
+
+
+def ndjson_lines(dataset, using, chunk_size):
+    columns = [column for column, _ in dataset.columns]
+    for rows in chunks(dataset, using, chunk_size):
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+
+def gzip_stream(parts):
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for part in parts:
+        compressed = compressor.compress(part)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export(name, file_format, using, chunk_size, compress=False):
+    """
+    Выгрузка набора name в формате csv или ndjson: байты пачками
+    по chunk_size строк, при compress — в gzip. Транзакцию открывает
+    вызывающий, см. snapshot.
+    """
+    lines = {"csv": csv_lines, "ndjson": ndjson_lines}[file_format]
+    parts = (
+        line.encode() for line in lines(DATASETS[name], using, chunk_size)
+    )
+    return gzip_stream(parts) if compress else parts
+
+
+def stream(name, file_format, using, chunk_size, compress=False):
+    """export в отдельном снимке для StreamingHttpResponse."""
+    with snapshot(using):
+        yield from export(name, file_format, using, chunk_size, compress)
@@ -0,0 +1,144 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("api.sql")
+
+# IN (%s, %s, %s) с разным числом параметров — один и тот же запрос.
+IN_LIST = re.compile(r"\((?:%s, )+%s\)")
+
+
+def fingerprint(sql):
+    return IN_LIST.sub("(%s, ...)", " ".join(sql.split()))
+
+
+class QueryBudgetError(Exception):
+    pass
+
+
+class QueryRecorder:
+    """Обёртка execute_wrapper: запоминает каждый запрос и его время."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - started))
+
+    def summary(self):
+        duplicates = Counter(fingerprint(sql) for sql, _ in self.queries)
+        slowest = max(self.queries, key=lambda query: query[1], default=None)
+        return {
+            "queries": len(self.queries),
+            "db_ms": round(sum(dur for _, dur in self.queries) * 1000, 3),
+            "duplicates": [
+                {"sql": sql, "count": count}
+                for sql, count in duplicates.most_common()
+                if count > 1
+            ],
+            "slowest": slowest
+            and {"sql": slowest[0], "ms": round(slowest[1] * 1000, 3)},
+        }
+
+
+def view_budget(view_func, method):
+    """
+    Бюджет запросов из атрибута query_budgets класса представления:
+    {"list": 3, "retrieve": 2} для вьюсетов, {"post": 4} для APIView.
+    """
+    budgets = getattr(getattr(view_func, "cls", None), "query_budgets", {})
+    actions = getattr(view_func, "actions", None) or {}
+    action = actions.get(method.lower(), method.lower())
+    return action, budgets.get(action)
+
+
+def extend_query_budget(request, queries):
+    """
+    Добавляет к бюджету текущего запроса запросы, число которых зависит
+    от данных, например части большого INSERT.
+    """
+    action, budget = getattr(request, "query_budget", (None, None))
+    if budget is not None:
+        request.query_budget = (action, budget + queries)
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Считает SQL-запросы каждого запроса: число, суммарное время,
+    повторяющиеся запросы, самый медленный и новые соединения. Отдаёт
+    их в Server-Timing и пишет строкой JSON в лог api.sql; при превышении
+    бюджета представления пишет предупреждение, а с QUERY_BUDGET_STRICT
+    бросает QueryBudgetError.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request.query_budget = (None, None)
+        # Соединения, которые запрос откроет сам: без CONN_MAX_AGE и пула
+        # это каждый запрос, и время соединения входит в его задержку.
+        closed = [
+            connection
+            for connection in connections.all()
+            if connection.connection is None
+        ]
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        stats = recorder.summary()
+        stats["connections_opened"] = sum(
+            connection.connection is not None for connection in closed
+        )
+        action, budget = request.query_budget
+        stats.update(
+            method=request.method,
+            path=request.path,
+            action=action,
+            status=response.status_code,
+            budget=budget,
+        )
+        response.sql_stats = stats
+        self.add_server_timing(response, stats)
+
+        exceeded = budget is not None and stats["queries"] > budget
+        logger.log(
+            logging.WARNING if exceeded else logging.INFO,
+            json.dumps(stats, ensure_ascii=False),
+        )
+        if exceeded and settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetError(
+                f"{request.method} {request.path}: {stats['queries']} "
+                f"запросов при бюджете {budget}"
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = view_budget(view_func, request.method)
+
+    def add_server_timing(self, response, stats):
+        metrics = [
+            f'db;dur={stats["db_ms"]};desc="{stats["queries"]} queries"'
+        ]
+        if stats["slowest"]:
+            metrics.append(f"db-slowest;dur={stats['slowest']['ms']}")
+        if stats["connections_opened"]:
+            metrics.append(f'db-connect;desc="{stats["connections_opened"]}"')
+        if stats["duplicates"]:
+            repeated = sum(item["count"] for item in stats["duplicates"])
+            metrics.append(f'db-duplicates;desc="{repeated}"')
+        if response.has_header("Server-Timing"):
+            metrics.insert(0, response["Server-Timing"])
+        response["Server-Timing"] = ", ".join(metrics)
@@ -0,0 +1,68 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from ...export import DATASETS, FORMATS, export, snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Выгружает таблицы в файлы вида static/data/*.csv (или NDJSON) "
+        "пачками по --chunk-size строк из одного снимка базы; память "
+        "не зависит от размера таблиц."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Каталог для файлов.")
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument(
+            "--gzip", action="store_true", help="Сжимать файлы в .gz."
+        )
+        parser.add_argument(
+            "--dataset",
+            action="append",
+            choices=list(DATASETS),
+            help="Выгрузить только эти наборы (можно несколько раз).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.EXPORT_CHUNK_SIZE,
+            help="Сколько строк читать за один запрос.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Из какой базы читать, например replica.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.isdir(path):
+            raise CommandError(f"Каталог {path} не найден")
+        file_format = options["format"]
+        compress = options["gzip"]
+        using = options["database"]
+        with snapshot(using):
+            for name in options["dataset"] or DATASETS:
+                filename = f"{name}.{file_format}" + (
+                    ".gz" if compress else ""
+                )
+                started = time.monotonic()
+                size = 0
+                with open(os.path.join(path, filename), "wb") as file:
+                    for part in export(
+                        name,
+                        file_format,
+                        using,
+                        options["chunk_size"],
+                        compress=compress,
+                    ):
+                        size += file.write(part)
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"{filename}: {size / 2 ** 20:.1f} МБ за {elapsed:.2f} с"
+                )
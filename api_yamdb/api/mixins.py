@@ -1,5 +1,93 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
 from rest_framework import mixins, viewsets
 
+from api_yamdb.db.routers import read_from_primary
+from api_yamdb.metrics import RESPONSE_CACHE
+
+from .cache import (get_cache, recently_bumped, response_etag, response_key,
+                    tag_versions)
+
+
+class CachedReadMixin:
+    """
+    Условные GET и кеш ответов для list и retrieve.
+
+    cache_tags задаёт метки по действиям, например
+    {"retrieve": ("title:{pk}",)}; подстановки берутся из self.kwargs.
+    По версиям меток считается ETag: если анонимный клиент прислал
+    актуальный, сразу отдаётся 304 без обращения к базе; запросу
+    с токеном — только после проверки токена и прав. Ответы анонимным
+    запросам дополнительно кешируются целиком. Пока реплика может
+    отставать от недавнего изменения меток, данные читаются с основной
+    базы.
+    """
+
+    cache_tags = {}
+
+    def get_cache_tags(self, request):
+        # self.action появится только внутри dispatch.
+        action = self.action_map.get(request.method.lower())
+        return [
+            tag.format(**self.kwargs)
+            for tag in self.cache_tags.get(action, ())
+        ]
+
+    def dispatch(self, request, *args, **kwargs):
+        tags = self.get_cache_tags(request)
+        if not tags or request.method != "GET":
+            return super().dispatch(request, *args, **kwargs)
+
+        if recently_bumped(tags):
+            read_from_primary()
+        versions = tag_versions(tags)
+        etag = response_etag(request, versions)
+        if "HTTP_AUTHORIZATION" in request.META:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code == 200:
+                response["ETag"] = etag
+                not_modified = get_conditional_response(
+                    request, etag=etag, response=response
+                )
+                if not_modified is not None:
+                    RESPONSE_CACHE.labels("not_modified").inc()
+                    return not_modified
+            RESPONSE_CACHE.labels("bypass").inc()
+            return response
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            RESPONSE_CACHE.labels("not_modified").inc()
+            return not_modified
+
+        cache = get_cache()
+        key = response_key(request, versions)
+        cached = cache.get(key)
+        if cached is not None:
+            RESPONSE_CACHE.labels("hit").inc()
+            content, headers = cached
+            response = HttpResponse(content)
+            for header, value in headers:
+                response[header] = value
+            response.compression_cache_key = key
+            return response
+
+        RESPONSE_CACHE.labels("miss").inc()
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            response["ETag"] = etag
+            # Рядом с ответом кешируются и его сжатые варианты.
+            response.compression_cache_key = key
+            response.add_post_render_callback(
+                lambda rendered: cache.set(
+                    key,
+                    (rendered.content, list(rendered.items())),
+                    settings.RESPONSE_CACHE_TIMEOUT,
+                )
+            )
+        return response
+
 
 class CreateListDestroyViewSet(
     mixins.CreateModelMixin,
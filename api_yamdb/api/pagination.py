@@ -0,0 +1,118 @@
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (Cursor, CursorPagination,
+                                       LimitOffsetPagination)
+from rest_framework.response import Response
+
+
+class PubDateCursorPagination(CursorPagination):
+    """
+    Постраничный вывод по ключу (pub_date, id) без OFFSET и COUNT(*).
+    Новые записи не сдвигают уже выданные страницы.
+    """
+
+    ordering = ("-pub_date", "-id")
+    page_size_query_param = "limit"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, position = False, None
+        else:
+            reverse, position = self.cursor.reverse, self.cursor.position
+
+        if reverse:
+            queryset = queryset.order_by("pub_date", "id")
+        else:
+            queryset = queryset.order_by("-pub_date", "-id")
+        if position is not None:
+            pub_date, pk = self.parse_position(position)
+            lookup = "gt" if reverse else "lt"
+            queryset = queryset.filter(
+                Q(**{f"pub_date__{lookup}": pub_date})
+                | Q(pub_date=pub_date, **{f"id__{lookup}": pk})
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        if self.page:
+            self.previous_position = self.get_position(self.page[0])
+            self.next_position = self.get_position(self.page[-1])
+        else:
+            self.has_next = self.has_previous = False
+        return self.page
+
+    def get_position(self, instance):
+        return f"{instance.pub_date.isoformat()}|{instance.id}"
+
+    def parse_position(self, position):
+        pub_date, _, pk = position.rpartition("|")
+        try:
+            pub_date = parse_datetime(pub_date)
+            pk = int(pk)
+        except ValueError:
+            pub_date = None
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return pub_date, pk
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=self.next_position)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=self.previous_position)
+        )
+
+
+class LimitOffsetOrCursorPagination(LimitOffsetPagination):
+    """
+    По умолчанию limit/offset, а с параметром cursor (можно пустым)
+    переключается на PubDateCursorPagination.
+    """
+
+    cursor_pagination_class = PubDateCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        cursor_paginator = self.cursor_pagination_class()
+        if cursor_paginator.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = cursor_paginator
+        return cursor_paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class TopPagination(LimitOffsetPagination):
+    """Первые limit объектов без COUNT(*), OFFSET и ссылок на страницы."""
+
+    default_limit = 10
+    max_limit = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        return list(queryset[: self.limit])
+
+    def get_paginated_response(self, data):
+        return Response(data)
@@ -13,7 +13,7 @@ class IsAuthorOrStaff(permissions.BasePermission):
         return (
             request.method in permissions.SAFE_METHODS
             or request.user.role in ["admin", "moderator"]
-            or obj.author == request.user
+            or obj.author_id == request.user.id
         )
 
 
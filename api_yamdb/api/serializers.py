@@ -1,10 +1,36 @@
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.shortcuts import get_object_or_404
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 from reviews.models import Comment, Review
 from titles.models import Category, Genre, Title
 from users.models import ROLE_CHOICES, User
 
+from .representation import FastRepresentationMixin
+
+
+class PrefetchedSlugRelatedField(serializers.SlugRelatedField):
+    """
+    SlugRelatedField, который берёт объекты из context["related"]
+    ({модель: {слаг: объект}}), если их заранее загрузили одним IN
+    на всю пачку (см. api.bulk); иначе — запрос на каждое значение.
+    """
+
+    def to_internal_value(self, data):
+        related = self.context.get("related")
+        if related is None:
+            return super().to_internal_value(data)
+        if not isinstance(data, (str, int)):
+            self.fail("invalid")
+        try:
+            return related[self.get_queryset().model][str(data)]
+        except KeyError:
+            self.fail(
+                "does_not_exist",
+                slug_name=self.slug_field,
+                value=smart_str(data),
+            )
+
 
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -24,7 +50,7 @@ class GenreSerializer(serializers.ModelSerializer):
         )
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(FastRepresentationMixin, serializers.ModelSerializer):
     genre = GenreSerializer(required=True, many=True)
     category = CategorySerializer(required=True)
 
@@ -35,17 +61,38 @@ class TitleSerializer(serializers.ModelSerializer):
             "name",
             "year",
             "rating",
+            "reviews_count",
             "description",
             "genre",
             "category",
         )
 
 
+class TitleRatingSerializer(serializers.ModelSerializer):
+    histogram = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Title
+        fields = (
+            "id",
+            "rating",
+            "average_rating",
+            "weighted_rating",
+            "reviews_count",
+            "histogram",
+        )
+
+    def get_histogram(self, title):
+        return {
+            str(score): count for score, count in title.histogram().items()
+        }
+
+
 class TitlePostSerializer(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
+    genre = PrefetchedSlugRelatedField(
         slug_field="slug", many=True, queryset=Genre.objects.all()
     )
-    category = serializers.SlugRelatedField(
+    category = PrefetchedSlugRelatedField(
         slug_field="slug", many=False, queryset=Category.objects.all()
     )
 
@@ -61,7 +108,7 @@ class TitlePostSerializer(serializers.ModelSerializer):
         )
 
 
-class ReviewsSerializer(serializers.ModelSerializer):
+class ReviewsSerializer(FastRepresentationMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field="username"
     )
@@ -76,17 +123,13 @@ class ReviewsSerializer(serializers.ModelSerializer):
         model = Review
         fields = "__all__"
 
-    def get_title(self):
-        return get_object_or_404(
-            Title, id=self.context.get("view").kwargs.get("title_id")
-        )
-
     def validate(self, attrs):
+        request = self.context["request"]
         if (
-            Review.objects.filter(
-                author=self.context["request"].user, title=self.get_title()
+            request.method != "PATCH"
+            and Review.objects.filter(
+                author=request.user, title=self.context["view"].get_title()
             ).exists()
-            and self.context["request"].method != "PATCH"
         ):
             raise serializers.ValidationError(
                 "Нельзя добавить второй отзыв на произведение"
@@ -94,7 +137,7 @@ class ReviewsSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class CommentsSerializer(serializers.ModelSerializer):
+class CommentsSerializer(FastRepresentationMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field="username"
     )
@@ -0,0 +1,92 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import Comment, Review
+from titles.models import Category, Genre, Title
+from users.models import User
+
+from .authentication import mark_claims_changed
+from .cache import invalidate
+
+
+def author_tags(user):
+    """Метки отзывов и комментариев, в которых выводится имя автора."""
+    tags = []
+    for pk, title_id in user.reviews.values_list("pk", "title_id"):
+        tags += [f"review:{pk}", f"reviews:{title_id}"]
+    for pk, review_id in user.comments.values_list("pk", "review_id"):
+        tags += [f"comment:{pk}", f"comments:{review_id}"]
+    return tags
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    mark_claims_changed(instance.pk)
+    loaded = getattr(instance, "_loaded_username", None)
+    instance._loaded_username = instance.username
+    # Имя автора выводится в отзывах и комментариях; роль, почта и
+    # биография в них не попадают.
+    if not created and loaded != instance.username:
+        tags = author_tags(instance)
+        if tags:
+            invalidate(*tags)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    # Отзывы и комментарии удаляются каскадом и сбрасывают кеш сами.
+    mark_claims_changed(instance.pk)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(sender, instance, **kwargs):
+    invalidate("titles", f"title:{instance.pk}")
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if isinstance(instance, Title):
+        invalidate("titles", f"title:{instance.pk}")
+    else:
+        invalidate("titles", *(f"title:{pk}" for pk in pk_set or ()))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def genre_changed(sender, instance, **kwargs):
+    invalidate("genres")
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    invalidate("categories")
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    # Отзыв меняет рейтинг: сбрасываем и само произведение, и списки.
+    invalidate(
+        f"review:{instance.pk}",
+        f"reviews:{instance.title_id}",
+        f"title:{instance.title_id}",
+        "titles",
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    tags = [
+        f"comment:{instance.pk}",
+        f"comments:{instance.review_id}",
+        f"review:{instance.review_id}",
+    ]
+    # comments_count выводится и в списке отзывов произведения; если
+    # отзыв удаляется вместе с комментарием, список сбросит review_changed.
+    if not getattr(instance, "_parent_deleted", False):
+        tags.append(f"reviews:{instance.review.title_id}")
+    invalidate(*tags)
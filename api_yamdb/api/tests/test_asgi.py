@@ -0,0 +1,103 @@
+import asyncio
+import json
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TransactionTestCase
+from rest_framework import status
+from reviews.models import Review
+from users.models import User
+
+from api_yamdb.asgi import application
+
+from ..views import CustomTokenObtainView, TitleViewSet
+
+
+async def request(path, headers=()):
+    """GET через ASGI-приложение: (статус, заголовки, тело)."""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), *headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    start, *bodies = messages
+    return (
+        start["status"],
+        dict(start["headers"]),
+        b"".join(body.get("body", b"") for body in bodies),
+        len(bodies),
+    )
+
+
+def get(path, headers=()):
+    # asyncio.run, а не async_to_sync: внутри async_to_sync весь
+    # синхронный код выполнялся бы в потоке теста.
+    return asyncio.run(request(path, headers))
+
+
+class ASGITest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        call_command("import_csv", stdout=StringIO())
+
+    def test_title_list(self):
+        code, headers, body, _ = get("/api/v1/titles/")
+        self.assertEqual(code, status.HTTP_200_OK)
+        self.assertEqual(headers[b"Content-Type"], b"application/json")
+        self.assertTrue(json.loads(body)["results"])
+
+    def test_requests_run_in_separate_threads(self):
+        # Оба запроса встречаются на барьере, только если выполняются
+        # одновременно в разных потоках.
+        barrier = threading.Barrier(2, timeout=5)
+        original = TitleViewSet.list
+
+        def list_(view, *args, **kwargs):
+            barrier.wait()
+            return original(view, *args, **kwargs)
+
+        async def both():
+            return await asyncio.gather(
+                request("/api/v1/titles/"), request("/api/v1/titles/?limit=5")
+            )
+
+        with mock.patch.object(TitleViewSet, "list", list_):
+            responses = asyncio.run(both())
+        self.assertEqual(
+            [response[0] for response in responses],
+            [status.HTTP_200_OK, status.HTTP_200_OK],
+        )
+
+    def test_streaming_export(self):
+        admin = User.objects.create_user(username="exporter", role="admin")
+        token = CustomTokenObtainView().get_tokens_for_user(admin)["token"]
+        code, _, body, parts = get(
+            "/api/v1/export/review.ndjson",
+            headers=[(b"authorization", f"Bearer {token}".encode())],
+        )
+        self.assertEqual(code, status.HTTP_200_OK)
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(rows), Review.objects.count())
+        self.assertGreater(parts, 1)
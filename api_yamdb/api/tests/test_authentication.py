@@ -0,0 +1,123 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from titles.models import Category, Title
+from users.models import User
+
+from ..views import CustomTokenObtainView
+
+
+def user_queries(queries):
+    return [
+        q
+        for q in queries
+        if q["sql"].startswith("SELECT") and 'FROM "users_user"' in q["sql"]
+    ]
+
+
+class ClaimsAuthenticationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_user(
+            username="admin", role="admin"
+        )
+        cls.user = User.objects.create_user(username="auth", role="user")
+        cls.title = Title.objects.create(
+            name="Кошмар на улице Вязов",
+            year=1984,
+            category=Category.objects.create(name="Фильм", slug="films"),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def client_for(self, user):
+        client = APIClient()
+        token = CustomTokenObtainView().get_tokens_for_user(user)["token"]
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def test_token_carries_claims(self):
+        token = AccessToken(
+            CustomTokenObtainView().get_tokens_for_user(self.admin_user)[
+                "token"
+            ]
+        )
+        self.assertEqual(token["role"], "admin")
+        self.assertEqual(token["username"], "admin")
+        self.assertFalse(token["is_staff"])
+
+    def test_admin_write_without_user_lookup(self):
+        client = self.client_for(self.admin_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(
+                "/api/v1/genres/", {"name": "Ужасы", "slug": "horror"}
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(user_queries(queries))
+
+    def test_review_write_without_user_lookup(self):
+        client = self.client_for(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(
+                f"/api/v1/titles/{self.title.id}/reviews/",
+                {"text": "Отзыв", "score": 7},
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["author"], "auth")
+        self.assertFalse(user_queries(queries))
+
+    def test_other_fields_are_loaded_lazily(self):
+        User.objects.filter(pk=self.user.pk).update(bio="Биография")
+        response = self.client_for(self.user).get("/api/v1/users/me/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["bio"], "Биография")
+
+    def test_role_change_revokes_claims(self):
+        client = self.client_for(self.admin_user)
+        admin_user = User.objects.get(pk=self.admin_user.pk)
+        admin_user.role = "user"
+        admin_user.save()
+        # Отметки не живут в кеше ответов и не стираются вместе с ним.
+        cache.clear()
+        response = client.post(
+            "/api/v1/genres/", {"name": "Ужасы", "slug": "horror"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_deactivated_user_is_rejected(self):
+        client = self.client_for(self.user)
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        response = client.get("/api/v1/users/me/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+            },
+            "claims": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "claims",
+            },
+        }
+    )
+    def test_claims_need_shared_cache(self):
+        # Отметку из другого процесса такой кеш не покажет.
+        client = self.client_for(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/api/v1/users/me/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(user_queries(queries))
+
+    def test_deleted_user_is_rejected(self):
+        client = self.client_for(self.user)
+        User.objects.get(pk=self.user.pk).delete()
+        response = client.get("/api/v1/users/me/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,204 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from io import StringIO
+from unittest import skipUnless
+
+from benchmark.runner import connections_opened, percentile
+from benchmark.servers import child_pids, memory_kb, tree_memory_kb
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from reviews.models import Comment, Review
+from titles.models import Title
+from users.models import User
+
+SEED_OPTIONS = {
+    "titles": 4,
+    "reviews_per_title": 3,
+    "comments_per_review": 2,
+    "users": 3,
+    "stdout": StringIO(),
+}
+
+
+class SeedBenchmarkTest(TestCase):
+    def test_seed_scale(self):
+        call_command("seed_benchmark", **SEED_OPTIONS)
+        self.assertEqual(Title.objects.count(), 4)
+        self.assertEqual(Review.objects.count(), 12)
+        self.assertEqual(Comment.objects.count(), 24)
+        self.assertEqual(User.objects.filter(role="admin").count(), 1)
+        self.assertEqual(
+            set(Title.objects.values_list("reviews_count", flat=True)), {3}
+        )
+
+    def test_comments_are_not_older_than_reviews(self):
+        call_command("seed_benchmark", **SEED_OPTIONS)
+        for comment in Comment.objects.select_related("review"):
+            self.assertGreaterEqual(comment.pub_date, comment.review.pub_date)
+
+    def test_seed_invalidates_cached_lists(self):
+        # Повторный запуск: категории и жанры уже есть, сигналов нет.
+        call_command("seed_benchmark", **SEED_OPTIONS)
+        cache.clear()
+        self.client.get("/api/v1/titles/")
+        call_command("seed_benchmark", **{**SEED_OPTIONS, "seed": 1})
+        response = self.client.get("/api/v1/titles/")
+        self.assertEqual(response.json()["count"], 8)
+
+    def test_not_enough_users(self):
+        with self.assertRaises(CommandError):
+            call_command("seed_benchmark", **{**SEED_OPTIONS, "users": 2})
+
+    def test_bench_serializers(self):
+        call_command("seed_benchmark", **SEED_OPTIONS)
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "serializers.json")
+            call_command(
+                "bench_serializers",
+                rows=5,
+                repeat=2,
+                output=output,
+                stdout=StringIO(),
+            )
+            with open(output, encoding="utf-8") as file:
+                report = json.load(file)
+        self.assertEqual(
+            set(report["serializers"]), {"titles", "reviews", "comments"}
+        )
+        for stats in report["serializers"].values():
+            self.assertGreater(stats["fast_us_per_row"], 0)
+
+    def test_bench_serializers_needs_data(self):
+        with self.assertRaises(CommandError):
+            call_command("bench_serializers", stdout=StringIO())
+
+    def test_bench_json(self):
+        call_command("seed_benchmark", **SEED_OPTIONS)
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "json.json")
+            call_command(
+                "bench_json", repeat=2, output=output, stdout=StringIO()
+            )
+            with open(output, encoding="utf-8") as file:
+                report = json.load(file)
+        self.assertEqual(report["rows"], 12)
+        for name in ("render", "parse"):
+            self.assertGreater(report[name]["fast_ms"], 0)
+
+    def test_connections_opened(self):
+        self.assertEqual(
+            connections_opened(
+                'db;dur=1.2;desc="3 queries", db-connect;desc="1"'
+            ),
+            1,
+        )
+        self.assertEqual(connections_opened('db;desc="3 queries"'), 0)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
+        self.assertIsNone(percentile([], 50))
+
+    @skipUnless(os.path.exists("/proc/self/status"), "нужен /proc")
+    def test_process_memory(self):
+        child = subprocess.Popen(
+            [sys.executable, "-c", "import time; time.sleep(30)"]
+        )
+        try:
+            self.assertIn(child.pid, child_pids(os.getpid()))
+            self.assertGreater(memory_kb(os.getpid()), 0)
+            self.assertGreater(
+                tree_memory_kb(os.getpid()), memory_kb(os.getpid())
+            )
+        finally:
+            child.kill()
+            child.wait()
+        self.assertEqual(memory_kb(child.pid), 0)
+
+
+class RunBenchmarkTest(TransactionTestCase):
+    """WSGI-приложение закрывает соединение после запроса, как в бою."""
+
+    def setUp(self):
+        cache.clear()
+        call_command("seed_benchmark", **SEED_OPTIONS)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def run_benchmark(self, name, **options):
+        output = os.path.join(self.directory.name, name)
+        call_command(
+            "run_benchmark",
+            requests=3,
+            warmup=0,
+            samples=2,
+            output=output,
+            stdout=StringIO(),
+            **options,
+        )
+        with open(output, encoding="utf-8") as file:
+            return output, json.load(file)
+
+    def test_report(self):
+        _, report = self.run_benchmark("report.json", auth="user")
+        self.assertEqual(report["mode"], "wsgi")
+        self.assertEqual(report["database"]["reviews"], 12)
+        scenarios = report["scenarios"]
+        for name in (
+            "titles-list",
+            "titles-search",
+            "titles-top-genre",
+            "title-rating",
+            "reviews-cursor",
+            "comment-detail",
+            "users-list",
+            "users-me",
+        ):
+            self.assertIn(name, scenarios)
+        for stats in scenarios.values():
+            self.assertEqual(stats["requests"], 3)
+            self.assertEqual(stats["errors"], 0)
+            self.assertLessEqual(stats["p50_ms"], stats["p99_ms"])
+        self.assertGreater(
+            scenarios["reviews-list"]["queries_per_request"]["mean"], 0
+        )
+
+    def test_conn_max_age(self):
+        _, report = self.run_benchmark(
+            "report.json", scenario=["genres-list"], conn_max_age=0
+        )
+        self.assertEqual(report["options"]["conn_max_age"], 0)
+        self.assertIn(
+            "connections_per_request", report["scenarios"]["genres-list"]
+        )
+        self.assertNotEqual(connection.settings_dict["CONN_MAX_AGE"], 0)
+        with self.assertRaises(CommandError):
+            self.run_benchmark(
+                "http.json", url="http://127.0.0.1:1", conn_max_age=0
+            )
+
+    def test_compare(self):
+        base, _ = self.run_benchmark(
+            "base.json", scenario=["title-detail", "genres-list"]
+        )
+        new, _ = self.run_benchmark(
+            "new.json", scenario=["title-detail", "reviews-list"]
+        )
+        stdout = StringIO()
+        call_command("compare_benchmark", base, new, stdout=stdout)
+        self.assertIn("title-detail: p50_ms", stdout.getvalue())
+        self.assertIn(
+            "genres-list: есть только в одном отчёте", stdout.getvalue()
+        )
+        with self.assertRaises(CommandError):
+            call_command(
+                "compare_benchmark", base, base, threshold=-1, stdout=stdout
+            )
@@ -0,0 +1,193 @@
+from unittest import mock, skipIf
+
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from titles.models import Category, Genre, Title
+from users.models import User
+
+from ..bulk import BulkCreateMixin, bulk_insert
+from ..views import TitleViewSet
+
+
+class BulkCreateTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username="admin", role="admin")
+        cls.user = User.objects.create_user(username="user", role="user")
+        Genre.objects.create(name="Ужасы", slug="horror")
+        Genre.objects.create(name="Драма", slug="drama")
+        Category.objects.create(name="Фильм", slug="films")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def post(self, url, items, client=None):
+        return (client or self.client).post(url, items, format="json")
+
+    def title(self, name, genre=("horror",), **fields):
+        return {
+            "name": name,
+            "year": 1984,
+            "category": "films",
+            "genre": list(genre),
+            **fields,
+        }
+
+    def test_titles(self):
+        response = self.post(
+            "/api/v1/titles/bulk/",
+            [
+                self.title("Кошмар на улице Вязов", ["horror", "drama"]),
+                self.title("Неизвестный жанр", ["western"]),
+                self.title("Из будущего", year=3000),
+                self.title("Сияние", description="Отель «Оверлук»"),
+            ],
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        data = response.json()
+        self.assertEqual((data["created"], data["failed"]), (2, 2))
+        results = data["results"]
+        self.assertIn("genre", results[1]["errors"])
+        self.assertIn("year", results[2]["errors"])
+        nightmare = Title.objects.get(pk=results[0]["id"])
+        self.assertEqual(nightmare.name, "Кошмар на улице Вязов")
+        self.assertEqual(
+            sorted(nightmare.genre.values_list("slug", flat=True)),
+            ["drama", "horror"],
+        )
+        shining = Title.objects.get(pk=results[3]["id"])
+        self.assertEqual(shining.category.slug, "films")
+        self.assertEqual(shining.description, "Отель «Оверлук»")
+        self.assertEqual(Title.objects.count(), 2)
+
+    def test_titles_queries_do_not_depend_on_size(self):
+        for count in (2, 20):
+            items = [
+                self.title(f"Произведение {count}-{i}", ["horror", "drama"])
+                for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.post("/api/v1/titles/bulk/", items)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertLessEqual(
+                len(queries), TitleViewSet.query_budgets["bulk"]
+            )
+        self.assertEqual(Title.objects.filter(genre__slug="drama").count(), 22)
+
+    def test_large_batch_fits_budget(self):
+        # На SQLite INSERT произведений и связей делится на части.
+        items = [
+            self.title(f"Произведение {i}", ["horror", "drama"])
+            for i in range(300)
+        ]
+        with self.settings(QUERY_BUDGET_STRICT=True):
+            response = self.post("/api/v1/titles/bulk/", items)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        ids = [result["id"] for result in response.json()["results"]]
+        self.assertEqual(
+            list(
+                Title.objects.filter(pk__in=ids)
+                .order_by("id")
+                .values_list("name", flat=True)
+            ),
+            [item["name"] for item in items],
+        )
+        self.assertEqual(
+            Title.objects.filter(genre__slug="drama").count(), 300
+        )
+
+    @skipIf(
+        connection.features.can_return_rows_from_bulk_insert,
+        "id возвращает сам INSERT",
+    )
+    def test_inserted_ids_are_checked(self):
+        bulk_create = QuerySet.bulk_create
+
+        def interleaved_bulk_create(queryset, objs, *args, **kwargs):
+            try:
+                return bulk_create(queryset, objs, *args, **kwargs)
+            finally:
+                # Вставка из другого соединения сразу после нашей.
+                Title.objects.create(name="Чужая вставка", year=2000)
+
+        with mock.patch.object(
+            QuerySet, "bulk_create", interleaved_bulk_create
+        ), self.assertRaises(DatabaseError):
+            bulk_insert(Title, [Title(name="Сияние", year=1980)], True)
+
+    def test_new_titles_are_listed_and_searchable(self):
+        self.assertEqual(APIClient().get("/api/v1/titles/").json()["count"], 0)
+        self.post("/api/v1/titles/bulk/", [self.title("Сияние")])
+        response = APIClient().get("/api/v1/titles/?search=Сияние")
+        self.assertEqual(
+            [title["name"] for title in response.json()["results"]],
+            ["Сияние"],
+        )
+
+    def test_genres_check_slugs_in_one_pass(self):
+        response = self.post(
+            "/api/v1/genres/bulk/",
+            [
+                {"name": "Комедия", "slug": "comedy"},
+                {"name": "Ещё ужасы", "slug": "horror"},
+                {"name": "Снова комедия", "slug": "comedy"},
+                {"name": "Без слага"},
+            ],
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        results = response.json()["results"]
+        self.assertEqual(results[0], {"slug": "comedy"})
+        for result in results[1:]:
+            self.assertIn("slug", result["errors"])
+        self.assertEqual(Genre.objects.get(slug="comedy").name, "Комедия")
+        self.assertEqual(Genre.objects.count(), 3)
+
+    def test_categories(self):
+        response = self.post(
+            "/api/v1/categories/bulk/",
+            [
+                {"name": "Книга", "slug": "books"},
+                {"name": "Музыка", "slug": "music"},
+            ],
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            APIClient().get("/api/v1/categories/").json()["count"], 3
+        )
+
+    def test_all_invalid(self):
+        response = self.post(
+            "/api/v1/categories/bulk/", [{"name": "Фильм", "slug": "films"}]
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["created"], 0)
+
+    def test_payload_must_be_list(self):
+        for payload in ({"name": "Комедия", "slug": "comedy"}, []):
+            response = self.post("/api/v1/genres/bulk/", payload)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        items = [{"name": f"Жанр {i}", "slug": f"genre-{i}"} for i in range(3)]
+        with mock.patch.object(BulkCreateMixin, "bulk_max_items", 2):
+            response = self.post("/api/v1/genres/bulk/", items)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Genre.objects.count(), 2)
+
+    def test_admin_only(self):
+        user = APIClient()
+        user.force_authenticate(self.user)
+        item = [{"name": "Комедия", "slug": "comedy"}]
+        self.assertEqual(
+            self.post("/api/v1/genres/bulk/", item, user).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+        self.assertEqual(
+            self.post("/api/v1/genres/bulk/", item, APIClient()).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
@@ -0,0 +1,116 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from reviews.models import Comment, Review
+from titles.models import Category, Genre, Title
+from users.models import User
+
+
+class ResponseCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="auth", role="user")
+        cls.admin_user = User.objects.create_user(
+            username="admin", role="admin"
+        )
+        cls.genre = Genre.objects.create(name="Ужасы", slug="horror")
+        category = Category.objects.create(name="Фильм", slug="films")
+        cls.title = Title.objects.create(
+            name="Кошмар на улице Вязов", year=1984, category=category
+        )
+        cls.other_title = Title.objects.create(
+            name="Пятница, 13-е", year=1980, category=category
+        )
+        cls.review = Review.objects.create(
+            title=cls.title, text="Отзыв", score=4, author=cls.admin_user
+        )
+        cls.other_review = Review.objects.create(
+            title=cls.other_title, text="Отзыв", score=8, author=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.authorized_client = APIClient()
+        self.authorized_client.force_authenticate(self.user)
+        self.title_url = f"/api/v1/titles/{self.title.id}/"
+        self.reviews_url = f"{self.title_url}reviews/"
+
+    def test_anonymous_read_is_cached(self):
+        first = self.client.get(self.title_url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.title_url)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["Content-Type"], second["Content-Type"])
+
+    def test_query_params_are_part_of_key(self):
+        self.client.get("/api/v1/titles/?limit=1")
+        response = self.client.get("/api/v1/titles/?limit=2")
+        self.assertEqual(len(response.json()["results"]), 2)
+
+    def test_authenticated_read_is_not_cached(self):
+        self.client.get(self.title_url)
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer token")
+        response = self.client.get(self.title_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_new_review_invalidates_title_and_its_reviews(self):
+        other_reviews_url = f"/api/v1/titles/{self.other_title.id}/reviews/"
+        for url in (
+            self.title_url,
+            self.reviews_url,
+            "/api/v1/titles/",
+            other_reviews_url,
+        ):
+            self.client.get(url)
+
+        response = self.authorized_client.post(
+            self.reviews_url, {"text": "Ещё отзыв", "score": 10}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(self.client.get(self.title_url).json()["rating"], 7)
+        self.assertEqual(self.client.get(self.reviews_url).json()["count"], 2)
+        titles = self.client.get("/api/v1/titles/").json()["results"]
+        self.assertIn(7, [title["rating"] for title in titles])
+        with self.assertNumQueries(0):
+            self.client.get(other_reviews_url)
+
+    def test_genre_change_invalidates_titles(self):
+        self.client.get(self.title_url)
+        self.title.genre.add(self.genre)
+        response = self.client.get(self.title_url)
+        self.assertEqual(
+            response.json()["genre"], [{"name": "Ужасы", "slug": "horror"}]
+        )
+
+    def test_comment_invalidates_comment_list(self):
+        comments_url = f"{self.reviews_url}{self.review.id}/comments/"
+        self.client.get(comments_url)
+        Comment.objects.create(
+            review=self.review, text="Комментарий", author=self.user
+        )
+        self.assertEqual(self.client.get(comments_url).json()["count"], 1)
+
+    def test_username_change_invalidates_reviews(self):
+        other_reviews_url = f"/api/v1/titles/{self.other_title.id}/reviews/"
+        self.client.get(self.reviews_url)
+        self.client.get(other_reviews_url)
+        user = User.objects.get(pk=self.admin_user.pk)
+        user.username = "boss"
+        user.save()
+        response = self.client.get(self.reviews_url)
+        self.assertEqual(response.json()["results"][0]["author"], "boss")
+        with self.assertNumQueries(0):
+            self.client.get(other_reviews_url)
+
+    def test_profile_change_keeps_reviews_cached(self):
+        self.client.get(self.reviews_url)
+        user = User.objects.get(pk=self.admin_user.pk)
+        user.bio = "Биография"
+        user.role = "moderator"
+        user.save()
+        with self.assertNumQueries(0):
+            self.client.get(self.reviews_url)
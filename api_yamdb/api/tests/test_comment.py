@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -78,3 +79,60 @@ class CommentViewsTest(TestCase):
             data=data,
         )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_comments_cursor_pagination(self):
+        for i in range(3):
+            Comment.objects.create(
+                review=self.review, text=f"Комментарий {i}", author=self.user
+            )
+        url = (
+            f"/api/v1/titles/{self.title.id}/"
+            f"reviews/{self.review.id}/comments/?cursor=&limit=2"
+        )
+        received = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            received += [c["id"] for c in response.json()["results"]]
+            url = response.json()["next"]
+        self.assertEqual(
+            received,
+            list(
+                Comment.objects.order_by("-pub_date", "-id").values_list(
+                    "id", flat=True
+                )
+            ),
+        )
+
+    def test_comments_count_follows_create_and_delete(self):
+        url = f"/api/v1/titles/{self.title.id}/reviews/{self.review.id}/"
+        response = self.authorized_client.post(
+            f"{url}comments/", data={"text": "Согласен"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.get(url).json()["comments_count"], 2)
+        response = self.admin_client.delete(
+            f"{url}comments/{response.json()['id']}/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get(url).json()["comments_count"], 1)
+
+    def test_comments_count_follows_author_deletion(self):
+        author = User.objects.create_user(username="leaving")
+        Comment.objects.create(review=self.review, text="Пока", author=author)
+        author.delete()
+        self.review.refresh_from_db()
+        self.assertEqual(self.review.comments_count, 1)
+
+    def test_review_list_shows_new_comments_count(self):
+        cache.clear()
+        url = f"/api/v1/titles/{self.title.id}/reviews/"
+        self.assertEqual(
+            self.client.get(url).json()["results"][0]["comments_count"], 1
+        )
+        self.authorized_client.post(
+            f"{url}{self.review.id}/comments/", data={"text": "Ещё"}
+        )
+        self.assertEqual(
+            self.client.get(url).json()["results"][0]["comments_count"], 2
+        )
@@ -0,0 +1,118 @@
+import gzip
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from users.models import User
+
+from ..compression import GzipEncoder, brotli, choose_encoding
+
+TITLES_URL = "/api/v1/titles/?limit=100"
+
+
+class ChooseEncodingTest(SimpleTestCase):
+    def test_gzip(self):
+        for header in ("gzip", "deflate, gzip", "GZIP;q=0.5", "*"):
+            with self.subTest(header=header):
+                self.assertIn(choose_encoding(header), ("gzip", "br"))
+        for header in ("", "identity", "deflate", "gzip;q=0", "*;q=0"):
+            with self.subTest(header=header):
+                self.assertIsNone(choose_encoding(header))
+
+    @skipUnless(brotli, "brotli не установлен")
+    def test_brotli(self):
+        self.assertEqual(choose_encoding("gzip, deflate, br"), "br")
+        self.assertEqual(choose_encoding("gzip, br;q=0.5"), "gzip")
+        self.assertEqual(choose_encoding("br;q=x, gzip"), "gzip")
+
+
+class CompressionTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("import_csv", stdout=StringIO())
+        cls.admin = User.objects.create_user(username="exporter", role="admin")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get(self, url, encoding="gzip", client=None, **headers):
+        return (client or self.client).get(
+            url, HTTP_ACCEPT_ENCODING=encoding, **headers
+        )
+
+    def test_gzip(self):
+        plain = self.get(TITLES_URL, encoding="").content
+        cache.clear()
+        response = self.get(TITLES_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(
+            int(response["Content-Length"]), len(response.content)
+        )
+        self.assertLess(len(response.content), len(plain) / 2)
+        self.assertEqual(gzip.decompress(response.content), plain)
+
+    @skipUnless(brotli, "brotli не установлен")
+    def test_brotli(self):
+        plain = self.get(TITLES_URL, encoding="").content
+        response = self.get(TITLES_URL, encoding="gzip, deflate, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), plain)
+
+    def test_not_accepted(self):
+        response = self.get(TITLES_URL, encoding="identity")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    @override_settings(COMPRESSION_MIN_SIZE=100_000)
+    def test_small_response(self):
+        response = self.get(TITLES_URL)
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertNotIn("Accept-Encoding", response["Vary"])
+
+    def test_html_is_not_compressed(self):
+        response = self.get(TITLES_URL, HTTP_ACCEPT="text/html")
+        self.assertTrue(response["Content-Type"].startswith("text/html"))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_cached_response_is_compressed_once(self):
+        first = self.get(TITLES_URL)
+        with mock.patch.object(GzipEncoder, "compress") as compress:
+            with self.assertNumQueries(0):
+                second = self.get(TITLES_URL)
+        compress.assert_not_called()
+        self.assertEqual(second["Content-Encoding"], "gzip")
+        self.assertEqual(second.content, first.content)
+
+    def test_weak_etag_still_validates(self):
+        etag = self.get(TITLES_URL)["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        response = self.get(TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_streaming_export(self):
+        admin = APIClient()
+        admin.force_authenticate(self.admin)
+        plain = b"".join(
+            self.get(
+                "/api/v1/export/review.csv", encoding="", client=admin
+            ).streaming_content
+        )
+        response = self.get("/api/v1/export/review.csv", client=admin)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(b"".join(response.streaming_content)), plain
+        )
+
+        # Файл .gz уже сжат: второй раз не сжимается.
+        response = self.get("/api/v1/export/review.csv.gz", client=admin)
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(
+            gzip.decompress(b"".join(response.streaming_content)), plain
+        )
@@ -0,0 +1,109 @@
+import time
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APIClient
+from reviews.models import Comment, Review
+from titles.models import Category, Title
+from users.models import User
+
+from ..views import CustomTokenObtainView
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="auth", role="user")
+        cls.title = Title.objects.create(
+            name="Кошмар на улице Вязов",
+            year=1984,
+            category=Category.objects.create(name="Фильм", slug="films"),
+        )
+        cls.review = Review.objects.create(
+            title=cls.title, text="Отзыв", score=4, author=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.authorized_client = APIClient()
+        self.authorized_client.force_authenticate(self.user)
+        self.title_url = f"/api/v1/titles/{self.title.id}/"
+        self.reviews_url = f"{self.title_url}reviews/"
+
+    def test_response_has_validators(self):
+        response = self.client.get(self.title_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["ETag"].startswith('"'))
+        # Версии меток точнее секунды в Last-Modified.
+        self.assertNotIn("Last-Modified", response)
+
+    def test_if_none_match_returns_304_without_queries(self):
+        etag = self.client.get(self.reviews_url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.authorized_client.get(
+                self.reviews_url, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_if_modified_since_is_ignored(self):
+        self.client.get(self.title_url)
+        response = self.client.get(
+            self.title_url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60)
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_token_is_checked_before_304(self):
+        token = CustomTokenObtainView().get_tokens_for_user(self.user)["token"]
+        etag = self.client.get(
+            self.reviews_url, HTTP_AUTHORIZATION=f"Bearer {token}"
+        )["ETag"]
+        response = self.client.get(
+            self.reviews_url,
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        response = self.client.get(
+            self.reviews_url,
+            HTTP_AUTHORIZATION=f"Bearer {token}x",
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_review_write_changes_title_and_reviews_etag(self):
+        title_etag = self.client.get(self.title_url)["ETag"]
+        reviews_etag = self.client.get(self.reviews_url)["ETag"]
+        Review.objects.create(
+            title=self.title,
+            text="Ещё отзыв",
+            score=10,
+            author=User.objects.create_user(username="reader"),
+        )
+        response = self.client.get(
+            self.title_url, HTTP_IF_NONE_MATCH=title_etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], title_etag)
+        response = self.client.get(
+            self.reviews_url, HTTP_IF_NONE_MATCH=reviews_etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_comment_write_changes_review_etag(self):
+        review_url = f"{self.reviews_url}{self.review.id}/"
+        etag = self.client.get(review_url)["ETag"]
+        Comment.objects.create(
+            review=self.review, text="Комментарий", author=self.user
+        )
+        response = self.client.get(review_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_title_has_no_etag(self):
+        response = self.client.get("/api/v1/titles/100500/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("ETag", response)
@@ -0,0 +1,164 @@
+import threading
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import SimpleTestCase, TransactionTestCase
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api_yamdb.db.connections import (HealthCheckMixin, count_new_connection,
+                                      reset_health_checks)
+from api_yamdb.db.pool import ConnectionPool, PoolTimeoutError
+from api_yamdb.db.postgresql_pool import base as postgresql_pool
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    def test_connection_is_reused(self):
+        pool = ConnectionPool(2, timeout=0.1)
+        first = pool.acquire(FakeConnection)
+        pool.release(first)
+        self.assertIs(pool.acquire(FakeConnection), first)
+
+    def test_max_size(self):
+        pool = ConnectionPool(2, timeout=0.1)
+        pool.acquire(FakeConnection)
+        second = pool.acquire(FakeConnection)
+        with self.assertRaises(PoolTimeoutError):
+            pool.acquire(FakeConnection)
+        pool.release(second)
+        self.assertIs(pool.acquire(FakeConnection), second)
+
+    def test_waits_for_released_connection(self):
+        pool = ConnectionPool(1, timeout=5)
+        first = pool.acquire(FakeConnection)
+        timer = threading.Timer(0.05, pool.release, [first])
+        timer.start()
+        self.assertIs(pool.acquire(FakeConnection), first)
+        timer.join()
+
+    def test_broken_connections_are_discarded(self):
+        pool = ConnectionPool(
+            1,
+            timeout=0.1,
+            check=lambda connection: not connection.closed,
+            reset=lambda connection: not connection.closed,
+        )
+        first = pool.acquire(FakeConnection)
+        first.closed = True
+        pool.release(first)
+        self.assertEqual(pool.idle, [])
+        second = pool.acquire(FakeConnection)
+        pool.release(second)
+        second.closed = True
+        self.assertIsNot(pool.acquire(FakeConnection), second)
+
+    def test_failed_connect_frees_slot(self):
+        pool = ConnectionPool(1, timeout=0.1)
+
+        def connect():
+            raise OSError("нет базы")
+
+        with self.assertRaises(OSError):
+            pool.acquire(connect)
+        pool.acquire(FakeConnection)
+
+
+class ClosePoolsTest(SimpleTestCase):
+    def test_idle_connections_are_closed(self):
+        pool = ConnectionPool(2, timeout=0.1)
+        connection = pool.acquire(FakeConnection)
+        pool.release(connection)
+        with mock.patch.dict(postgresql_pool.pools, {"default": pool}):
+            postgresql_pool.close_pools()
+            self.assertEqual(postgresql_pool.pools, {})
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.idle, [])
+
+
+class PooledConnectionCountTest(SimpleTestCase):
+    def opened(self):
+        return (
+            REGISTRY.get_sample_value(
+                "yamdb_db_connections_opened_total", {"alias": "pooled"}
+            )
+            or 0
+        )
+
+    def test_only_new_connections_are_counted(self):
+        wrapper = postgresql_pool.DatabaseWrapper(
+            {"POOL": {"MAX_SIZE": 1}, "OPTIONS": {}}, "pooled"
+        )
+        before = self.opened()
+        with mock.patch.dict(postgresql_pool.pools), mock.patch.object(
+            postgresql_pool.postgresql.DatabaseWrapper,
+            "get_new_connection",
+            side_effect=lambda conn_params: mock.Mock(closed=False),
+        ):
+            for _ in range(2):
+                pooled = wrapper.get_new_connection({})
+                # Выдача из пула тоже вызывает connection_created.
+                count_new_connection(None, wrapper)
+                wrapper.get_pool().release(pooled)
+        self.assertEqual(self.opened() - before, 1)
+
+
+@skipUnless(
+    isinstance(connections["default"], HealthCheckMixin),
+    "нужен бэкенд с проверкой: DB_ENGINE=api_yamdb.db.sqlite3",
+)
+class HealthCheckTest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        connection.ensure_connection()
+        reset_health_checks()
+
+    def test_unusable_connection_is_closed(self):
+        with mock.patch.object(connection, "is_usable", return_value=False):
+            with mock.patch.object(connection, "close") as close:
+                connection.ensure_connection()
+        close.assert_called_once_with()
+
+    def test_checked_once_per_request(self):
+        with mock.patch.object(connection, "is_usable") as is_usable:
+            with mock.patch.object(connection, "close") as close:
+                connection.ensure_connection()
+                connection.ensure_connection()
+        is_usable.assert_called_once_with()
+        close.assert_not_called()
+
+    def test_health_checks_can_be_disabled(self):
+        settings_dict = {**connection.settings_dict, "CONN_HEALTH_CHECKS": 0}
+        with mock.patch.object(connection, "settings_dict", settings_dict):
+            with mock.patch.object(
+                connection, "is_usable", return_value=False
+            ):
+                with mock.patch.object(connection, "close") as close:
+                    connection.ensure_connection()
+        close.assert_not_called()
+
+    def test_request_without_queries_is_not_checked(self):
+        client = APIClient()
+        client.get("/api/v1/titles/")
+        self.assertIsNotNone(connection.connection)
+        with mock.patch.object(
+            connection, "is_usable", return_value=True
+        ) as is_usable:
+            # Ответ из кеша: ни SQL-запросов, ни проверки соединения.
+            with self.assertNumQueries(0):
+                response = client.get("/api/v1/titles/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            is_usable.assert_not_called()
+
+            client.get("/api/v1/titles/?limit=3")
+        is_usable.assert_called_once_with()
+        self.assertIsNotNone(connection.connection)
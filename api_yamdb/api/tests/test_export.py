@@ -0,0 +1,139 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from users.models import User
+
+from ..export import DATASETS
+
+DATA_DIR: str = os.path.join(settings.BASE_DIR, "static", "data")
+
+
+def read_rows(text):
+    return list(csv.DictReader(StringIO(text)))
+
+
+def static_rows(name):
+    with open(os.path.join(DATA_DIR, f"{name}.csv"), encoding="utf-8") as f:
+        return read_rows(f.read())
+
+
+class ExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("import_csv", stdout=StringIO())
+        cls.admin = User.objects.create_user(username="exporter", role="admin")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def download(self, path):
+        response = self.client.get(f"/api/v1/export/{path}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content)
+
+    def assert_same_rows(self, name, rows):
+        # Выгрузка идёт по id, а исходные файлы не отсортированы.
+        expected = sorted(static_rows(name), key=lambda row: int(row["id"]))
+        self.assertEqual(
+            [{key: row[key] for key in expected[0]} for row in rows], expected
+        )
+
+    def test_csv_matches_static_data(self):
+        for name in ("category", "genre_title", "review", "comments"):
+            with self.subTest(name=name):
+                response, content = self.download(f"{name}.csv")
+                self.assertEqual(
+                    response["Content-Type"], "text/csv; charset=utf-8"
+                )
+                self.assertIn(
+                    f'filename="{name}.csv"', response["Content-Disposition"]
+                )
+                self.assert_same_rows(name, read_rows(content.decode()))
+
+    def test_ndjson(self):
+        _, content = self.download("titles.ndjson")
+        records = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual(len(records), len(static_rows("titles")))
+        self.assertEqual(
+            list(records[0]),
+            [column for column, _ in DATASETS["titles"].columns],
+        )
+        self.assertIsInstance(records[0]["year"], int)
+
+    def test_gzip(self):
+        _, plain = self.download("review.ndjson")
+        response, compressed = self.download("review.ndjson.gz")
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertEqual(gzip.decompress(compressed), plain)
+
+    @override_settings(EXPORT_CHUNK_SIZE=7)
+    def test_reads_in_chunks(self):
+        rows = len(static_rows("review"))
+        with CaptureQueriesContext(connection) as queries:
+            _, content = self.download("review.csv")
+        selects = [
+            query
+            for query in queries
+            if query["sql"].startswith('SELECT "reviews_review"')
+        ]
+        self.assertEqual(len(selects), rows // 7 + 1)
+        self.assert_same_rows("review", read_rows(content.decode()))
+
+    def test_admin_only(self):
+        user = APIClient()
+        user.force_authenticate(User.objects.create_user(username="reader"))
+        self.assertEqual(
+            user.get("/api/v1/export/review.csv").status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+        self.assertEqual(
+            APIClient().get("/api/v1/export/review.csv").status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+    def test_unknown_dataset(self):
+        for path in ("users.csv", "review.xml"):
+            response = self.client.get(f"/api/v1/export/{path}")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as path:
+            call_command("export_data", path, stdout=StringIO())
+            self.assertEqual(
+                sorted(os.listdir(path)),
+                sorted(f"{name}.csv" for name in DATASETS),
+            )
+            for name in DATASETS:
+                with open(
+                    os.path.join(path, f"{name}.csv"), encoding="utf-8"
+                ) as f:
+                    self.assert_same_rows(name, read_rows(f.read()))
+
+            call_command(
+                "export_data",
+                path,
+                "--format",
+                "ndjson",
+                "--gzip",
+                "--dataset",
+                "genre",
+                "--chunk-size",
+                "3",
+                stdout=StringIO(),
+            )
+            with gzip.open(os.path.join(path, "genre.ndjson.gz")) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), len(static_rows("genre")))
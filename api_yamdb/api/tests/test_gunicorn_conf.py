@@ -0,0 +1,73 @@
+import os
+import runpy
+from types import SimpleNamespace
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+CONFIG = os.path.join(settings.BASE_DIR, "gunicorn.conf.py")
+
+
+def load_config(**env):
+    """Настройки gunicorn.conf.py на машине с двумя ядрами."""
+    with mock.patch.dict(os.environ, env), mock.patch(
+        "os.sched_getaffinity", return_value={0, 1}, create=True
+    ):
+        return runpy.run_path(CONFIG)
+
+
+class GunicornConfigTest(SimpleTestCase):
+    def test_defaults(self):
+        config = load_config()
+        self.assertEqual(config["wsgi_app"], "api_yamdb.wsgi:application")
+        self.assertEqual(config["worker_class"], "sync")
+        self.assertEqual(config["workers"], 5)
+        self.assertTrue(config["preload_app"])
+        self.assertGreater(config["max_requests_jitter"], 0)
+        # Дольше, чем keepalive_timeout upstream в nginx.
+        self.assertGreater(config["keepalive"], 60)
+
+    def test_worker_classes(self):
+        for worker_class, workers, threads, preload in (
+            ("gthread", 5, 4, True),
+            ("gevent", 2, 1, False),
+        ):
+            with self.subTest(worker_class=worker_class):
+                config = load_config(GUNICORN_WORKER_CLASS=worker_class)
+                self.assertEqual(config["worker_class"], worker_class)
+                self.assertEqual(config["workers"], workers)
+                self.assertEqual(config["threads"], threads)
+                self.assertEqual(config["preload_app"], preload)
+        with self.assertRaises(ValueError):
+            load_config(GUNICORN_WORKER_CLASS="eventlet")
+
+    def test_asgi(self):
+        config = load_config(SERVER_MODE="asgi", GUNICORN_WORKERS="3")
+        self.assertEqual(config["wsgi_app"], "api_yamdb.asgi:application")
+        self.assertEqual(
+            config["worker_class"], "uvicorn.workers.UvicornWorker"
+        )
+        self.assertEqual(config["workers"], 3)
+
+    def test_pre_fork(self):
+        pre_fork = load_config()["pre_fork"]
+        for preload in (True, False):
+            server = SimpleNamespace(cfg=SimpleNamespace(preload_app=preload))
+            with self.subTest(preload=preload), mock.patch(
+                "django.db.connections.close_all"
+            ) as close_all, mock.patch("gc.freeze") as freeze:
+                pre_fork(server, None)
+            self.assertEqual(close_all.called, preload)
+            self.assertEqual(freeze.called, preload)
+
+    @override_settings(DB_POOL_SIZE=4)
+    def test_pre_fork_closes_pools(self):
+        server = SimpleNamespace(cfg=SimpleNamespace(preload_app=True))
+        with mock.patch("django.db.connections.close_all"), mock.patch(
+            "gc.freeze"
+        ), mock.patch(
+            "api_yamdb.db.postgresql_pool.base.close_pools"
+        ) as close_pools:
+            load_config()["pre_fork"](server, None)
+        close_pools.assert_called_once_with()
@@ -0,0 +1,89 @@
+import csv
+import os
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db.models import Count, Sum
+from django.test import TestCase
+from reviews.models import Comment, Review
+from titles.models import Category, Genre, Title
+from users.models import User
+
+DATA_DIR: str = os.path.join(settings.BASE_DIR, "static", "data")
+
+
+def rows_in(filename):
+    with open(os.path.join(DATA_DIR, filename), encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+class ImportCsvTest(TestCase):
+    def test_import_static_data(self):
+        call_command("import_csv", "--batch-size", "7", stdout=StringIO())
+        self.assertEqual(User.objects.count(), len(rows_in("users.csv")))
+        self.assertEqual(
+            Category.objects.count(), len(rows_in("category.csv"))
+        )
+        self.assertEqual(Genre.objects.count(), len(rows_in("genre.csv")))
+        self.assertEqual(Title.objects.count(), len(rows_in("titles.csv")))
+        self.assertEqual(
+            Title.genre.through.objects.count(),
+            len(rows_in("genre_title.csv")),
+        )
+        self.assertEqual(Review.objects.count(), len(rows_in("review.csv")))
+        self.assertEqual(Comment.objects.count(), len(rows_in("comments.csv")))
+
+    def test_import_keeps_pub_date_and_rating(self):
+        call_command("import_csv", stdout=StringIO())
+        row = rows_in("review.csv")[0]
+        review = Review.objects.get(pk=row["id"])
+        self.assertEqual(
+            review.pub_date.isoformat()[:23], row["pub_date"][:23]
+        )
+        for title in Title.objects.annotate(
+            actual_sum=Sum("reviews__score"), actual_count=Count("reviews")
+        ):
+            self.assertEqual(title.reviews_count, title.actual_count)
+            if title.actual_count:
+                self.assertEqual(
+                    title.rating, title.actual_sum // title.actual_count
+                )
+
+    def test_import_twice_is_harmless(self):
+        call_command("import_csv", stdout=StringIO())
+        call_command("import_csv", stdout=StringIO())
+        self.assertEqual(Review.objects.count(), len(rows_in("review.csv")))
+        User.objects.create_user(username="after_import")
+
+    def test_conflicts_are_reported(self):
+        title = Title.objects.create(name="Фильм", year=2000)
+        author = User.objects.create_user(username="author")
+        with tempfile.TemporaryDirectory() as directory:
+            with open(
+                os.path.join(directory, "review.csv"), "w", encoding="utf-8"
+            ) as f:
+                writer = csv.writer(f)
+                writer.writerow(
+                    ["id", "title_id", "text", "author", "score", "pub_date"]
+                )
+                for review_id in (1, 2):
+                    writer.writerow(
+                        [
+                            review_id,
+                            title.id,
+                            "Отзыв",
+                            author.id,
+                            5,
+                            "2019-09-24T21:08:21.567Z",
+                        ]
+                    )
+            out = StringIO()
+            call_command("import_csv", "--path", directory, stdout=out)
+            self.assertIn("уже в базе 0, конфликтов 1", out.getvalue())
+            out = StringIO()
+            call_command("import_csv", "--path", directory, stdout=out)
+            self.assertIn("уже в базе 1, конфликтов 1", out.getvalue())
+        review = Review.objects.get()
+        self.assertEqual(review.pub_date.year, 2019)
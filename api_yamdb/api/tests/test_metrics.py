@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from prometheus_client import REGISTRY, CollectorRegistry, multiprocess
+from rest_framework import status
+from rest_framework.test import APIClient
+from titles.models import Category, Title
+from users.models import User
+
+# Воркер gunicorn: метрики пишутся в файлы общего каталога.
+WORKER_SCRIPT = """
+from api_yamdb.metrics import REQUEST_DURATION, RESPONSE_CACHE
+REQUEST_DURATION.labels("title-list", "GET", 200).observe(0.05)
+RESPONSE_CACHE.labels("hit").inc()
+"""
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="reader")
+        cls.title = Title.objects.create(
+            name="Кошмар на улице Вязов",
+            year=1984,
+            category=Category.objects.create(name="Фильм", slug="films"),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_metrics_endpoint(self):
+        self.client.get("/api/v1/titles/")
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertRegex(
+            response.content.decode(),
+            r"yamdb_http_request_duration_seconds_count\{[^}]*"
+            r'route="title-list"',
+        )
+
+    def test_route_is_router_basename(self):
+        name = "yamdb_db_queries_per_request_count"
+        before = sample(name, route="title-detail")
+        self.client.get(f"/api/v1/titles/{self.title.id}/")
+        self.client.get("/api/v1/titles/100500/")
+        self.assertEqual(sample(name, route="title-detail"), before + 2)
+
+    def test_response_cache_results(self):
+        name = "yamdb_response_cache_requests_total"
+        before = {
+            result: sample(name, result=result)
+            for result in ("hit", "miss", "not_modified", "bypass")
+        }
+        url = f"/api/v1/titles/{self.title.id}/"
+        etag = self.client.get(url)["ETag"]
+        self.client.get(url)
+        self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.client.get(url, HTTP_AUTHORIZATION="Bearer token")
+        for result in before:
+            self.assertEqual(sample(name, result=result), before[result] + 1)
+
+    def test_rating_update_and_send_token_are_timed(self):
+        rating = sample("yamdb_rating_update_duration_seconds_count")
+        send_token = sample("yamdb_send_token_duration_seconds_count")
+        client = APIClient()
+        client.force_authenticate(self.user)
+        client.post(
+            f"/api/v1/titles/{self.title.id}/reviews/",
+            {"text": "Отзыв", "score": 7},
+        )
+        self.client.post(
+            "/api/v1/auth/signup/",
+            {"email": "new@yamdb.fake", "username": "newbie"},
+        )
+        self.assertEqual(
+            sample("yamdb_rating_update_duration_seconds_count"), rating + 1
+        )
+        self.assertEqual(
+            sample("yamdb_send_token_duration_seconds_count"), send_token + 1
+        )
+
+    def test_metrics_are_summed_across_processes(self):
+        with tempfile.TemporaryDirectory() as path:
+            env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": path}
+            for _ in range(2):
+                subprocess.run(
+                    [sys.executable, "-c", WORKER_SCRIPT],
+                    cwd=settings.BASE_DIR,
+                    env=env,
+                    check=True,
+                )
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry, path=path)
+            self.assertEqual(
+                registry.get_sample_value(
+                    "yamdb_http_request_duration_seconds_count",
+                    {"route": "title-list", "method": "GET", "status": "200"},
+                ),
+                2,
+            )
+            self.assertEqual(
+                registry.get_sample_value(
+                    "yamdb_response_cache_requests_total", {"result": "hit"}
+                ),
+                2,
+            )
@@ -0,0 +1,84 @@
+from io import StringIO
+from smtplib import SMTPException
+
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from outbox.mail import enqueue_mail
+from outbox.models import Email
+from rest_framework.test import APIClient
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException("relay is down")
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        if not getattr(self, "is_open", False):
+            CountingBackend.opened += 1
+            self.is_open = True
+
+    def close(self):
+        self.is_open = False
+
+
+class OutboxTest(TestCase):
+    def drain(self, *args):
+        call_command("send_outbox", *args, stdout=StringIO())
+
+    def test_signup_only_enqueues_email(self):
+        response = APIClient().post(
+            "/api/v1/auth/signup/",
+            {"email": "test@mail.ru", "username": "testusername"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+        email = Email.objects.get()
+        self.assertEqual(email.recipients, ["test@mail.ru"])
+        self.assertIsNone(email.sent_at)
+
+    @override_settings(EMAIL_BACKEND="api.tests.test_outbox.CountingBackend")
+    def test_batch_reuses_one_connection(self):
+        for i in range(5):
+            enqueue_mail("Тема", "Текст", "from@example.com", [f"{i}@a.ru"])
+        CountingBackend.opened = 0
+        self.drain("--batch-size", "2")
+        self.assertEqual(CountingBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(Email.objects.filter(sent_at__isnull=True).exists())
+
+    def test_sent_emails_are_not_resent(self):
+        enqueue_mail("Тема", "Текст", "from@example.com", ["to@a.ru"])
+        self.drain()
+        self.drain()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_failed_email_is_retried(self):
+        email = enqueue_mail("Тема", "Текст", "from@example.com", ["to@a.ru"])
+        with override_settings(
+            EMAIL_BACKEND="api.tests.test_outbox.FailingBackend"
+        ):
+            self.drain("--retry-delay", "60")
+        email.refresh_from_db()
+        self.assertEqual(email.attempts, 1)
+        self.assertEqual(email.last_error, "relay is down")
+        self.assertGreater(email.send_after, timezone.now())
+
+        self.drain()
+        self.assertEqual(len(mail.outbox), 0)
+        Email.objects.update(send_after=timezone.now())
+        self.drain()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_email_dropped_after_max_attempts(self):
+        enqueue_mail("Тема", "Текст", "from@example.com", ["to@a.ru"])
+        Email.objects.update(attempts=5)
+        self.drain("--max-attempts", "5")
+        self.assertEqual(len(mail.outbox), 0)
@@ -0,0 +1,188 @@
+import json
+from unittest import mock
+
+from api.instrumentation import QueryBudgetError, fingerprint
+from api.views import ReviewViewSet
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from reviews.models import Comment, Review
+from titles.models import Category, Genre, Title
+from users.models import User
+
+AUTHORS_COUNT: int = 12
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class QueryBudgetTest(TestCase):
+    """
+    Каждый запрос укладывается в query_budgets своего представления,
+    иначе middleware бросает QueryBudgetError. Страницы заполнены
+    объектами разных авторов, чтобы N+1 не спрятался.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_user(
+            username="admin", email="admin@yamdb.fake", role="admin"
+        )
+        cls.user = User.objects.create_user(
+            username="reader", email="reader@yamdb.fake", role="user"
+        )
+        Category.objects.create(name="Фильм", slug="films")
+        Genre.objects.create(name="Ужасы", slug="horror")
+        Genre.objects.create(name="Драма", slug="drama")
+        cls.title = Title.objects.create(
+            name="Кошмар на улице Вязов",
+            year=1984,
+            category=Category.objects.get(slug="films"),
+        )
+        cls.title.genre.set(Genre.objects.all())
+        authors = [
+            User.objects.create_user(
+                username=f"author{i}", email=f"author{i}@yamdb.fake"
+            )
+            for i in range(AUTHORS_COUNT)
+        ]
+        for author in authors:
+            review = Review.objects.create(
+                title=cls.title, text="Отзыв", score=5, author=author
+            )
+        cls.review = review
+        for author in authors:
+            cls.comment = Comment.objects.create(
+                review=review, text="Комментарий", author=author
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.admin_client = APIClient()
+        self.admin_client.force_authenticate(self.admin_user)
+        self.user_client = APIClient()
+        self.user_client.force_authenticate(self.user)
+        self.title_url = f"/api/v1/titles/{self.title.id}/"
+        self.review_url = f"{self.title_url}reviews/{self.review.id}/"
+        self.comment_url = f"{self.review_url}comments/{self.comment.id}/"
+
+    def check(self, client, method, url, data=None):
+        response = getattr(client, method)(url, data, format="json")
+        self.assertLess(response.status_code, 400, response.content)
+        self.assertIsNotNone(response.sql_stats["budget"], url)
+        return response
+
+    def test_titles(self):
+        self.check(self.user_client, "get", "/api/v1/titles/")
+        self.check(self.user_client, "get", "/api/v1/titles/?genre=horror")
+        self.check(self.user_client, "get", self.title_url)
+
+    def test_genres_and_categories(self):
+        for url in ("/api/v1/genres/", "/api/v1/categories/"):
+            self.check(self.user_client, "get", url)
+            self.check(
+                self.admin_client,
+                "post",
+                url,
+                {"name": "Новое", "slug": "new"},
+            )
+            self.check(self.admin_client, "delete", f"{url}new/")
+
+    def test_reviews(self):
+        reviews_url = f"{self.title_url}reviews/"
+        self.check(self.user_client, "get", reviews_url)
+        self.check(self.user_client, "get", f"{reviews_url}?cursor=")
+        self.check(self.user_client, "get", self.review_url)
+        response = self.check(
+            self.user_client, "post", reviews_url, {"text": "Ого", "score": 9}
+        )
+        own_url = f"{reviews_url}{response.json()['id']}/"
+        self.check(self.user_client, "patch", own_url, {"score": 3})
+        self.check(self.admin_client, "delete", self.review_url)
+
+    def test_comments(self):
+        comments_url = f"{self.review_url}comments/"
+        self.check(self.user_client, "get", comments_url)
+        self.check(self.user_client, "get", f"{comments_url}?cursor=")
+        self.check(self.user_client, "get", self.comment_url)
+        self.check(self.user_client, "post", comments_url, {"text": "Да"})
+        self.check(self.admin_client, "patch", self.comment_url, {"text": "Н"})
+        self.check(self.admin_client, "put", self.comment_url, {"text": "Т"})
+        self.check(self.admin_client, "delete", self.comment_url)
+
+    def test_users(self):
+        self.check(self.admin_client, "get", "/api/v1/users/")
+        self.check(self.admin_client, "get", "/api/v1/users/reader/")
+        self.check(self.user_client, "get", "/api/v1/users/me/")
+        self.check(
+            self.user_client, "patch", "/api/v1/users/me/", {"bio": "О"}
+        )
+
+    def test_auth(self):
+        client = APIClient()
+        self.check(
+            client,
+            "post",
+            "/api/v1/auth/signup/",
+            {"username": "newbie", "email": "newbie@yamdb.fake"},
+        )
+        self.check(
+            client,
+            "post",
+            "/api/v1/auth/token/",
+            {
+                "username": "reader",
+                "confirmation_code": PasswordResetTokenGenerator().make_token(
+                    self.user
+                ),
+            },
+        )
+
+    def test_exceeded_budget_raises(self):
+        with mock.patch.object(ReviewViewSet, "query_budgets", {"list": 1}):
+            with self.assertRaises(QueryBudgetError):
+                with self.assertLogs("api.sql", "WARNING"):
+                    self.user_client.get(f"{self.title_url}reviews/")
+
+
+class InstrumentationTest(TestCase):
+    def test_server_timing(self):
+        Genre.objects.create(name="Ужасы", slug="horror")
+        response = APIClient().get("/api/v1/genres/")
+        self.assertRegex(
+            response["Server-Timing"], r'^db;dur=[\d.]+;desc="2 queries"'
+        )
+        self.assertEqual(response.sql_stats["action"], "list")
+        self.assertEqual(response.sql_stats["budget"], 2)
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            fingerprint("SELECT *\n  FROM t WHERE id IN (%s, %s, %s)"),
+            fingerprint("SELECT * FROM t WHERE id IN (%s, %s)"),
+        )
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    def test_duplicates_are_reported(self):
+        title = Title.objects.create(name="Фильм", year=2000)
+        for i in range(3):
+            Review.objects.create(
+                title=title,
+                text="Отзыв",
+                score=5,
+                author=User.objects.create_user(username=f"author{i}"),
+            )
+        # Без select_related автор каждого отзыва читается отдельно.
+        with mock.patch.object(
+            ReviewViewSet, "get_queryset", lambda view: title.reviews.all()
+        ):
+            with self.assertLogs("api.sql", "WARNING") as logs:
+                response = APIClient().get(
+                    f"/api/v1/titles/{title.id}/reviews/"
+                )
+        duplicates = response.sql_stats["duplicates"]
+        self.assertEqual(len(duplicates), 1)
+        self.assertEqual(duplicates[0]["count"], 3)
+        self.assertIn("users_user", duplicates[0]["sql"])
+        self.assertIn('db-duplicates;desc="3"', response["Server-Timing"])
+        self.assertEqual(
+            json.loads(logs.records[0].getMessage())["queries"], 5
+        )
@@ -0,0 +1,171 @@
+import json
+import re
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from reviews.models import Comment, Review
+from titles.models import Category, Genre, Title
+from users.models import User
+
+# Таблицы, которые на горячих путях читаются только по индексу.
+HOT_TABLES = (
+    "titles_title",
+    "titles_title_genre",
+    "reviews_review",
+    "reviews_comment",
+)
+
+SQLITE_SCAN = re.compile(
+    r"^SCAN (?:TABLE )?(\w+)( USING (?:COVERING )?INDEX)?"
+)
+
+
+def sqlite_problems(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        details = [row[-1] for row in cursor.fetchall()]
+    problems = []
+    for detail in details:
+        match = SQLITE_SCAN.match(detail)
+        if match and match.group(1) in HOT_TABLES:
+            kind = "index scan" if match.group(2) else "seq scan"
+            problems.append(f"{kind} on {match.group(1)}")
+        elif detail.startswith("USE TEMP B-TREE FOR ORDER BY"):
+            problems.append("sort")
+    return problems
+
+
+def postgres_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from postgres_nodes(child)
+
+
+def postgres_problems(sql):
+    # На маленькой тестовой базе Postgres предпочтёт Seq Scan любому
+    # индексу, поэтому проверяем, что индекс вообще есть.
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    problems = []
+    for node in postgres_nodes(plan[0]["Plan"]):
+        relation = node.get("Relation Name")
+        if node["Node Type"] == "Seq Scan" and relation in HOT_TABLES:
+            problems.append(f"seq scan on {relation}")
+        elif node["Node Type"] == "Sort":
+            problems.append("sort")
+    return problems
+
+
+def plan_problems(sql):
+    if connection.vendor == "postgresql":
+        return postgres_problems(sql)
+    return sqlite_problems(sql)
+
+
+class QueryPlanTest(TestCase):
+    """Запросы горячих эндпоинтов не читают таблицы целиком и не сортируют."""
+
+    @classmethod
+    def setUpTestData(cls):
+        genres = [
+            Genre.objects.create(name=f"Жанр {i}", slug=f"genre-{i}")
+            for i in range(3)
+        ]
+        categories = [
+            Category.objects.create(name=f"Категория {i}", slug=f"cat-{i}")
+            for i in range(2)
+        ]
+        users = [
+            User.objects.create_user(username=f"user{i}") for i in range(3)
+        ]
+        for i in range(6):
+            title = Title.objects.create(
+                name=f"Произведение {i}",
+                year=1980 + i % 3,
+                category=categories[i % 2],
+            )
+            title.genre.set(genres[: i % 3 + 1])
+            for user in users:
+                review = Review.objects.create(
+                    title=title, text="Отзыв", score=5, author=user
+                )
+                Comment.objects.create(
+                    review=review, text="Комментарий", author=user
+                )
+        cls.title = title
+        cls.review = review
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def assert_indexed(self, url, sort=False, index_scan=False):
+        """
+        sort=True разрешает сортировку, index_scan=True — обход всего
+        индекса по порядку: для сортировок с LIMIT он читает только
+        первые строки.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for query in context.captured_queries:
+            with self.subTest(url=url, sql=query["sql"]):
+                problems = plan_problems(query["sql"])
+                if sort:
+                    problems = [p for p in problems if p != "sort"]
+                if index_scan:
+                    problems = [
+                        p for p in problems if not p.startswith("index scan")
+                    ]
+                self.assertEqual(problems, [])
+
+    def test_title_filters(self):
+        for query in (
+            "category=cat-1",
+            "category=cat-1&year=1981",
+            "genre=genre-2",
+            "genre=genre-2&category=cat-0",
+        ):
+            self.assert_indexed(f"/api/v1/titles/?{query}")
+
+    def test_title_detail(self):
+        self.assert_indexed(f"/api/v1/titles/{self.title.id}/")
+
+    def test_reviews(self):
+        url = f"/api/v1/titles/{self.title.id}/reviews/"
+        self.assert_indexed(url)
+        self.assert_indexed(f"{url}?limit=2&offset=1")
+        self.assert_indexed(f"{url}?cursor=&limit=2")
+        next_page = self.client.get(f"{url}?cursor=&limit=2").json()["next"]
+        self.assert_indexed(next_page)
+        self.assert_indexed(f"{url}{self.review.id}/")
+
+    def test_comments(self):
+        url = (
+            f"/api/v1/titles/{self.title.id}/reviews/{self.review.id}"
+            "/comments/"
+        )
+        self.assert_indexed(url)
+        self.assert_indexed(f"{url}?cursor=&limit=2")
+
+    def test_title_ordering(self):
+        for field in ("name", "year", "rating", "reviews_count"):
+            for ordering in (field, f"-{field}"):
+                self.assert_indexed(
+                    f"/api/v1/titles/?ordering={ordering}", index_scan=True
+                )
+
+    def test_title_top(self):
+        for query in ("", "category=cat-1", "year=1981"):
+            self.assert_indexed(
+                f"/api/v1/titles/top/?{query}", index_scan=True
+            )
+        # Произведения жанра находятся по индексу (genre_id, title_id),
+        # сортируются только они.
+        self.assert_indexed("/api/v1/titles/top/?genre=genre-2", sort=True)
@@ -0,0 +1,122 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from reviews.models import Review
+from titles.models import Title, weighted_rating
+from users.models import User
+
+
+@override_settings(RATING_PRIOR_MEAN=5.5, RATING_PRIOR_WEIGHT=10)
+class RatingHistogramTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.title = Title.objects.create(name="Кошмар", year=1984)
+        cls.other = Title.objects.create(name="Пятница, 13-е", year=1980)
+        cls.users = [
+            User.objects.create_user(username=f"reader_{i}") for i in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def review(self, author, score, title=None):
+        return Review.objects.create(
+            title=title or self.title, author=author, text="Отзыв", score=score
+        )
+
+    def fresh_title(self):
+        return Title.objects.get(pk=self.title.id)
+
+    def test_histogram_follows_reviews(self):
+        first = self.review(self.users[0], 4)
+        self.review(self.users[1], 9)
+        second = self.review(self.users[2], 9)
+        title = self.fresh_title()
+        self.assertEqual(title.histogram()[9], 2)
+        self.assertEqual(title.histogram()[4], 1)
+        self.assertEqual(title.average_rating, Decimal("7.33"))
+        self.assertAlmostEqual(title.weighted_rating, (55 + 22) / 13)
+
+        second.score = 2
+        second.save()
+        first.delete()
+        title = self.fresh_title()
+        self.assertEqual(
+            {score: n for score, n in title.histogram().items() if n},
+            {2: 1, 9: 1},
+        )
+        self.assertEqual(title.average_rating, Decimal("5.50"))
+
+    def test_average_rating_rounds_half_up(self):
+        # 9 / 8 = 1.125: ROUND_HALF_EVEN дал бы 1.12.
+        users = self.users + [
+            User.objects.create_user(username=f"reader_{i}")
+            for i in range(3, 8)
+        ]
+        self.review(users[0], 2)
+        for user in users[1:]:
+            self.review(user, 1)
+        self.assertEqual(self.fresh_title().average_rating, Decimal("1.13"))
+        call_command("rebuild_counters", "--check", stdout=StringIO())
+
+    def test_title_without_reviews(self):
+        title = self.fresh_title()
+        self.assertEqual(sum(title.histogram().values()), 0)
+        self.assertIsNone(title.average_rating)
+        self.assertEqual(title.weighted_rating, 5.5)
+        self.review(self.users[0], 10).delete()
+        title = self.fresh_title()
+        self.assertIsNone(title.average_rating)
+        self.assertEqual(title.weighted_rating, 5.5)
+
+    def test_rating_endpoint(self):
+        self.review(self.users[0], 8)
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                f"/api/v1/titles/{self.title.id}/rating/"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["histogram"]["8"], 1)
+        self.assertEqual(sum(data["histogram"].values()), 1)
+        self.assertEqual(data["average_rating"], "8.00")
+        self.assertEqual(data["reviews_count"], 1)
+        self.assertAlmostEqual(data["weighted_rating"], weighted_rating(8, 1))
+
+    def test_ordering_by_weighted_rating(self):
+        # Одна десятка весит меньше, чем много восьмёрок.
+        self.review(self.users[0], 10, title=self.other)
+        for user in self.users:
+            self.review(user, 8)
+        response = self.client.get("/api/v1/titles/?ordering=-weighted_rating")
+        self.assertEqual(
+            [title["id"] for title in response.json()["results"]],
+            [self.title.id, self.other.id],
+        )
+        response = self.client.get("/api/v1/titles/?ordering=-average_rating")
+        self.assertEqual(
+            [title["id"] for title in response.json()["results"]],
+            [self.other.id, self.title.id],
+        )
+
+    def test_rebuild_counters_fixes_histogram(self):
+        self.review(self.users[0], 3)
+        self.review(self.users[1], 7)
+        Title.objects.filter(pk=self.title.id).update(
+            score_3_count=5, average_rating=1, weighted_rating=1
+        )
+        with self.assertRaises(CommandError):
+            call_command("rebuild_counters", "--check", stdout=StringIO())
+        call_command("rebuild_counters", stdout=StringIO())
+        title = self.fresh_title()
+        self.assertEqual(title.histogram()[3], 1)
+        self.assertEqual(title.average_rating, Decimal("5.00"))
+        self.assertAlmostEqual(title.weighted_rating, weighted_rating(10, 2))
+        call_command("rebuild_counters", "--check", stdout=StringIO())
@@ -0,0 +1,125 @@
+import json
+from collections import OrderedDict
+from datetime import datetime, timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from users.models import User
+
+from ..parsers import FastJSONParser
+from ..renderers import FastJSONRenderer, orjson
+
+PAYLOAD = {
+    "pub_date": datetime(2020, 1, 13, 23, 20, 2, 422123, timezone.utc),
+    "naive": datetime(2020, 1, 13, 23, 20, 2),
+    "average_rating": Decimal("7.33"),
+    "weighted_rating": 6.076923076923077,
+    "label": gettext_lazy("Отзыв"),
+    "text": '«Кошмар»\u2028на улице\u2029Вязов "\\ \n',
+    "rating": None,
+    "histogram": OrderedDict([(1, 0), (10, 2)]),
+    "genre": ({"name": "Ужасы", "slug": "horror"},),
+    "empty": [],
+}
+
+
+def render_both(data, accepted_media_type=None):
+    return (
+        JSONRenderer().render(data, accepted_media_type),
+        FastJSONRenderer().render(data, accepted_media_type),
+    )
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    def test_same_bytes_as_drf(self):
+        drf, fast = render_both(PAYLOAD)
+        self.assertEqual(fast, drf)
+        self.assertIn(b'"pub_date":"2020-01-13T23:20:02.422', fast)
+        self.assertIn(b"\\u2028", fast)
+
+    def test_indent_and_empty(self):
+        self.assertEqual(*render_both(PAYLOAD, "application/json; indent=4"))
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_stdlib_fallback(self):
+        with mock.patch("api.renderers.orjson", None):
+            drf, fast = render_both(PAYLOAD)
+        self.assertEqual(fast, drf)
+
+    @skipUnless(orjson, "orjson не установлен")
+    def test_uses_orjson(self):
+        with mock.patch("rest_framework.renderers.json.dumps") as dumps:
+            FastJSONRenderer().render(PAYLOAD)
+        dumps.assert_not_called()
+
+
+class FastJSONParserTest(SimpleTestCase):
+    def parse(self, content):
+        return FastJSONParser().parse(BytesIO(content))
+
+    def test_same_data_as_drf(self):
+        content = JSONRenderer().render(PAYLOAD)
+        self.assertEqual(
+            self.parse(content), JSONParser().parse(BytesIO(content))
+        )
+        self.assertEqual(self.parse(b"[]"), [])
+
+    def test_errors(self):
+        for content in (b'{"text": ', b'{"score": NaN}', b"\xff"):
+            with self.subTest(content=content):
+                with self.assertRaises(ParseError):
+                    self.parse(content)
+
+    def test_other_encoding(self):
+        content = json.dumps({"text": "Отзыв"}, ensure_ascii=False)
+        data = FastJSONParser().parse(
+            BytesIO(content.encode("cp1251")),
+            parser_context={"encoding": "cp1251"},
+        )
+        self.assertEqual(data, {"text": "Отзыв"})
+
+
+class JSONResponseTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("import_csv", stdout=StringIO())
+        cls.user = User.objects.create_user(username="reader")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_pages_match_drf(self):
+        for url in (
+            "/api/v1/titles/?limit=100",
+            "/api/v1/titles/1/rating/",
+            "/api/v1/titles/1/reviews/?limit=100",
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    response.content, JSONRenderer().render(response.data)
+                )
+
+    def test_json_body(self):
+        title = "/api/v1/titles/1/reviews/"
+        response = self.client.post(
+            title, {"text": "Отзыв", "score": 7}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(
+            title, b"{", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
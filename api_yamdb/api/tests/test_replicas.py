@@ -0,0 +1,156 @@
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.db import connections
+from django.test import (SimpleTestCase, TestCase, TransactionTestCase,
+                         override_settings)
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from titles.models import Category, Title
+from users.models import User
+
+from api_yamdb.db.routers import ReplicaRouter, state
+
+from ..views import CustomTokenObtainView
+
+
+def client_for(user):
+    client = APIClient()
+    token = CustomTokenObtainView().get_tokens_for_user(user)["token"]
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTest(SimpleTestCase):
+    def tearDown(self):
+        state.read_only = False
+
+    def test_reads_in_safe_requests_go_to_replica(self):
+        router = ReplicaRouter()
+        state.read_only = True
+        self.assertEqual(router.db_for_read(Title), "replica")
+        self.assertEqual(router.db_for_write(Title), "default")
+
+    def test_other_reads_go_to_primary(self):
+        self.assertIsNone(ReplicaRouter().db_for_read(Title))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        state.read_only = True
+        self.assertIsNone(ReplicaRouter().db_for_read(Title))
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingMiddlewareTest(TestCase):
+    """
+    Вместо реплики роутер получает default: random.choice вызывается,
+    только когда чтение ушло бы на реплику.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="reader")
+        cls.writer = User.objects.create_user(username="writer")
+        cls.title = Title.objects.create(
+            name="Кошмар на улице Вязов",
+            year=1984,
+            category=Category.objects.create(name="Фильм", slug="films"),
+        )
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch(
+            "api_yamdb.db.routers.random.choice", return_value="default"
+        )
+        self.choice = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.title_url = f"/api/v1/titles/{self.title.id}/"
+
+    def reads_replica(self, client, method, url, data=None):
+        self.choice.reset_mock()
+        response = getattr(client, method)(url, data)
+        self.assertLess(response.status_code, 400, response.content)
+        return self.choice.called
+
+    def test_safe_requests_read_replica(self):
+        self.assertTrue(
+            self.reads_replica(APIClient(), "get", "/api/v1/titles/")
+        )
+        self.assertTrue(
+            self.reads_replica(client_for(self.user), "get", self.title_url)
+        )
+
+    def test_writer_sticks_to_primary(self):
+        writer = client_for(self.writer)
+        self.assertFalse(
+            self.reads_replica(
+                writer,
+                "post",
+                f"{self.title_url}reviews/",
+                {"text": "Отзыв", "score": 10},
+            )
+        )
+        self.assertFalse(self.reads_replica(writer, "get", self.title_url))
+        self.assertTrue(
+            self.reads_replica(
+                client_for(self.user), "get", "/api/v1/categories/"
+            )
+        )
+        cache.clear()
+        self.assertTrue(self.reads_replica(writer, "get", self.title_url))
+
+    def test_changed_responses_are_read_from_primary(self):
+        # Отстающая реплика отдала бы старый рейтинг, и он попал бы в кеш
+        # ответов под новой версией меток, а с ним и в ETag.
+        anonymous = APIClient()
+        self.assertTrue(self.reads_replica(anonymous, "get", self.title_url))
+        client_for(self.writer).post(
+            f"{self.title_url}reviews/", {"text": "Отзыв", "score": 10}
+        )
+        self.choice.side_effect = AssertionError("чтение с реплики")
+        response = anonymous.get(self.title_url)
+        self.assertEqual(response.json()["rating"], 10)
+        self.choice.side_effect = None
+        self.assertTrue(
+            self.reads_replica(anonymous, "get", "/api/v1/categories/")
+        )
+
+    def test_failed_write_does_not_pin(self):
+        writer = client_for(self.writer)
+        response = writer.post(f"{self.title_url}reviews/", {"score": 100})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(self.reads_replica(writer, "get", self.title_url))
+
+
+@skipUnless(
+    "replica" in connections, "нужна реплика: DB_REPLICA_NAME или HOST"
+)
+class ReplicaDatabaseTest(TransactionTestCase):
+    """В тестах реплика — зеркало основной базы."""
+
+    databases = "__all__"
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="reader")
+        self.title = Title.objects.create(name="Фильм", year=2000)
+        # Иначе свежее произведение читалось бы с основной базы.
+        cache.clear()
+
+    def test_reads_go_to_replica(self):
+        with CaptureQueriesContext(connections["replica"]) as queries:
+            response = client_for(self.user).get(
+                f"/api/v1/titles/{self.title.id}/"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(queries.captured_queries)
+
+    def test_writes_go_to_primary(self):
+        with CaptureQueriesContext(connections["replica"]) as queries:
+            response = client_for(self.user).post(
+                f"/api/v1/titles/{self.title.id}/reviews/",
+                {"text": "Отзыв", "score": 10},
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(queries.captured_queries, [])
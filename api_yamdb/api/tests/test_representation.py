@@ -0,0 +1,109 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import serializers, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from reviews.models import Comment, Review
+from titles.models import Title
+from users.models import User
+
+from ..representation import FastRepresentationMixin
+from ..serializers import (CommentsSerializer, ReviewsSerializer,
+                           TitleSerializer)
+
+
+def drf_representation():
+    """Путь ModelSerializer, как до FastRepresentationMixin."""
+    return mock.patch.object(
+        FastRepresentationMixin,
+        "to_representation",
+        serializers.Serializer.to_representation,
+    )
+
+
+class FastRepresentationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("import_csv", stdout=StringIO())
+        # Без категории, жанров и отзывов; дата с микросекундами.
+        cls.title = Title.objects.create(name="Без категории", year=2000)
+        cls.user = User.objects.create_user(username="reader")
+        cls.review = Review.objects.create(
+            title=cls.title, author=cls.user, text="«Отзыв»\n", score=7
+        )
+        Comment.objects.create(review=cls.review, author=cls.user, text="")
+
+    def setUp(self):
+        self.client = APIClient()
+        # С токеном ответы не берутся из кеша.
+        self.client.force_authenticate(self.user)
+
+    def get(self, url):
+        cache.clear()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.content
+
+    def test_responses_match_model_serializer(self):
+        review = Review.objects.filter(comments__isnull=False).first()
+        comment = review.comments.first()
+        reviews = f"/api/v1/titles/{review.title_id}/reviews/"
+        comments = f"{reviews}{review.id}/comments/"
+        for url in (
+            "/api/v1/titles/?limit=100",
+            f"/api/v1/titles/{self.title.id}/",
+            f"/api/v1/titles/{review.title_id}/",
+            "/api/v1/titles/top/?limit=100",
+            f"{reviews}?limit=100",
+            f"{reviews}?cursor=",
+            f"{reviews}{review.id}/",
+            f"/api/v1/titles/{self.title.id}/reviews/{self.review.id}/",
+            f"{comments}?limit=100",
+            f"{comments}{comment.id}/",
+        ):
+            with self.subTest(url=url):
+                fast = self.get(url)
+                with drf_representation():
+                    self.assertEqual(fast, self.get(url))
+
+    def test_serializers_match_model_serializer(self):
+        for serializer, queryset in (
+            (
+                TitleSerializer,
+                Title.objects.select_related("category").prefetch_related(
+                    "genre"
+                ),
+            ),
+            (ReviewsSerializer, Review.objects.select_related("author")),
+            (CommentsSerializer, Comment.objects.select_related("author")),
+        ):
+            with self.subTest(serializer=serializer.__name__):
+                objects = list(queryset)
+                fast = JSONRenderer().render(
+                    serializer(objects, many=True).data
+                )
+                with drf_representation():
+                    self.assertEqual(
+                        fast,
+                        JSONRenderer().render(
+                            serializer(objects, many=True).data
+                        ),
+                    )
+
+    def test_write_response(self):
+        response = self.client.post(
+            f"/api/v1/titles/{self.title.id}/reviews/{self.review.id}"
+            "/comments/",
+            {"text": "Согласен"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        comment = Comment.objects.get(pk=response.json()["id"])
+        with drf_representation():
+            self.assertEqual(
+                response.content,
+                JSONRenderer().render(CommentsSerializer(comment).data),
+            )
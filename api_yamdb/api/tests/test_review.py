@@ -1,8 +1,15 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
 from django.shortcuts import get_object_or_404
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
-from reviews.models import Review
+from reviews.models import Comment, Review
 from titles.models import Category, Genre, Title
 from users.models import User
 
@@ -68,3 +75,121 @@ class ReviewViewsTest(TestCase):
             f"/api/v1/titles/{self.title.id}/reviews/{self.review.id}/"
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_review_update_shifts_title_score(self):
+        response = self.admin_client.patch(
+            f"/api/v1/titles/{self.title.id}/reviews/{self.review.id}/",
+            data={"score": 9},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        title = Title.objects.get(pk=self.title.id)
+        self.assertEqual(title.score_sum, 9)
+        self.assertEqual(title.reviews_count, 1)
+        self.assertEqual(title.rating, 9)
+
+    def test_review_delete_resets_title_rating(self):
+        response = self.admin_client.delete(
+            f"/api/v1/titles/{self.title.id}/reviews/{self.review.id}/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        title = Title.objects.get(pk=self.title.id)
+        self.assertEqual(title.score_sum, 0)
+        self.assertEqual(title.reviews_count, 0)
+        self.assertIsNone(title.rating)
+
+    def test_rebuild_counters_fixes_drift(self):
+        Title.objects.filter(pk=self.title.id).update(
+            score_sum=100, reviews_count=7, rating=14
+        )
+        with self.assertRaises(CommandError):
+            call_command("rebuild_counters", "--check", stdout=StringIO())
+        call_command("rebuild_counters", stdout=StringIO())
+        title = Title.objects.get(pk=self.title.id)
+        self.assertEqual(title.score_sum, 5)
+        self.assertEqual(title.reviews_count, 1)
+        self.assertEqual(title.rating, 5)
+        call_command("rebuild_counters", "--check", stdout=StringIO())
+
+    def test_rebuild_counters_fixes_comments_count(self):
+        Comment.objects.create(
+            review=self.review, text="Комментарий", author=self.user
+        )
+        Review.objects.filter(pk=self.review.id).update(comments_count=5)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_counters", "--check", stdout=StringIO())
+        call_command("rebuild_counters", stdout=StringIO())
+        self.assertEqual(
+            Review.objects.get(pk=self.review.id).comments_count, 1
+        )
+
+    def test_title_shows_reviews_count(self):
+        cache.clear()
+        response = self.client.get(f"/api/v1/titles/{self.title.id}/")
+        self.assertEqual(response.json()["reviews_count"], 1)
+
+    def test_title_deletion_skips_counter_updates(self):
+        with CaptureQueriesContext(connection) as queries:
+            Title.objects.get(pk=self.title.id).delete()
+        self.assertFalse([q for q in queries if q["sql"].startswith("UPDATE")])
+
+    def create_reviews(self, count):
+        for i in range(count):
+            author = User.objects.create_user(username=f"reader_{i}")
+            Review.objects.create(
+                title=self.title, text=f"Отзыв {i}", score=7, author=author
+            )
+
+    def test_reviews_cursor_pagination(self):
+        self.create_reviews(6)
+        # Одинаковая дата у части отзывов: порядок держится на id.
+        Review.objects.filter(text__in=["Отзыв 1", "Отзыв 2"]).update(
+            pub_date=Review.objects.get(text="Отзыв 3").pub_date
+        )
+        expected = list(
+            Review.objects.order_by("-pub_date", "-id").values_list(
+                "id", flat=True
+            )
+        )
+        url = f"/api/v1/titles/{self.title.id}/reviews/?cursor=&limit=3"
+        received = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.json())
+            received += [review["id"] for review in response.json()["results"]]
+            url = response.json()["next"]
+        self.assertEqual(received, expected)
+
+    def test_reviews_cursor_pages_are_stable(self):
+        self.create_reviews(4)
+        response = self.client.get(
+            f"/api/v1/titles/{self.title.id}/reviews/?cursor=&limit=2"
+        )
+        first_page = [review["id"] for review in response.json()["results"]]
+        next_url = response.json()["next"]
+        Review.objects.create(
+            title=self.title,
+            text="Свежий отзыв",
+            score=1,
+            author=self.user,
+        )
+        response = self.client.get(next_url)
+        second_page = [review["id"] for review in response.json()["results"]]
+        self.assertEqual(len(second_page), 2)
+        self.assertFalse(set(first_page) & set(second_page))
+        response = self.client.get(response.json()["previous"])
+        self.assertEqual(
+            [review["id"] for review in response.json()["results"]],
+            first_page,
+        )
+
+    def test_reviews_cursor_skips_count_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(f"/api/v1/titles/{self.title.id}/reviews/?cursor=")
+        self.assertFalse([q for q in queries if "COUNT(" in q["sql"].upper()])
+
+    def test_reviews_invalid_cursor(self):
+        response = self.client.get(
+            f"/api/v1/titles/{self.title.id}/reviews/?cursor=bad"
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
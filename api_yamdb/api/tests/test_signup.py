@@ -1,8 +1,10 @@
 import unittest
+from io import StringIO
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.core import mail
+from django.core.management import call_command
 from django.test import TestCase
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -207,6 +209,8 @@ class SignUpViewsTest(TestCase):
         self.assertEqual(user.username, "testusername")
         self.assertEqual(user.email, "test@mail.ru")
         self.assertEqual(user.role, "user")
+        self.assertEqual(len(mail.outbox), 0)
+        call_command("send_outbox", stdout=StringIO())
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(
             mail.outbox[0].subject, "Confirmation code for receiving a token"
@@ -222,6 +226,7 @@ class SignUpViewsTest(TestCase):
         data = {"email": "test@mail.ru", "username": "testusername"}
         response = self.guest_client.post(url, data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        call_command("send_outbox", stdout=StringIO())
         user = User.objects.get(id=user_count + 1)
         self.assertEqual(
             mail.outbox[0].subject, "Confirmation code for receiving a token"
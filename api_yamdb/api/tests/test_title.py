@@ -0,0 +1,239 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from titles.models import Category, Genre, Title, weighted_rating
+
+TEST_GENRE_FIELDS: list = [
+    {"name": "Ужасы", "slug": "horror"},
+    {"name": "Драма", "slug": "drama"},
+    {"name": "Комедия", "slug": "comedy"},
+]
+
+TEST_CATEGORY_FIELDS: list = [
+    {"name": "Фильм", "slug": "films"},
+    {"name": "Книга", "slug": "books"},
+]
+
+TITLES_COUNT: int = 12
+
+
+class TitleQueriesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        genres = [Genre.objects.create(**data) for data in TEST_GENRE_FIELDS]
+        categories = [
+            Category.objects.create(**data) for data in TEST_CATEGORY_FIELDS
+        ]
+        for i in range(TITLES_COUNT):
+            title = Title.objects.create(
+                name=f"Произведение {i}",
+                year=1980 + i,
+                category=categories[i % len(categories)],
+            )
+            title.genre.set(genres[: i % len(genres) + 1])
+        cls.title = title
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_titles_list_queries(self):
+        """Список: count, произведения с категориями, жанры."""
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/v1/titles/?limit=100")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["results"]), TITLES_COUNT)
+
+    def test_titles_list_queries_do_not_depend_on_page_size(self):
+        with self.assertNumQueries(3):
+            self.client.get("/api/v1/titles/?limit=2")
+        with self.assertNumQueries(3):
+            self.client.get("/api/v1/titles/?limit=10")
+
+    def test_title_detail_queries(self):
+        """Детали: произведение с категорией, жанры."""
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/api/v1/titles/{self.title.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["category"], TEST_CATEGORY_FIELDS[1])
+        self.assertEqual(len(data["genre"]), len(TEST_GENRE_FIELDS))
+
+
+class TitleSearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(**TEST_CATEGORY_FIELDS[0])
+        for name, description in (
+            ("Кошмар на улице Вязов", "Фредди Крюгер приходит во сне"),
+            ("Кошмар", "Короткое название"),
+            ("Пятница, 13-е", "Лагерь у озера и кошмар наяву"),
+            ("Крёстный отец", "Семья Корлеоне"),
+        ):
+            Title.objects.create(
+                name=name,
+                year=1980,
+                category=category,
+                description=description,
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def names(self, query):
+        response = self.client.get(f"/api/v1/titles/?{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [title["name"] for title in response.json()["results"]]
+
+    def test_name_is_case_insensitive_substring(self):
+        self.assertEqual(
+            sorted(self.names("name=кошмар")),
+            ["Кошмар", "Кошмар на улице Вязов"],
+        )
+        self.assertEqual(self.names("name=улице"), ["Кошмар на улице Вязов"])
+
+    def test_name_results_ordered_by_relevance(self):
+        self.assertEqual(self.names("name=Кошмар")[0], "Кошмар")
+
+    def test_short_name_query(self):
+        self.assertEqual(self.names("name=13"), ["Пятница, 13-е"])
+
+    def test_search_covers_description(self):
+        self.assertEqual(
+            sorted(self.names("search=кошмар")),
+            ["Кошмар", "Кошмар на улице Вязов", "Пятница, 13-е"],
+        )
+        self.assertEqual(
+            self.names("search=Корлеоне семья"), ["Крёстный отец"]
+        )
+
+    def test_search_follows_title_changes(self):
+        title = Title.objects.get(name="Крёстный отец")
+        title.description = "Дон Вито"
+        title.save()
+        self.assertEqual(self.names("search=Корлеоне"), [])
+        title.delete()
+        self.assertEqual(self.names("search=Вито"), [])
+
+    def test_search_without_fts_table(self):
+        # База, мигрированная под SQLite без триграмм, таблицы не имеет.
+        # LIKE в SQLite не сравнивает кириллицу без учёта регистра.
+        cache.clear()
+        with mock.patch.object(
+            connections["default"], "has_title_fts", False, create=True
+        ):
+            self.assertEqual(
+                sorted(self.names("name=Кошмар")),
+                ["Кошмар", "Кошмар на улице Вязов"],
+            )
+            self.assertEqual(
+                self.names("search=Корлеоне Семья"), ["Крёстный отец"]
+            )
+
+
+class TitleOrderingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        genres = [Genre.objects.create(**data) for data in TEST_GENRE_FIELDS]
+        categories = [
+            Category.objects.create(**data) for data in TEST_CATEGORY_FIELDS
+        ]
+        for name, year, rating, reviews_count, category, genre in (
+            ("Бэтмен", 1989, 7, 40, 0, 0),
+            ("Аватар", 2009, 8, 100, 0, 1),
+            ("Вий", 1967, 8, 3, 1, 0),
+            ("Гамлет", 1603, None, 0, 1, 1),
+        ):
+            title = Title.objects.create(
+                name=name, year=year, category=categories[category]
+            )
+            title.genre.set([genres[genre]])
+            Title.objects.filter(pk=title.pk).update(
+                rating=rating,
+                average_rating=rating,
+                reviews_count=reviews_count,
+                score_sum=(rating or 0) * reviews_count,
+                weighted_rating=weighted_rating(
+                    (rating or 0) * reviews_count, reviews_count
+                ),
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def names(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        if isinstance(data, dict):
+            data = data["results"]
+        return [title["name"] for title in data]
+
+    def test_ordering(self):
+        for ordering, names in (
+            ("name", ["Аватар", "Бэтмен", "Вий", "Гамлет"]),
+            ("-year", ["Аватар", "Бэтмен", "Вий", "Гамлет"]),
+            ("-reviews_count", ["Аватар", "Бэтмен", "Вий", "Гамлет"]),
+            ("year", ["Гамлет", "Вий", "Бэтмен", "Аватар"]),
+        ):
+            with self.subTest(ordering=ordering):
+                self.assertEqual(
+                    self.names(f"/api/v1/titles/?ordering={ordering}"), names
+                )
+
+    def test_ordering_ties_broken_by_id(self):
+        # У «Аватара» и «Вия» рейтинг 8, «Вий» создан позже. У «Гамлета»
+        # нет отзывов: он последний по убыванию и первый по возрастанию.
+        for field in ("rating", "average_rating"):
+            for ordering, names in (
+                (field, ["Гамлет", "Бэтмен", "Аватар", "Вий"]),
+                (f"-{field}", ["Вий", "Аватар", "Бэтмен", "Гамлет"]),
+            ):
+                with self.subTest(ordering=ordering):
+                    with CaptureQueriesContext(connection) as context:
+                        ordered = self.names(
+                            f"/api/v1/titles/?ordering={ordering}"
+                        )
+                    self.assertEqual(ordered, names)
+                    # На SQLite NULL и так наименьшие, порядок задаёт
+                    # SQL, одинаковый для всех баз.
+                    nulls = "LAST" if ordering[0] == "-" else "FIRST"
+                    self.assertTrue(
+                        any(
+                            f"NULLS {nulls}" in query["sql"]
+                            for query in context.captured_queries
+                        )
+                    )
+
+    def test_unknown_ordering_is_ignored(self):
+        self.assertEqual(
+            len(self.names("/api/v1/titles/?ordering=description")), 4
+        )
+
+    def test_top(self):
+        self.assertEqual(
+            self.names("/api/v1/titles/top/"),
+            ["Аватар", "Бэтмен", "Вий", "Гамлет"],
+        )
+        self.assertEqual(
+            self.names("/api/v1/titles/top/?limit=2"), ["Аватар", "Бэтмен"]
+        )
+        self.assertEqual(
+            self.names("/api/v1/titles/top/?genre=horror"), ["Бэтмен", "Вий"]
+        )
+        self.assertEqual(
+            self.names("/api/v1/titles/top/?category=books"), ["Вий", "Гамлет"]
+        )
+        self.assertEqual(
+            self.names("/api/v1/titles/top/?year=2009"), ["Аватар"]
+        )
+
+    def test_top_queries(self):
+        with self.assertNumQueries(2):
+            self.client.get("/api/v1/titles/top/?limit=100")
+        self.assertEqual(len(self.names("/api/v1/titles/top/?limit=1000")), 4)
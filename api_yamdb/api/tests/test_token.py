@@ -1,7 +1,9 @@
 import unittest
+from io import StringIO
 
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.core import mail
+from django.core.management import call_command
 from django.shortcuts import get_object_or_404
 from django.test import TestCase
 from rest_framework import status
@@ -39,6 +41,7 @@ class TokenViewsTest(TestCase):
         data = {"email": "test@mail.ru", "username": "testusername"}
         response = self.guest_client.post(url, data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        call_command("send_outbox", stdout=StringIO())
         user = User.objects.get(id=user_count + 1)
         self.assertEqual(
             mail.outbox[0].subject, "Confirmation code for receiving a token"
@@ -58,6 +61,7 @@ class TokenViewsTest(TestCase):
         data = {"email": "test@mail.ru", "username": "testusername"}
         response = self.guest_client.post(url, data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        call_command("send_outbox", stdout=StringIO())
         user = User.objects.get(id=user_count + 1)
         self.assertEqual(type(mail.outbox[0].body), str)
         confirmation_code = mail.outbox[0].body
@@ -98,6 +102,7 @@ class TokenViewsTest(TestCase):
         data = {"email": "test@mail.ru", "username": "testusername"}
         response = self.guest_client.post(url, data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        call_command("send_outbox", stdout=StringIO())
         user = User.objects.get(id=user_count + 1)
         self.assertEqual(type(mail.outbox[0].body), str)
         confirmation_code = mail.outbox[0].body
@@ -1,9 +1,9 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
 from .views import (CategoryViewSet, CommentViewSet, CustomTokenObtainView,
-                    GenreViewSet, ReviewViewSet, SignUpAPIView, TitleViewSet,
-                    UserViewSet)
+                    ExportView, GenreViewSet, ReviewViewSet, SignUpAPIView,
+                    TitleViewSet, UserViewSet)
 
 app_name = "api"
 
@@ -30,4 +30,10 @@ urlpatterns = [
         CustomTokenObtainView.as_view(),
         name="token_obtain_pair",
     ),
+    re_path(
+        r"^v1/export/(?P<dataset>\w+)\.(?P<extension>csv|ndjson)"
+        r"(?P<compressed>\.gz)?$",
+        ExportView.as_view(),
+        name="export",
+    ),
 ]
@@ -1,58 +1,156 @@
 from django.conf import settings
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import router, transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import (CharFilter, DjangoFilterBackend,
                                            FilterSet, NumberFilter)
+from outbox.mail import enqueue_mail
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import LimitOffsetPagination
-from rest_framework.permissions import (AllowAny, IsAuthenticated,
+from rest_framework.permissions import (SAFE_METHODS, AllowAny,
+                                        IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from reviews.models import Review
-from titles.models import Category, Genre, Title
+from titles.models import (ORDERING_FIELDS, SCORE_COUNT_FIELDS, Category,
+                           Genre, Title, ordering_expression)
+from titles.search import filter_name, search_titles
 from users.models import User
 
-from .mixins import CreateListDestroyViewSet
+from api_yamdb.metrics import SEND_TOKEN
+
+from .authentication import add_user_claims
+from .bulk import BulkCreateMixin
+from .export import DATASETS, FORMATS, stream
+from .mixins import CachedReadMixin, CreateListDestroyViewSet
+from .pagination import LimitOffsetOrCursorPagination, TopPagination
 from .permissions import IsAdminOrReadOnly, IsAuthorOrStaff, UserPermission
 from .serializers import (CategorySerializer, CommentsSerializer,
                           CustomTokenObtainSerializer, GenreSerializer,
                           ReviewsSerializer, SignUpSerializer,
-                          TitlePostSerializer, TitleSerializer,
-                          UserMeSerializer, UserSerializer)
+                          TitlePostSerializer, TitleRatingSerializer,
+                          TitleSerializer, UserMeSerializer, UserSerializer)
 
 
 class TitleFilter(FilterSet):
 
     category = CharFilter(lookup_expr="slug")
     genre = CharFilter(lookup_expr="slug")
-    name = CharFilter(lookup_expr="icontains")
+    name = CharFilter(method="filter_name")
+    search = CharFilter(method="filter_search")
     year = NumberFilter(field_name="year")
 
     class Meta:
         model = Title
-        fields = ("category", "genre", "name", "year")
+        fields = ("category", "genre", "name", "search", "year")
+
+    def filter_name(self, queryset, name, value):
+        return filter_name(queryset, value)
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+
+class StableOrderingFilter(filters.OrderingFilter):
+    """
+    Добавляет id к сортировке в том же направлении: страницы не
+    перемешиваются на равных значениях, а индекс (поле, id) читается
+    без сортировки. Произведения без оценок — в конце при сортировке
+    по убыванию рейтинга.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering or ordering[-1].lstrip("-") in ("id", "pk"):
+            return ordering
+        return [*ordering, "-id" if ordering[-1].startswith("-") else "id"]
 
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        return queryset.order_by(*map(ordering_expression, ordering))
 
-class TitleViewSet(viewsets.ModelViewSet):
+
+class TitleViewSet(CachedReadMixin, BulkCreateMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminOrReadOnly]
     queryset = Title.objects.all()
     serializer_class = TitleSerializer
     pagination_class = LimitOffsetPagination
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, StableOrderingFilter)
     filterset_class = TitleFilter
+    ordering_fields = ORDERING_FIELDS
+    cache_tags = {
+        "list": ("titles", "genres", "categories"),
+        "retrieve": ("title:{pk}", "genres", "categories"),
+        "rating": ("title:{pk}",),
+        "top": ("titles", "genres", "categories"),
+    }
+    bulk_cache_tags = ("titles",)
+    # Без кеша: count, произведения с категориями, жанры одним запросом.
+    # bulk: жанры и категории по IN, вставка произведений и связей,
+    # на SQLite — MAX(id) до вставки и новые id после неё, начало
+    # и конец транзакции. INSERT, разбитые на части, BulkCreateMixin
+    # добавляет к бюджету сам.
+    query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "rating": 1,
+        "top": 2,
+        "bulk": 8,
+    }
+
+    def get_queryset(self):
+        if self.action in ["list", "retrieve", "top"]:
+            return Title.objects.select_related("category").prefetch_related(
+                "genre"
+            )
+        if self.action == "rating":
+            return Title.objects.only(
+                "rating",
+                "average_rating",
+                "weighted_rating",
+                "reviews_count",
+                *SCORE_COUNT_FIELDS,
+            )
+        return Title.objects.all()
 
     def get_serializer_class(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "top"]:
             return TitleSerializer
+        if self.action == "rating":
+            return TitleRatingSerializer
         return TitlePostSerializer
 
+    @action(detail=True)
+    def rating(self, request, pk=None):
+        """Рейтинг и гистограмма оценок без чтения отзывов."""
+        serializer = self.get_serializer(self.get_object())
+        return Response(serializer.data)
+
+    @action(detail=False)
+    def top(self, request):
+        """
+        Лучшие по взвешенному рейтингу с фильтрами списка (genre,
+        category, year); limit — сколько, не больше 100.
+        """
+        queryset = self.filter_queryset(self.get_queryset()).order_by(
+            "-weighted_rating", "-id"
+        )
+        paginator = TopPagination()
+        page = paginator.paginate_queryset(queryset, request, self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
 
-class CategoryViewSet(CreateListDestroyViewSet):
+class CategoryViewSet(
+    CachedReadMixin, BulkCreateMixin, CreateListDestroyViewSet
+):
     permission_classes = [IsAdminOrReadOnly]
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
@@ -60,9 +158,15 @@ class CategoryViewSet(CreateListDestroyViewSet):
     pagination_class = LimitOffsetPagination
     filter_backends = (filters.SearchFilter,)
     search_fields = ("name",)
+    cache_tags = {"list": ("categories",)}
+    bulk_cache_tags = ("categories",)
+    # bulk: занятые слаги одним IN, вставка, начало и конец транзакции.
+    query_budgets = {"list": 2, "create": 2, "destroy": 3, "bulk": 4}
 
 
-class GenreViewSet(CreateListDestroyViewSet):
+class GenreViewSet(
+    CachedReadMixin, BulkCreateMixin, CreateListDestroyViewSet
+):
     permission_classes = [IsAdminOrReadOnly]
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
@@ -70,15 +174,21 @@ class GenreViewSet(CreateListDestroyViewSet):
     pagination_class = LimitOffsetPagination
     filter_backends = (filters.SearchFilter,)
     search_fields = ("name",)
+    cache_tags = {"list": ("genres",)}
+    bulk_cache_tags = ("genres",)
+    # bulk: занятые слаги одним IN, вставка, начало и конец транзакции.
+    query_budgets = {"list": 2, "create": 2, "destroy": 3, "bulk": 4}
 
 
 class SignUpAPIView(APIView):
     """
     Анонимный пользователь высылает JSON c "email" и "username".
-    В ответ на почту получает confirmation_code.
+    В ответ на почту получает confirmation_code: письмо ставится
+    в очередь outbox и отправляется командой send_outbox.
     """
 
     permission_classes = (AllowAny,)
+    query_budgets = {"post": 5}
 
     def post(self, request):
         serializer = SignUpSerializer(data=request.data)
@@ -96,13 +206,13 @@ class SignUpAPIView(APIView):
         self.send_token(user, request.data.get("email"))
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @SEND_TOKEN.time()
     def send_token(self, user, email):
-        send_mail(
+        enqueue_mail(
             "Confirmation code for receiving a token",
             PasswordResetTokenGenerator().make_token(user),
             settings.ADMIN_MAIL,
             [email],
-            fail_silently=False,
         )
 
 
@@ -112,6 +222,9 @@ class UserViewSet(viewsets.ModelViewSet):
     permission_classes = [UserPermission]
     pagination_class = LimitOffsetPagination
     lookup_field = "username"
+    # get_me: при смене имени ещё два запроса за отзывами и
+    # комментариями автора, чтобы сбросить их кеш.
+    query_budgets = {"list": 2, "retrieve": 1, "get_me": 5}
 
     @action(
         detail=False,
@@ -135,28 +248,41 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status.HTTP_400_BAD_REQUEST)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(CachedReadMixin, viewsets.ModelViewSet):
     serializer_class = ReviewsSerializer
     permission_classes = [IsAuthenticatedOrReadOnly, IsAuthorOrStaff]
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrCursorPagination
+    cache_tags = {
+        "list": ("reviews:{title_id}",),
+        "retrieve": ("review:{pk}",),
+    }
+    query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "create": 6,
+        "update": 6,
+        "partial_update": 6,
+        "destroy": 8,
+    }
 
     def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs["title_id"])
-
-    def rating_update(self, title):
-        title.rating = Review.objects.filter(title=title).aggregate(
-            Avg("score")
-        )["score__avg"]
-        title.save(update_fields=["rating"])
+        # Нужно и в get_queryset, и при сохранении, и в сериализаторе:
+        # читаем произведение один раз за запрос.
+        if not hasattr(self, "_title"):
+            self._title = get_object_or_404(Title, pk=self.kwargs["title_id"])
+        return self._title
 
     def get_queryset(self):
         title = self.get_title()
-        return title.reviews.all()
+        if self.request.method in SAFE_METHODS:
+            return title.reviews.select_related("author")
+        # Блокируем строку отзыва, чтобы параллельные правки
+        # не сдвинули сумму оценок произведения дважды.
+        return title.reviews.select_for_update()
 
     def save_instance(self, serializer):
         title = self.get_title()
         serializer.save(author=self.request.user, title_id=title.id)
-        self.rating_update(title)
 
     def perform_create(self, serializer):
         self.save_instance(serializer)
@@ -167,36 +293,66 @@ class ReviewViewSet(viewsets.ModelViewSet):
     def perform_destroy(self, instance):
         instance.delete()
 
+    @transaction.atomic
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
+    @transaction.atomic
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         self.perform_destroy(instance)
-        self.rating_update(self.get_title())
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(CachedReadMixin, viewsets.ModelViewSet):
     serializer_class = CommentsSerializer
     permission_classes = [IsAuthenticatedOrReadOnly, IsAuthorOrStaff]
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrCursorPagination
+    cache_tags = {
+        "list": ("comments:{review_id}",),
+        "retrieve": ("comment:{pk}",),
+    }
+    query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "create": 5,
+        "update": 3,
+        "partial_update": 3,
+        "destroy": 6,
+    }
 
     def get_review(self):
-        return get_object_or_404(
-            Review,
-            id=self.kwargs["review_id"],
-            title__id=self.kwargs["title_id"],
-        )
+        if not hasattr(self, "_review"):
+            self._review = get_object_or_404(
+                Review,
+                id=self.kwargs["review_id"],
+                title__id=self.kwargs["title_id"],
+            )
+        return self._review
 
     def get_queryset(self):
         review = self.get_review()
-        return review.comments.all()
+        return review.comments.select_related("author")
 
     def perform_create(self, serializer):
-        review = self.get_review()
-        serializer.save(author=self.request.user, review_id=review.id)
+        serializer.save(author=self.request.user, review=self.get_review())
+
+    @transaction.atomic
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @transaction.atomic
+    def destroy(self, request, *args, **kwargs):
+        return super().destroy(request, *args, **kwargs)
 
 
 class CustomTokenObtainView(APIView):
     permission_classes = (AllowAny,)
+    query_budgets = {"post": 3}
 
     def post(self, request):
         serializer = CustomTokenObtainSerializer(data=request.data)
@@ -212,5 +368,38 @@ class CustomTokenObtainView(APIView):
     def get_tokens_for_user(self, user):
         refresh = RefreshToken.for_user(user)
         return {
-            "token": str(refresh.access_token),
+            "token": str(add_user_claims(refresh.access_token, user)),
         }
+
+
+class ExportView(APIView):
+    """
+    Потоковая выгрузка таблиц в виде static/data/*.csv:
+    /export/titles.csv, /export/review.ndjson.gz. Строки читаются
+    пачками по EXPORT_CHUNK_SIZE, память не зависит от размера
+    таблицы; в безопасном запросе чтение идёт с реплики, если она есть.
+    """
+
+    permission_classes = (UserPermission,)
+
+    def get(self, request, dataset, extension, compressed=None):
+        if dataset not in DATASETS:
+            raise NotFound(f"Нет набора {dataset}")
+        # Строки читаются уже после выхода из middleware, поэтому
+        # базу для чтения выбираем здесь.
+        using = router.db_for_read(DATASETS[dataset].model)
+        response = StreamingHttpResponse(
+            stream(
+                dataset,
+                extension,
+                using,
+                settings.EXPORT_CHUNK_SIZE,
+                compress=bool(compressed),
+            ),
+            content_type=(
+                "application/gzip" if compressed else FORMATS[extension]
+            ),
+        )
+        filename = f"{dataset}.{extension}{compressed or ''}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
@@ -1,7 +1,10 @@
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api_yamdb.settings")
+django.setup(set_prefix=False)
 
-application = get_asgi_application()
+from api_yamdb.handlers import ThreadPerRequestASGIHandler  # noqa: E402
+
+application = ThreadPerRequestASGIHandler()
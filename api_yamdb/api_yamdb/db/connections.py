@@ -0,0 +1,51 @@
+from django.db import connections
+
+from api_yamdb.metrics import DB_CONNECTIONS
+
+
+class HealthCheckMixin:
+    """
+    Проверка постоянного соединения (CONN_HEALTH_CHECKS, как в Django
+    4.1) для бэкендов api_yamdb.db.postgresql, api_yamdb.db.sqlite3
+    и api_yamdb.db.postgresql_pool: соединение, которое закрыл сервер,
+    pgbouncer или перезапуск базы, закрывается, и запрос открывает новое
+    вместо ошибки на первом SQL-запросе. Проверка ленивая — один SELECT 1
+    за запрос перед первым обращением к базе, так что попадания в кеш
+    и ответы 304 базу не трогают. Только что открытое соединение
+    не проверяется.
+    """
+
+    health_check_done = False
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    def ensure_connection(self):
+        self.close_if_health_check_failed()
+        super().ensure_connection()
+
+    def close_if_health_check_failed(self):
+        if (
+            self.connection is None
+            or self.health_check_done
+            or not self.settings_dict.get("CONN_HEALTH_CHECKS")
+            or self.in_atomic_block
+        ):
+            return
+        if not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+
+def reset_health_checks(**kwargs):
+    """В начале запроса: соединения проверятся при первом обращении."""
+    for connection in connections.all():
+        if isinstance(connection, HealthCheckMixin):
+            connection.health_check_done = False
+
+
+def count_new_connection(sender, connection, **kwargs):
+    # Пул считает новые соединения сам.
+    if not getattr(connection, "pooled", False):
+        DB_CONNECTIONS.labels(connection.alias).inc()
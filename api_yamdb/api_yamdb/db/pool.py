@@ -0,0 +1,62 @@
+import threading
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    Пул соединений одного процесса для воркеров с потоками: не больше
+    max_size соединений на всех, свободное соединение берёт любой поток.
+    check проверяет соединение перед выдачей, reset готовит его
+    к возврату в пул; оба возвращают False для негодного соединения.
+    """
+
+    def __init__(self, max_size, timeout, check=None, reset=None):
+        self.timeout = timeout
+        self.check = check
+        self.reset = reset
+        self.idle = []
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max_size)
+
+    def acquire(self, connect):
+        if not self.slots.acquire(timeout=self.timeout):
+            raise PoolTimeoutError(
+                f"Нет свободного соединения за {self.timeout} с"
+            )
+        try:
+            while True:
+                with self.lock:
+                    connection = self.idle.pop() if self.idle else None
+                if connection is None:
+                    return connect()
+                if self.check is None or self.check(connection):
+                    return connection
+                self.discard(connection)
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self, connection):
+        try:
+            if self.reset is None or self.reset(connection):
+                with self.lock:
+                    self.idle.append(connection)
+            else:
+                self.discard(connection)
+        finally:
+            self.slots.release()
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close_idle(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            self.discard(connection)
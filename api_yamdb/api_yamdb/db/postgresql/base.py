@@ -0,0 +1,7 @@
+from django.db.backends.postgresql import base as postgresql
+
+from ..connections import HealthCheckMixin
+
+
+class DatabaseWrapper(HealthCheckMixin, postgresql.DatabaseWrapper):
+    """Бэкенд postgresql с проверкой постоянного соединения."""
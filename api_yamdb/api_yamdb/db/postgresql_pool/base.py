@@ -0,0 +1,94 @@
+import threading
+
+from django.db.backends.postgresql import base as postgresql
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+from api_yamdb.metrics import DB_CONNECTIONS
+
+from ..connections import HealthCheckMixin
+from ..pool import ConnectionPool, PoolTimeoutError
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+def is_usable(connection):
+    if connection.closed:
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except postgresql.Database.Error:
+        return False
+    return True
+
+
+def reset(connection):
+    """Вернуть в пул можно открытое соединение без начатой транзакции."""
+    if connection.closed:
+        return False
+    if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+        try:
+            connection.rollback()
+        except postgresql.Database.Error:
+            return False
+    return True
+
+
+def close_pools():
+    """
+    Закрывает свободные соединения всех пулов и забывает пулы: после
+    fork процесс создаст свои пулы, а не будет делить сокеты с родителем.
+    """
+    with pools_lock:
+        closing = list(pools.values())
+        pools.clear()
+    for pool in closing:
+        pool.close_idle()
+
+
+class DatabaseWrapper(HealthCheckMixin, postgresql.DatabaseWrapper):
+    """
+    Бэкенд postgresql с пулом соединений процесса: close() возвращает
+    соединение в пул, а не закрывает его. Настройки пула — в
+    DATABASES[alias]["POOL"]: MAX_SIZE и TIMEOUT ожидания в секундах.
+    Соединение из пула проверяется при выдаче, а не ещё раз в запросе.
+    """
+
+    pooled = True
+
+    def get_pool(self):
+        with pools_lock:
+            if self.alias not in pools:
+                options = self.settings_dict["POOL"]
+                health_checks = self.settings_dict.get("CONN_HEALTH_CHECKS")
+                pools[self.alias] = ConnectionPool(
+                    options["MAX_SIZE"],
+                    options.get("TIMEOUT", 10),
+                    check=is_usable if health_checks else None,
+                    reset=reset,
+                )
+            return pools[self.alias]
+
+    def connect_new(self, conn_params):
+        # connection_created срабатывает и на выдачу из пула, поэтому
+        # новые соединения считаются здесь.
+        DB_CONNECTIONS.labels(self.alias).inc()
+        return super().get_new_connection(conn_params)
+
+    def get_new_connection(self, conn_params):
+        try:
+            connection = self.get_pool().acquire(
+                lambda: self.connect_new(conn_params)
+            )
+        except PoolTimeoutError as error:
+            raise postgresql.Database.OperationalError(str(error)) from error
+        self.isolation_level = self.settings_dict["OPTIONS"].get(
+            "isolation_level", connection.isolation_level
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.get_pool().release(self.connection)
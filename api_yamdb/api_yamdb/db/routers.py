@@ -0,0 +1,97 @@
+import random
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+PRIMARY_PIN_KEY = "primary-pin:{}"
+
+# Можно ли текущему запросу этого потока читать с реплики.
+state = threading.local()
+
+
+def token_user_id(request):
+    """
+    id пользователя из токена запроса, без обращения к базе: DRF
+    проверит токен позже, а здесь он нужен до первого SQL-запроса.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    try:
+        raw_token = authentication.get_raw_token(header)
+        if raw_token is None:
+            return None
+        token = authentication.get_validated_token(raw_token)
+    except AuthenticationFailed:
+        return None
+    return token.get(api_settings.USER_ID_CLAIM)
+
+
+def pin_to_primary(user_id):
+    """Свои изменения пользователь видит сразу, пока реплика догоняет."""
+    cache.set(
+        PRIMARY_PIN_KEY.format(user_id), True, settings.REPLICA_PIN_SECONDS
+    )
+
+
+def pinned_to_primary(user_id):
+    return cache.get(PRIMARY_PIN_KEY.format(user_id), False)
+
+
+def read_from_primary():
+    """Остаток текущего запроса читает с основной базы."""
+    state.read_only = False
+
+
+class ReplicaRouter:
+    """
+    Чтение внутри безопасного (GET, HEAD, OPTIONS) запроса идёт на одну
+    из DATABASE_REPLICAS, всё остальное — на основную базу: запись,
+    чтение в запросах на запись, команды и фоновые задачи.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if replicas and getattr(state, "read_only", False):
+            return random.choice(replicas)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики — копии основной базы.
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Разрешает ReplicaRouter читать с реплики в безопасных запросах.
+    После успешной записи пользователь на REPLICA_PIN_SECONDS
+    закрепляется за основной базой, чтобы не увидеть старый rating.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        user_id = token_user_id(request)
+        safe = request.method in SAFE_METHODS
+        state.read_only = safe and not (
+            user_id is not None and pinned_to_primary(user_id)
+        )
+        try:
+            response = self.get_response(request)
+        finally:
+            state.read_only = False
+        if not safe and user_id is not None and response.status_code < 400:
+            pin_to_primary(user_id)
+        return response
@@ -0,0 +1,7 @@
+from django.db.backends.sqlite3 import base as sqlite3
+
+from ..connections import HealthCheckMixin
+
+
+class DatabaseWrapper(HealthCheckMixin, sqlite3.DatabaseWrapper):
+    """Бэкенд sqlite3 с проверкой постоянного соединения."""
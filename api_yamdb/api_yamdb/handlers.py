@@ -0,0 +1,53 @@
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connections
+
+
+class ThreadPerRequestASGIHandler(ASGIHandler):
+    """
+    ASGIHandler для синхронного проекта. Middleware, представления DRF
+    и ORM синхронные, и Django 3.2 выполняет их в одном потоке на весь
+    процесс: медленный запрос держал бы остальные. Здесь у каждого
+    запроса свой поток, а соединения с базой этого потока закрываются
+    в конце запроса (с DB_POOL_SIZE — возвращаются в пул).
+    """
+
+    async def __call__(self, scope, receive, send):
+        async with ThreadSensitiveContext():
+            try:
+                await super().__call__(scope, receive, send)
+            finally:
+                await sync_to_async(connections.close_all)()
+
+    async def send_response(self, response, send):
+        """
+        Django 3.2 перебирает потоковый ответ прямо в цикле событий, а
+        выгрузка читает базу при переборе. Части ответа здесь читаются
+        в потоке запроса, цикл событий только отправляет их.
+        """
+        if not response.streaming:
+            return await super().send_response(response, send)
+        parts = iter(response)
+        # Базовый класс отправит заголовки и пустое тело, части
+        # отправляются перед последним сообщением.
+        response.streaming_content = ()
+
+        async def send_parts(message):
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body"
+            ):
+                while True:
+                    part = await sync_to_async(next)(parts, None)
+                    if part is None:
+                        break
+                    for chunk, _ in self.chunk_bytes(part):
+                        await send(
+                            {
+                                "type": "http.response.body",
+                                "body": chunk,
+                                "more_body": True,
+                            }
+                        )
+            await send(message)
+
+        return await super().send_response(response, send_parts)
@@ -0,0 +1,92 @@
+import os
+import time
+
+from django.http import HttpResponse
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY,
+                               CollectorRegistry, Counter, Histogram,
+                               generate_latest, multiprocess)
+
+# С PROMETHEUS_MULTIPROC_DIR каждый воркер gunicorn пишет значения
+# в свои файлы в этом каталоге, а /metrics суммирует их по всем воркерам.
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+QUERY_BUCKETS = (0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 50, 100)
+
+REQUEST_DURATION = Histogram(
+    "yamdb_http_request_duration_seconds",
+    "Время обработки запроса.",
+    ["route", "method", "status"],
+)
+DB_QUERIES = Histogram(
+    "yamdb_db_queries_per_request",
+    "Число SQL-запросов на один HTTP-запрос.",
+    ["route"],
+    buckets=QUERY_BUCKETS,
+)
+DB_DURATION = Histogram(
+    "yamdb_db_duration_seconds",
+    "Суммарное время SQL-запросов одного HTTP-запроса.",
+    ["route"],
+)
+RESPONSE_CACHE = Counter(
+    "yamdb_response_cache_requests_total",
+    "Запросы к кешу ответов: hit, miss, not_modified (304) и bypass "
+    "(запрос с токеном).",
+    ["result"],
+)
+DB_CONNECTIONS = Counter(
+    "yamdb_db_connections_opened_total",
+    "Новые соединения с базой: без постоянных соединений и пула "
+    "их столько же, сколько запросов.",
+    ["alias"],
+)
+RATING_UPDATE = Histogram(
+    "yamdb_rating_update_duration_seconds",
+    "Время пересчёта суммы оценок и рейтинга произведения.",
+)
+SEND_TOKEN = Histogram(
+    "yamdb_send_token_duration_seconds",
+    "Время постановки письма с кодом подтверждения в очередь.",
+)
+
+
+def route_name(request):
+    """
+    Имя маршрута вместо пути, чтобы id не плодили метки:
+    для роутера DRF это basename с суффиксом, например reviews-list.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.url_name or match.func.__name__
+
+
+class MetricsMiddleware:
+    """Время запроса и SQL-статистика из QueryInstrumentationMiddleware."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        route = route_name(request)
+        REQUEST_DURATION.labels(
+            route, request.method, response.status_code
+        ).observe(time.perf_counter() - started)
+        stats = getattr(response, "sql_stats", None)
+        if stats is not None:
+            DB_QUERIES.labels(route).observe(stats["queries"])
+            DB_DURATION.labels(route).observe(stats["db_ms"] / 1000)
+        return response
+
+
+def metrics_view(request):
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(
+        generate_latest(registry), content_type=CONTENT_TYPE_LATEST
+    )
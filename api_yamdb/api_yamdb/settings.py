@@ -1,4 +1,6 @@
 import os
+import sys
+import tempfile
 from datetime import timedelta
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -26,13 +28,19 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "rest_framework",
     "django_filters",
-    "reviews",
+    "reviews.apps.ReviewsConfig",
     "titles",
-    "api",
+    "api.apps.ApiConfig",
     "users",
+    "outbox",
+    "benchmark",
 ]
 
 MIDDLEWARE = [
+    "api_yamdb.metrics.MetricsMiddleware",
+    "api.compression.CompressionMiddleware",
+    "api.instrumentation.QueryInstrumentationMiddleware",
+    "api_yamdb.db.routers.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -62,7 +70,12 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "api_yamdb.wsgi.application"
+ASGI_APPLICATION = "api_yamdb.asgi.application"
 
+# Первичные ключи моделей и миграций — AutoField, как до Django 3.2.
+DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", default=0))
 
 DATABASES = {
     "default": {
@@ -71,8 +84,127 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
-        'PORT': os.getenv('DB_PORT')
+        'PORT': os.getenv('DB_PORT'),
+        # Соединение живёт DB_CONN_MAX_AGE секунд между запросами
+        # (0 — закрывать после каждого). С DB_ENGINE
+        # api_yamdb.db.postgresql или api_yamdb.db.sqlite3 оно ещё
+        # и проверяется перед повторным использованием (один раз за
+        # запрос, перед первым обращением к базе),
+        # см. api_yamdb.db.connections.
+        "CONN_MAX_AGE": int(
+            os.getenv("DB_CONN_MAX_AGE", default=0 if DB_POOL_SIZE else 60)
+        ),
+        "CONN_HEALTH_CHECKS": os.getenv(
+            "DB_CONN_HEALTH_CHECKS", default="1"
+        ) == "1",
+        # За pgbouncer в режиме transaction серверные курсоры (.iterator())
+        # ломаются, поэтому они выключены; DB_SERVER_SIDE_CURSORS=1
+        # включает их при прямом подключении к Postgres.
+        "DISABLE_SERVER_SIDE_CURSORS": os.getenv(
+            "DB_SERVER_SIDE_CURSORS", default=""
+        ) != "1",
+    }
+}
+
+# Пул соединений процесса для воркеров с потоками (gthread): не больше
+# DB_POOL_SIZE соединений на процесс; соединение возвращается в пул
+# после запроса, поэтому CONN_MAX_AGE по умолчанию 0. Только Postgres.
+if DB_POOL_SIZE:
+    DATABASES["default"].update(
+        ENGINE="api_yamdb.db.postgresql_pool",
+        POOL={
+            "MAX_SIZE": DB_POOL_SIZE,
+            "TIMEOUT": float(os.getenv("DB_POOL_TIMEOUT", default=10)),
+        },
+    )
+
+# Реплика для чтения: DB_REPLICA_HOST (и DB_REPLICA_PORT, DB_REPLICA_NAME,
+# если отличаются), остальное — как у основной базы. Локально хватит
+# второго файла SQLite в DB_REPLICA_NAME. В тестах реплика — зеркало
+# основной базы.
+if os.getenv("DB_REPLICA_HOST") or os.getenv("DB_REPLICA_NAME"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("DB_REPLICA_HOST", DATABASES["default"]["HOST"]),
+        "PORT": os.getenv("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "NAME": os.getenv("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["api_yamdb.db.routers.ReplicaRouter"]
+# Сколько секунд после записи пользователь читает с основной базы.
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", default=10))
+
+CACHE_BACKEND = os.getenv(
+    "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+)
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.getenv("CACHE_LOCATION", default=""),
+    }
+}
+# Отметки об изменении пользователей (api.authentication) — в отдельном
+# кеше: ответы не должны их вытеснять, а clear() кеша ответов — стирать.
+# Кеш должен быть общим для процессов, поэтому вместо памяти процесса
+# по умолчанию берутся файлы.
+CLAIMS_CACHE_ALIAS = "claims"
+if CACHE_BACKEND.endswith(".LocMemCache"):
+    CACHES[CLAIMS_CACHE_ALIAS] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv(
+            "CLAIMS_CACHE_LOCATION",
+            default=os.path.join(tempfile.gettempdir(), "yamdb-claims"),
+        ),
+        "OPTIONS": {"MAX_ENTRIES": sys.maxsize},
     }
+else:
+    CACHES[CLAIMS_CACHE_ALIAS] = {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.getenv(
+            "CLAIMS_CACHE_LOCATION", default=CACHES["default"]["LOCATION"]
+        ),
+        "KEY_PREFIX": "claims",
+    }
+
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", default=300))
+
+# Взвешенный рейтинг произведения: к отзывам добавляется
+# RATING_PRIOR_WEIGHT отзывов с оценкой RATING_PRIOR_MEAN. После смены
+# значений пересчитайте рейтинги командой rebuild_counters.
+RATING_PRIOR_MEAN = float(os.getenv("RATING_PRIOR_MEAN", default=5.5))
+RATING_PRIOR_WEIGHT = int(os.getenv("RATING_PRIOR_WEIGHT", default=10))
+
+# Сжатие ответов API (api.compression): br, если установлен brotli,
+# иначе gzip; ответы короче COMPRESSION_MIN_SIZE байт не сжимаются.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", default=1024))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", default=6))
+COMPRESSION_BROTLI_QUALITY = int(
+    os.getenv("COMPRESSION_BROTLI_QUALITY", default=5)
+)
+
+# Сколько строк выгрузка (/api/v1/export/, export_data) читает за запрос.
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", default=2000))
+
+# Превышение query_budgets представления: предупреждение в логе api.sql,
+# а с QUERY_BUDGET_STRICT=1 — исключение (включается в CI для тестов).
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", default="") == "1"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "api.sql": {
+            "handlers": ["console"],
+            "level": os.getenv("SQL_LOG_LEVEL", default="WARNING"),
+            "propagate": False,
+        },
+    },
 }
 
 
@@ -117,12 +249,22 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.ClaimsJWTAuthentication",
     ],
     "DEFAULT_PAGINATION_CLASS": [
         "rest_framework.pagination.PageNumberPagination"
     ],
     "PAGE_SIZE": 10,
+    # orjson, если установлен; иначе json из стандартной библиотеки.
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 
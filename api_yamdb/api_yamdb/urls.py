@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import TemplateView
 
+from .metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("api.urls")),
@@ -10,4 +12,5 @@ urlpatterns = [
         TemplateView.as_view(template_name="redoc.html"),
         name="redoc",
     ),
+    path("metrics", metrics_view, name="metrics"),
 ]
@@ -0,0 +1,84 @@
+import json
+import time
+from io import BytesIO
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer, orjson
+from api.serializers import ReviewsSerializer
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from reviews.models import Review
+
+
+def best_ms(function, repeat):
+    """Лучшее из repeat время вызова в миллисекундах."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает JSONRenderer и JSONParser DRF с FastJSONRenderer и "
+        "FastJSONParser на странице отзывов из базы (seed_benchmark)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=1000, help="Отзывов в ответе."
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=50,
+            help="Сколько раз кодировать и разбирать ответ.",
+        )
+        parser.add_argument("--output", help="Куда сохранить JSON.")
+
+    def handle(self, *args, **options):
+        reviews = Review.objects.select_related("author")[: options["rows"]]
+        data = ReviewsSerializer(reviews, many=True).data
+        if not data:
+            raise CommandError("Нет отзывов: сначала seed_benchmark.")
+        content = JSONRenderer().render(data)
+        if FastJSONRenderer().render(data) != content:
+            raise CommandError("Ответы JSONRenderer различаются.")
+
+        repeat = options["repeat"]
+        report = {
+            "rows": len(data),
+            "bytes": len(content),
+            "orjson": orjson is not None,
+        }
+        for name, drf, fast in (
+            (
+                "render",
+                lambda: JSONRenderer().render(data),
+                lambda: FastJSONRenderer().render(data),
+            ),
+            (
+                "parse",
+                lambda: JSONParser().parse(BytesIO(content)),
+                lambda: FastJSONParser().parse(BytesIO(content)),
+            ),
+        ):
+            drf_ms, fast_ms = best_ms(drf, repeat), best_ms(fast, repeat)
+            report[name] = {
+                "drf_ms": round(drf_ms, 3),
+                "fast_ms": round(fast_ms, 3),
+                "speedup": round(drf_ms / fast_ms, 2),
+            }
+            self.stdout.write(
+                f"{name}: {drf_ms:.2f} мс → {fast_ms:.2f} мс "
+                f"(в {drf_ms / fast_ms:.1f} раза быстрее)"
+            )
+        if orjson is None:
+            self.stdout.write("orjson не установлен: оба варианта — json.")
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
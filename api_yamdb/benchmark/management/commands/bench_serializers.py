@@ -0,0 +1,104 @@
+import json
+import time
+
+from api.serializers import (CommentsSerializer, ReviewsSerializer,
+                             TitleSerializer)
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+from reviews.models import Comment, Review
+from titles.models import Title
+
+# Выборки такие же, как у представлений списков.
+CASES = {
+    "titles": (
+        TitleSerializer,
+        lambda: Title.objects.select_related("category").prefetch_related(
+            "genre"
+        ),
+    ),
+    "reviews": (
+        ReviewsSerializer,
+        lambda: Review.objects.select_related("author"),
+    ),
+    "comments": (
+        CommentsSerializer,
+        lambda: Comment.objects.select_related("author"),
+    ),
+}
+
+
+def drf(serializer_class, objects):
+    """Страница через to_representation ModelSerializer."""
+    serializer = serializer_class()
+    return [
+        serializers.Serializer.to_representation(serializer, obj)
+        for obj in objects
+    ]
+
+
+def fast(serializer_class, objects):
+    serializer = serializer_class()
+    return [serializer.to_representation(obj) for obj in objects]
+
+
+def per_row(represent, serializer_class, objects, repeat):
+    """Лучшее из repeat время на строку в микросекундах."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        represent(serializer_class, objects)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(objects) * 10**6
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время сериализации строки в ModelSerializer и в "
+        "FastRepresentationMixin на страницах из базы (seed_benchmark)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=100, help="Строк на странице."
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=50,
+            help="Сколько раз сериализовать страницу.",
+        )
+        parser.add_argument("--output", help="Куда сохранить JSON.")
+
+    def handle(self, *args, **options):
+        report = {
+            "rows": options["rows"],
+            "repeat": options["repeat"],
+            "serializers": {},
+        }
+        for name, (serializer_class, queryset) in CASES.items():
+            objects = list(queryset()[: options["rows"]])
+            if not objects:
+                raise CommandError(
+                    f"Нет данных для {name}: сначала seed_benchmark."
+                )
+            if drf(serializer_class, objects) != fast(
+                serializer_class, objects
+            ):
+                raise CommandError(f"{name}: ответы различаются.")
+            drf_us = per_row(drf, serializer_class, objects, options["repeat"])
+            fast_us = per_row(
+                fast, serializer_class, objects, options["repeat"]
+            )
+            report["serializers"][name] = {
+                "drf_us_per_row": round(drf_us, 2),
+                "fast_us_per_row": round(fast_us, 2),
+                "speedup": round(drf_us / fast_us, 2),
+            }
+            self.stdout.write(
+                f"{name}: {drf_us:.1f} мкс → {fast_us:.1f} мкс на строку "
+                f"(в {drf_us / fast_us:.1f} раза быстрее)"
+            )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
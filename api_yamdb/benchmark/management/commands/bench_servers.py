@@ -0,0 +1,112 @@
+import json
+
+from benchmark.runner import HTTPRunner
+from benchmark.scenarios import ScenarioBuilder
+from benchmark.servers import CONFIGS, GunicornServer
+from django.core.management.base import BaseCommand, CommandError
+
+SCENARIOS = ("titles-list", "title-detail", "reviews-list")
+
+
+class Command(BaseCommand):
+    help = (
+        "Запускает gunicorn с тем же числом воркеров в разных конфигурациях "
+        "(синхронные воркеры, gthread, gevent, ASGI в воркерах uvicorn) и "
+        "сравнивает пропускную способность, p95 и память (PSS) при разной "
+        "конкурентности."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--config",
+            action="append",
+            choices=tuple(CONFIGS),
+            help="Конфигурация сервера, можно несколько раз. По умолчанию "
+            "sync, gthread и asgi (для gevent нужны gevent и psycogreen).",
+        )
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            action="append",
+            help="Число одновременных соединений, можно несколько раз. "
+            "По умолчанию 4, 16 и 64.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Сколько запросов на каждую конкурентность.",
+        )
+        parser.add_argument("--warmup", type=int, default=20)
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--env",
+            action="append",
+            default=[],
+            metavar="NAME=VALUE",
+            help="Переменная окружения сервера, например GUNICORN_THREADS=8"
+            " или DB_POOL_SIZE=8, можно несколько раз.",
+        )
+        parser.add_argument(
+            "--auth",
+            choices=("anonymous", "user"),
+            default="user",
+            help="user: запросы с токеном, мимо кеша ответов.",
+        )
+        parser.add_argument("--output", help="Куда сохранить JSON.")
+
+    def handle(self, *args, **options):
+        builder = ScenarioBuilder(
+            auth=None if options["auth"] == "anonymous" else "user"
+        )
+        urls = [
+            url
+            for scenario in builder.build()
+            if scenario.name in SCENARIOS
+            for url in scenario.urls
+        ]
+        if not urls:
+            raise CommandError("Нет произведений: сначала seed_benchmark.")
+        headers = {}
+        if options["auth"] == "user":
+            tokens = builder.tokens()
+            if "user" not in tokens:
+                raise CommandError("Нет пользователя: сначала seed_benchmark.")
+            headers["Authorization"] = f"Bearer {tokens['user']}"
+
+        env = {}
+        for item in options["env"]:
+            name, sep, value = item.partition("=")
+            if not sep:
+                raise CommandError(f"--env {item}: ожидается NAME=VALUE")
+            env[name] = value
+
+        report = {"workers": options["workers"], "env": env, "configs": {}}
+        for config in options["config"] or ("sync", "gthread", "asgi"):
+            report["configs"][config] = self.run_config(
+                config, env, urls, headers, options
+            )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Результаты сохранены в {options['output']}")
+
+    def run_config(self, config, env, urls, headers, options):
+        results = {}
+        with GunicornServer(
+            config, options["workers"], options["port"], env
+        ) as s:
+            idle_kb = s.memory_kb()
+            for concurrency in options["concurrency"] or (4, 16, 64):
+                stats = HTTPRunner(s.url, concurrency).run(
+                    urls, headers, options["requests"], options["warmup"]
+                )
+                stats["memory_kb"] = s.memory_kb()
+                results[concurrency] = stats
+                self.stdout.write(
+                    f"{config:8} x{concurrency:<4} {stats['rps']} запр/с, "
+                    f"p95 {stats['p95_ms']} мс, ошибок {stats['errors']}, "
+                    f"память {stats['memory_kb'] // 1024} МиБ"
+                )
+        return {"idle_memory_kb": idle_kb, "concurrency": results}
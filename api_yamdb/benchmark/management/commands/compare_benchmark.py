@@ -0,0 +1,64 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "rps")
+
+
+def load(path):
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)["scenarios"]
+    except (OSError, ValueError, KeyError) as error:
+        raise CommandError(f"{path}: {error}")
+
+
+def change(old, new):
+    if not old or new is None:
+        return None
+    return (new - old) / old * 100
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает два JSON-отчёта run_benchmark. С --threshold падает, "
+        "если p95 какого-то сценария вырос больше чем на столько процентов."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("base", help="Отчёт до изменения.")
+        parser.add_argument("new", help="Отчёт после изменения.")
+        parser.add_argument("--threshold", type=float)
+
+    def handle(self, *args, **options):
+        base, new = load(options["base"]), load(options["new"])
+        regressed = []
+        for name in sorted(base.keys() & new.keys()):
+            cells = []
+            for metric in METRICS:
+                old_value, new_value = base[name][metric], new[name][metric]
+                delta = change(old_value, new_value)
+                cells.append(
+                    f"{metric} {old_value} → {new_value}"
+                    + (f" ({delta:+.1f}%)" if delta is not None else "")
+                )
+            old_queries = base[name]["queries_per_request"]
+            new_queries = new[name]["queries_per_request"]
+            if old_queries and new_queries:
+                cells.append(
+                    f"SQL {old_queries['mean']} → {new_queries['mean']}"
+                )
+            self.stdout.write(f"{name}: " + ", ".join(cells))
+
+            delta = change(base[name]["p95_ms"], new[name]["p95_ms"])
+            threshold = options["threshold"]
+            if threshold is not None and delta is not None:
+                if delta > threshold:
+                    regressed.append(name)
+        for name in sorted(base.keys() ^ new.keys()):
+            self.stdout.write(f"{name}: есть только в одном отчёте")
+        if regressed:
+            raise CommandError(
+                f"p95 вырос больше чем на {options['threshold']}%: "
+                + ", ".join(regressed)
+            )
@@ -0,0 +1,167 @@
+import json
+from contextlib import contextmanager
+
+from benchmark.runner import HTTPRunner, WSGIRunner
+from benchmark.scenarios import ScenarioBuilder
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+from reviews.models import Comment, Review
+from titles.models import Title
+
+
+class Command(BaseCommand):
+    help = (
+        "Прогоняет запросы ко всем эндпоинтам чтения через WSGI-приложение "
+        "в этом процессе или по HTTP (--url) и сохраняет задержки "
+        "p50/p95/p99, пропускную способность и число SQL-запросов в JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            help="Адрес запущенного сервера, например http://127.0.0.1:8000."
+            " Без него запросы идут через WSGI-приложение в этом процессе.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Сколько запросов на сценарий.",
+        )
+        parser.add_argument("--warmup", type=int, default=20)
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=8,
+            help="Число одновременных соединений в режиме --url.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=20,
+            help="Сколько разных объектов запрашивать в каждом сценарии.",
+        )
+        parser.add_argument(
+            "--auth",
+            choices=("anonymous", "user"),
+            default="anonymous",
+            help="user: запросы с токеном, мимо кеша ответов.",
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            help="Запустить только этот сценарий, можно несколько раз.",
+        )
+        parser.add_argument(
+            "--conn-max-age",
+            type=int,
+            help="CONN_MAX_AGE на время прогона без --url: 0 — новое "
+            "соединение с базой на каждый запрос. Сервер в режиме --url "
+            "берёт его из DB_CONN_MAX_AGE.",
+        )
+        parser.add_argument("--output", help="Куда сохранить JSON.")
+
+    def handle(self, *args, **options):
+        builder = ScenarioBuilder(
+            seed=options["seed"],
+            samples=options["samples"],
+            auth=None if options["auth"] == "anonymous" else "user",
+        )
+        scenarios = builder.build()
+        if options["scenario"]:
+            unknown = set(options["scenario"]) - {s.name for s in scenarios}
+            if unknown:
+                raise CommandError(
+                    f"Нет сценариев: {', '.join(sorted(unknown))}"
+                )
+            scenarios = [s for s in scenarios if s.name in options["scenario"]]
+        tokens = builder.tokens()
+        if options["url"]:
+            if options["conn_max_age"] is not None:
+                raise CommandError(
+                    "--conn-max-age меняет настройки только этого процесса, "
+                    "с --url задайте DB_CONN_MAX_AGE серверу."
+                )
+            runner = HTTPRunner(options["url"], options["concurrency"])
+        else:
+            runner = WSGIRunner()
+
+        report = {
+            "mode": runner.mode,
+            "url": options["url"],
+            "started": timezone.now().isoformat(),
+            "database": {
+                "vendor": connection.vendor,
+                "titles": Title.objects.count(),
+                "reviews": Review.objects.count(),
+                "comments": Comment.objects.count(),
+            },
+            "options": {
+                name: options[name]
+                for name in (
+                    "requests",
+                    "warmup",
+                    "concurrency",
+                    "seed",
+                    "samples",
+                    "auth",
+                    "conn_max_age",
+                )
+            },
+            "scenarios": {},
+        }
+        with self.conn_max_age(options["conn_max_age"]):
+            self.run_scenarios(runner, scenarios, tokens, options, report)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Результаты сохранены в {options['output']}")
+
+    @contextmanager
+    def conn_max_age(self, max_age):
+        if max_age is None:
+            yield
+            return
+        saved = {}
+        for db in connections.all():
+            saved[db.alias] = db.settings_dict["CONN_MAX_AGE"]
+            db.settings_dict["CONN_MAX_AGE"] = max_age
+            # Срок жизни соединения считается при подключении.
+            db.close()
+        try:
+            yield
+        finally:
+            for db in connections.all():
+                db.settings_dict["CONN_MAX_AGE"] = saved[db.alias]
+                db.close()
+
+    def run_scenarios(self, runner, scenarios, tokens, options, report):
+        for scenario in scenarios:
+            headers = {}
+            if scenario.auth:
+                if scenario.auth not in tokens:
+                    self.stdout.write(f"{scenario.name}: нет пользователя")
+                    continue
+                headers["Authorization"] = f"Bearer {tokens[scenario.auth]}"
+            stats = runner.run(
+                scenario.urls, headers, options["requests"], options["warmup"]
+            )
+            report["scenarios"][scenario.name] = stats
+            self.stdout.write(self.format_stats(scenario.name, stats))
+
+    def format_stats(self, name, stats):
+        queries = stats["queries_per_request"]
+        return (
+            f"{name:30} p50 {stats['p50_ms']} мс, p95 {stats['p95_ms']} мс, "
+            f"p99 {stats['p99_ms']} мс, {stats['rps']} запр/с, "
+            f"ошибок {stats['errors']}"
+            + (f", SQL {queries['mean']}" if queries else "")
+            + (
+                f", соединений {stats['connections_per_request']}"
+                if stats["connections_per_request"]
+                else ""
+            )
+        )
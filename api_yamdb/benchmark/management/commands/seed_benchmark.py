@@ -0,0 +1,59 @@
+import os
+
+from api.cache import invalidate
+from benchmark.seed import Seeder, Shape
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет базу синтетическими данными для бенчмарка. Размеры "
+        "текстов, оценки, годы и жанры берутся из CSV в static/data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--titles", type=int, default=1000)
+        parser.add_argument("--reviews-per-title", type=int, default=50)
+        parser.add_argument("--comments-per-review", type=int, default=4)
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=1000,
+            help="Не меньше, чем отзывов на произведение.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Одинаковый seed на пустой базе даёт одинаковые данные.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--path",
+            default=os.path.join(settings.BASE_DIR, "static", "data"),
+            help="Каталог с CSV-файлами, по которым снимается форма данных.",
+        )
+
+    def handle(self, *args, **options):
+        seeder = Seeder(
+            Shape(options["path"]),
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            stdout=self.stdout,
+        )
+        try:
+            seeder.seed(
+                options["titles"],
+                options["reviews_per_title"],
+                options["comments_per_review"],
+                options["users"],
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        call_command("rebuild_counters", stdout=self.stdout)
+        # bulk_create не шлёт сигналы. Новые произведения, отзывы и
+        # комментарии в кеш ещё не попадали: кешируются только ответы 200,
+        # так что достаточно сбросить списки.
+        invalidate("titles", "genres", "categories")
@@ -0,0 +1,231 @@
+import http.client
+import math
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from io import BytesIO
+from itertools import count
+from urllib.parse import urlsplit
+from wsgiref.util import setup_testing_defaults
+
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+# Число запросов к базе сервер отдаёт в Server-Timing (api.instrumentation).
+SERVER_TIMING_QUERIES = re.compile(r'(?:^|, )db;[^,]*desc="(\d+) queries"')
+SERVER_TIMING_CONNECTIONS = re.compile(r'(?:^|, )db-connect;desc="(\d+)"')
+
+
+def connections_opened(server_timing):
+    match = SERVER_TIMING_CONNECTIONS.search(server_timing or "")
+    return int(match.group(1)) if match else 0
+
+
+def percentile(values, percent):
+    """Процентиль по методу ближайшего ранга, values отсортированы."""
+    if not values:
+        return None
+    rank = max(math.ceil(percent / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def summarize(latencies, errors, queries, elapsed, opened=()):
+    latencies = sorted(latencies)
+    stats = {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "mean_ms": None,
+        "max_ms": None,
+        "queries_per_request": None,
+        "connections_per_request": None,
+    }
+    for percent in (50, 95, 99):
+        value = percentile(latencies, percent)
+        stats[f"p{percent}_ms"] = value and round(value * 1000, 3)
+    if latencies:
+        stats["mean_ms"] = round(sum(latencies) / len(latencies) * 1000, 3)
+        stats["max_ms"] = round(latencies[-1] * 1000, 3)
+    if queries:
+        stats["queries_per_request"] = {
+            "mean": round(sum(queries) / len(queries), 2),
+            "max": max(queries),
+        }
+    if opened:
+        stats["connections_per_request"] = round(
+            sum(opened) / len(opened), 3
+        )
+    return stats
+
+
+class WSGIRunner:
+    """
+    Запросы идут через WSGI-приложение проекта в этом же процессе,
+    со всеми middleware, но без сети. Считает SQL-запросы на запрос
+    и новые соединения с базой (из Server-Timing).
+    """
+
+    mode = "wsgi"
+
+    def __init__(self):
+        self.app = get_wsgi_application()
+
+    def call(self, url, headers):
+        path, _, query = url.partition("?")
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "wsgi.input": BytesIO(),
+        }
+        setup_testing_defaults(environ)
+        for name, value in headers.items():
+            environ["HTTP_" + name.upper().replace("-", "_")] = value
+        statuses = []
+        server_timing = []
+
+        def start_response(status, response_headers, exc_info=None):
+            statuses.append(int(status.split()[0]))
+            server_timing.extend(
+                value
+                for name, value in response_headers
+                if name == "Server-Timing"
+            )
+
+        response = self.app(environ, start_response)
+        try:
+            for _ in response:
+                pass
+        finally:
+            if hasattr(response, "close"):
+                response.close()
+        return statuses[0], connections_opened(", ".join(server_timing))
+
+    def run(self, urls, headers, requests, warmup):
+        for number in range(warmup):
+            self.call(urls[number % len(urls)], headers)
+        latencies, queries, opened = [], [], []
+        errors = 0
+        started = time.perf_counter()
+        for number in range(requests):
+            url = urls[number % len(urls)]
+            with ExitStack() as stack:
+                contexts = [
+                    stack.enter_context(CaptureQueriesContext(connection))
+                    for connection in connections.all()
+                ]
+                request_started = time.perf_counter()
+                status, new_connections = self.call(url, headers)
+                latencies.append(time.perf_counter() - request_started)
+            queries.append(sum(len(context) for context in contexts))
+            opened.append(new_connections)
+            errors += status >= 400
+        return summarize(
+            latencies, errors, queries, time.perf_counter() - started, opened
+        )
+
+
+class HTTPRunner:
+    """
+    Нагрузка по HTTP на запущенный сервер: concurrency потоков,
+    у каждого своё keep-alive соединение.
+    """
+
+    mode = "http"
+
+    def __init__(self, base_url, concurrency=8, timeout=30):
+        parts = urlsplit(base_url)
+        self.connection_class = (
+            http.client.HTTPSConnection
+            if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    def call(self, connection, url, headers):
+        connection.request("GET", self.prefix + url, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        server_timing = response.getheader("Server-Timing", "")
+        match = SERVER_TIMING_QUERIES.search(server_timing)
+        return (
+            response.status,
+            match and int(match.group(1)),
+            connections_opened(server_timing),
+        )
+
+    def worker(
+        self,
+        urls,
+        headers,
+        requests,
+        numbers,
+        latencies,
+        queries,
+        opened,
+        lock,
+    ):
+        connection = self.connection_class(self.netloc, timeout=self.timeout)
+        errors = 0
+        try:
+            while True:
+                # Общий счётчик раздаёт номера запросов потокам по одному.
+                with lock:
+                    number = next(numbers)
+                if number >= requests:
+                    return errors
+                request_started = time.perf_counter()
+                try:
+                    status, count, new_connections = self.call(
+                        connection, urls[number % len(urls)], headers
+                    )
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    status, count, new_connections = 599, None, None
+                elapsed = time.perf_counter() - request_started
+                with lock:
+                    latencies.append(elapsed)
+                    if count is not None:
+                        queries.append(count)
+                    if new_connections is not None:
+                        opened.append(new_connections)
+                errors += status >= 400
+        finally:
+            connection.close()
+
+    def run(self, urls, headers, requests, warmup):
+        connection = self.connection_class(self.netloc, timeout=self.timeout)
+        try:
+            for number in range(warmup):
+                self.call(connection, urls[number % len(urls)], headers)
+        finally:
+            connection.close()
+        latencies, queries, opened = [], [], []
+        lock = threading.Lock()
+        numbers = count()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(self.concurrency) as executor:
+            futures = [
+                executor.submit(
+                    self.worker,
+                    urls,
+                    headers,
+                    requests,
+                    numbers,
+                    latencies,
+                    queries,
+                    opened,
+                    lock,
+                )
+                for _ in range(self.concurrency)
+            ]
+            errors = sum(future.result() for future in futures)
+        return summarize(
+            latencies, errors, queries, time.perf_counter() - started, opened
+        )
@@ -0,0 +1,207 @@
+import random
+from collections import namedtuple
+from urllib.parse import urlencode
+
+from api.authentication import add_user_claims
+from django.conf import settings
+from django.db.models import Max, Min
+from rest_framework_simplejwt.tokens import RefreshToken
+from reviews.models import Comment, Review
+from titles.models import Category, Genre, Title
+from users.models import User
+
+from .seed import ADMIN_USERNAME
+
+API = "/api/v1"
+
+# auth: None — анонимно, "user" — токен обычного пользователя,
+# "admin" — токен администратора.
+Scenario = namedtuple("Scenario", "name urls auth")
+
+
+def access_token(user):
+    return str(add_user_claims(RefreshToken.for_user(user).access_token, user))
+
+
+class ScenarioBuilder:
+    """
+    Собирает запросы ко всем эндпоинтам чтения из api/urls.py.
+    id объектов выбираются из базы генератором с фиксированным seed,
+    поэтому два прогона на одной базе шлют одни и те же запросы.
+    """
+
+    def __init__(self, seed=0, samples=20, auth=None):
+        self.rng = random.Random(seed)
+        self.samples = samples
+        self.auth = auth
+
+    def sample_titles(self):
+        bounds = Title.objects.aggregate(low=Min("id"), high=Max("id"))
+        if bounds["low"] is None:
+            return []
+        wanted = {
+            self.rng.randint(bounds["low"], bounds["high"])
+            for _ in range(self.samples * 4)
+        }
+        ids = sorted(Title.objects.filter(id__in=wanted).values_list("id"))
+        return [title_id for title_id, in ids[: self.samples]]
+
+    def sample_reviews(self, title_ids):
+        pairs = []
+        for title_id in title_ids:
+            review_id = (
+                Review.objects.filter(title_id=title_id)
+                .values_list("id", flat=True)
+                .first()
+            )
+            if review_id is not None:
+                pairs.append((title_id, review_id))
+        return pairs
+
+    def sample_comments(self, review_pairs):
+        triples = []
+        for title_id, review_id in review_pairs:
+            comment_id = (
+                Comment.objects.filter(review_id=review_id)
+                .values_list("id", flat=True)
+                .first()
+            )
+            if comment_id is not None:
+                triples.append((title_id, review_id, comment_id))
+        return triples
+
+    def build(self):
+        title_ids = self.sample_titles()
+        reviews = self.sample_reviews(title_ids)
+        comments = self.sample_comments(reviews)
+        categories = list(Category.objects.values_list("slug", flat=True))
+        genres = list(Genre.objects.values_list("slug", flat=True))
+        sampled = list(
+            Title.objects.filter(id__in=title_ids).values_list(
+                "id", "name", "year", "category__slug", "reviews_count"
+            )
+        )
+        words = [name.split()[0] for _, name, *_ in sampled if name.split()]
+        titles = f"{API}/titles"
+        page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+
+        scenarios = [
+            ("titles-list", [f"{titles}/"]),
+            (
+                "titles-filter-category",
+                [f"{titles}/?category={slug}" for slug in categories],
+            ),
+            (
+                "titles-filter-genre",
+                [f"{titles}/?genre={slug}" for slug in genres],
+            ),
+            (
+                "titles-filter-category-year",
+                [
+                    f"{titles}/?category={slug}&year={year}"
+                    for _, _, year, slug, _ in sampled
+                    if slug
+                ],
+            ),
+            (
+                "titles-name",
+                [f"{titles}/?{urlencode({'name': word})}" for word in words],
+            ),
+            (
+                "titles-search",
+                [f"{titles}/?{urlencode({'search': word})}" for word in words],
+            ),
+            (
+                "titles-ordering",
+                [
+                    f"{titles}/?ordering={ordering}"
+                    for ordering in ("-rating", "-year", "name")
+                ],
+            ),
+            ("titles-top", [f"{titles}/top/"]),
+            (
+                "titles-top-genre",
+                [f"{titles}/top/?genre={slug}" for slug in genres],
+            ),
+            (
+                "titles-top-category",
+                [f"{titles}/top/?category={slug}" for slug in categories],
+            ),
+            (
+                "title-detail",
+                [f"{titles}/{title_id}/" for title_id in title_ids],
+            ),
+            (
+                "title-rating",
+                [f"{titles}/{title_id}/rating/" for title_id in title_ids],
+            ),
+            ("categories-list", [f"{API}/categories/"]),
+            ("genres-list", [f"{API}/genres/"]),
+            (
+                "reviews-list",
+                [f"{titles}/{title_id}/reviews/" for title_id in title_ids],
+            ),
+            (
+                "reviews-list-last-page",
+                [
+                    f"{titles}/{title_id}/reviews/"
+                    f"?offset={max(count - page_size, 0)}"
+                    for title_id, _, _, _, count in sampled
+                ],
+            ),
+            (
+                "reviews-cursor",
+                [
+                    f"{titles}/{title_id}/reviews/?cursor="
+                    for title_id in title_ids
+                ],
+            ),
+            (
+                "review-detail",
+                [
+                    f"{titles}/{title_id}/reviews/{review_id}/"
+                    for title_id, review_id in reviews
+                ],
+            ),
+            (
+                "comments-list",
+                [
+                    f"{titles}/{title_id}/reviews/{review_id}/comments/"
+                    for title_id, review_id in reviews
+                ],
+            ),
+            (
+                "comments-cursor",
+                [
+                    f"{titles}/{title_id}/reviews/{review_id}/comments/"
+                    "?cursor="
+                    for title_id, review_id in reviews
+                ],
+            ),
+            (
+                "comment-detail",
+                [
+                    f"{titles}/{title_id}/reviews/{review_id}/comments/"
+                    f"{comment_id}/"
+                    for title_id, review_id, comment_id in comments
+                ],
+            ),
+        ]
+        result = [
+            Scenario(name, urls, self.auth) for name, urls in scenarios if urls
+        ]
+        result.append(Scenario("users-list", [f"{API}/users/"], "admin"))
+        result.append(Scenario("users-me", [f"{API}/users/me/"], "user"))
+        return result
+
+    def tokens(self):
+        """Токены для сценариев с авторизацией."""
+        admin = User.objects.filter(username=ADMIN_USERNAME).first()
+        if admin is None:
+            admin = User.objects.filter(role="admin").first()
+        user = User.objects.filter(role="user").first()
+        return {
+            role: access_token(account)
+            for role, account in (("admin", admin), ("user", user))
+            if account is not None
+        }
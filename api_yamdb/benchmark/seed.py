@@ -0,0 +1,241 @@
+import csv
+import os
+import random
+import time
+from collections import Counter
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from reviews.models import Comment, Review
+from reviews.utils import bulk_create_dated
+from titles.models import Category, Genre, Title
+from users.models import User
+
+GenreTitle = Title.genre.through
+
+ADMIN_USERNAME = "bench_admin"
+USERNAME = "bench{}"
+
+
+def read_csv(path, filename):
+    with open(os.path.join(path, filename), encoding="utf-8") as csv_file:
+        return list(csv.DictReader(csv_file))
+
+
+def word_count(text):
+    return max(len(text.split()), 1)
+
+
+class Shape:
+    """Распределения, снятые с демонстрационных CSV из static/data."""
+
+    def __init__(self, path):
+        self.categories = [
+            (row["name"], row["slug"])
+            for row in read_csv(path, "category.csv")
+        ]
+        self.genres = [
+            (row["name"], row["slug"]) for row in read_csv(path, "genre.csv")
+        ]
+        titles = read_csv(path, "titles.csv")
+        self.title_words = [
+            word for row in titles for word in row["name"].split()
+        ]
+        self.title_lengths = [word_count(row["name"]) for row in titles]
+        self.years = [int(row["year"]) for row in titles]
+        per_title = Counter(
+            row["title_id"] for row in read_csv(path, "genre_title.csv")
+        )
+        self.genres_per_title = list(per_title.values()) or [1]
+        reviews = read_csv(path, "review.csv")
+        self.scores = [int(row["score"]) for row in reviews]
+        self.review_lengths = [word_count(row["text"]) for row in reviews]
+        comments = read_csv(path, "comments.csv")
+        self.comment_lengths = [word_count(row["text"]) for row in comments]
+        self.words = [
+            word for row in reviews + comments for word in row["text"].split()
+        ]
+
+
+class Seeder:
+    """
+    Заполняет базу синтетическими данными заданного масштаба.
+    Все id назначаются заранее, поэтому строки генерируются потоком
+    и вставляются пачками без чтения уже вставленного.
+    """
+
+    def __init__(self, shape, seed=0, batch_size=5000, stdout=None):
+        self.shape = shape
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.stdout = stdout
+        self.password = make_password(None)
+        self.now = timezone.now()
+
+    def seed(self, titles, reviews_per_title, comments_per_review, users):
+        if users < reviews_per_title:
+            raise ValueError(
+                "Пользователей должно быть не меньше, чем отзывов "
+                "на произведение: автор оставляет один отзыв."
+            )
+        self.category_ids = self.ensure(Category, self.shape.categories)
+        self.genre_ids = self.ensure(Genre, self.shape.genres)
+        User.objects.get_or_create(
+            username=ADMIN_USERNAME,
+            defaults={
+                "email": f"{ADMIN_USERNAME}@yamdb.fake",
+                "role": "admin",
+                "password": self.password,
+            },
+        )
+        user_ids = self.insert(User, self.make_users, users)
+        title_ids = self.insert(Title, self.make_titles, titles)
+        self.insert(GenreTitle, self.make_genre_titles, title_ids)
+        self.insert_reviews(
+            title_ids, user_ids, reviews_per_title, comments_per_review
+        )
+        self.reset_sequences()
+
+    def ensure(self, model, rows):
+        for name, slug in rows:
+            model.objects.get_or_create(slug=slug, defaults={"name": name})
+        return list(model.objects.values_list("id", flat=True))
+
+    def next_id(self, model):
+        return (model.objects.aggregate(last=Max("id"))["last"] or 0) + 1
+
+    def report(self, model, rows, started):
+        elapsed = time.monotonic() - started
+        if self.stdout is not None:
+            self.stdout.write(
+                f"{model._meta.db_table}: {rows} строк за {elapsed:.2f} с "
+                f"({rows / max(elapsed, 1e-6):.0f} строк/с)"
+            )
+
+    def insert(self, model, make, *args):
+        """Вставляет объекты из генератора make, возвращает их id."""
+        first_id = self.next_id(model)
+        objs = make(first_id, *args)
+        rows = 0
+        started = time.monotonic()
+        while True:
+            batch = list(islice(objs, self.batch_size))
+            if not batch:
+                break
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            rows += len(batch)
+        self.report(model, rows, started)
+        return range(first_id, first_id + rows)
+
+    def insert_reviews(self, title_ids, user_ids, per_title, per_review):
+        """
+        Комментарии вставляются вместе с пачкой своих отзывов:
+        дата комментария не раньше даты отзыва, а держать в памяти
+        даты миллионов отзывов не хочется.
+        """
+        reviews = self.make_reviews(
+            self.next_id(Review), title_ids, user_ids, per_title
+        )
+        comment_id = self.next_id(Comment)
+        review_rows = comment_rows = 0
+        started = time.monotonic()
+        while True:
+            batch = list(islice(reviews, self.batch_size))
+            if not batch:
+                break
+            comments = list(
+                self.make_comments(comment_id, batch, user_ids, per_review)
+            )
+            with transaction.atomic():
+                bulk_create_dated(Review, batch)
+                bulk_create_dated(Comment, comments)
+            comment_id += len(comments)
+            review_rows += len(batch)
+            comment_rows += len(comments)
+        self.report(Review, review_rows, started)
+        self.report(Comment, comment_rows, started)
+
+    def text(self, lengths):
+        return " ".join(
+            self.rng.choices(self.shape.words, k=self.rng.choice(lengths))
+        )
+
+    def make_users(self, first_id, count):
+        for user_id in range(first_id, first_id + count):
+            yield User(
+                id=user_id,
+                username=USERNAME.format(user_id),
+                email=f"{USERNAME.format(user_id)}@yamdb.fake",
+                role="user",
+                password=self.password,
+            )
+
+    def make_titles(self, first_id, count):
+        for title_id in range(first_id, first_id + count):
+            words = self.rng.choices(
+                self.shape.title_words,
+                k=self.rng.choice(self.shape.title_lengths),
+            )
+            yield Title(
+                id=title_id,
+                name=" ".join(words).capitalize(),
+                year=self.rng.choice(self.shape.years),
+                category_id=self.rng.choice(self.category_ids),
+            )
+
+    def make_genre_titles(self, first_id, title_ids):
+        link_id = first_id
+        for title_id in title_ids:
+            count = min(
+                self.rng.choice(self.shape.genres_per_title),
+                len(self.genre_ids),
+            )
+            for genre_id in self.rng.sample(self.genre_ids, count):
+                yield GenreTitle(
+                    id=link_id, title_id=title_id, genre_id=genre_id
+                )
+                link_id += 1
+
+    def pub_date(self, after, before):
+        seconds = (before - after).total_seconds()
+        return after + timedelta(seconds=self.rng.uniform(0, seconds))
+
+    def make_reviews(self, first_id, title_ids, user_ids, per_title):
+        review_id = first_id
+        since = self.now - timedelta(days=3 * 365)
+        for title_id in title_ids:
+            for author_id in self.rng.sample(user_ids, per_title):
+                yield Review(
+                    id=review_id,
+                    title_id=title_id,
+                    author_id=author_id,
+                    text=self.text(self.shape.review_lengths),
+                    score=self.rng.choice(self.shape.scores),
+                    pub_date=self.pub_date(since, self.now),
+                )
+                review_id += 1
+
+    def make_comments(self, first_id, reviews, user_ids, per_review):
+        comment_id = first_id
+        for review in reviews:
+            for _ in range(per_review):
+                yield Comment(
+                    id=comment_id,
+                    review_id=review.id,
+                    author_id=self.rng.choice(user_ids),
+                    text=self.text(self.shape.comment_lengths),
+                    pub_date=self.pub_date(review.pub_date, self.now),
+                )
+                comment_id += 1
+
+    def reset_sequences(self):
+        models = [User, Category, Genre, Title, GenreTitle, Review, Comment]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
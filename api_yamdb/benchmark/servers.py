@@ -0,0 +1,143 @@
+import http.client
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+
+
+def child_pids(pid):
+    """pid всех потомков процесса pid по /proc (только Linux)."""
+    parents = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as file:
+                stat = file.read()
+        except OSError:
+            continue
+        # Имя процесса в скобках может содержать пробелы.
+        parents.setdefault(int(stat.rsplit(")", 1)[1].split()[1]), []).append(
+            int(name)
+        )
+    result, queue = [], [pid]
+    while queue:
+        children = parents.get(queue.pop(), [])
+        result.extend(children)
+        queue.extend(children)
+    return result
+
+
+def proc_field_kb(path, field):
+    try:
+        with open(path) as file:
+            for line in file:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def memory_kb(pid):
+    """
+    Память процесса в КиБ: PSS, где общие с другими процессами страницы
+    делятся между ними (так видна экономия от preload_app), или RSS на
+    ядрах без smaps_rollup. 0 — если процесса уже нет.
+    """
+    for path, field in (
+        (f"/proc/{pid}/smaps_rollup", "Pss"),
+        (f"/proc/{pid}/status", "VmRSS"),
+    ):
+        value = proc_field_kb(path, field)
+        if value is not None:
+            return value
+    return 0
+
+
+def tree_memory_kb(pid):
+    return sum(memory_kb(p) for p in [pid, *child_pids(pid)])
+
+
+# Конфигурации gunicorn.conf.py для сравнения: переменные окружения.
+CONFIGS = {
+    "sync": {"SERVER_MODE": "wsgi", "GUNICORN_WORKER_CLASS": "sync"},
+    "gthread": {"SERVER_MODE": "wsgi", "GUNICORN_WORKER_CLASS": "gthread"},
+    "gevent": {"SERVER_MODE": "wsgi", "GUNICORN_WORKER_CLASS": "gevent"},
+    "asgi": {"SERVER_MODE": "asgi"},
+}
+
+
+class GunicornServer:
+    """
+    gunicorn с gunicorn.conf.py проекта в отдельном процессе: config —
+    ключ CONFIGS, env — дополнительные переменные окружения, остальное
+    окружение и база данных — как у текущего процесса.
+    """
+
+    def __init__(self, config, workers, port, env=None, timeout=30):
+        self.config = config
+        self.env = {**CONFIGS[config], **(env or {})}
+        self.workers = workers
+        self.port = port
+        self.timeout = timeout
+        self.process = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                "--bind",
+                f"127.0.0.1:{self.port}",
+                "--workers",
+                str(self.workers),
+                "--log-level",
+                "warning",
+            ],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, **self.env},
+        )
+        self.wait_ready()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.process.send_signal(signal.SIGTERM)
+        try:
+            self.process.wait(self.timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+    def wait_ready(self):
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(
+                    f"gunicorn ({self.config}) завершился с кодом "
+                    f"{self.process.returncode}"
+                )
+            connection = http.client.HTTPConnection(
+                "127.0.0.1", self.port, timeout=1
+            )
+            try:
+                connection.request("GET", "/api/v1/categories/")
+                connection.getresponse().read()
+                return
+            except OSError:
+                time.sleep(0.2)
+            finally:
+                connection.close()
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"gunicorn ({self.config}) не запустился")
+
+    def memory_kb(self):
+        return tree_memory_kb(self.process.pid)
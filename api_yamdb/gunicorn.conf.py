@@ -0,0 +1,115 @@
+# gunicorn читает этот файл из рабочего каталога автоматически.
+# Параметры задаются переменными окружения GUNICORN_*, флаги командной
+# строки переопределяют их.
+import gc
+import os
+import shutil
+
+from prometheus_client import multiprocess
+
+# Воркеры с циклом событий: один процесс на ядро держит много
+# соединений, остальным нужно больше процессов, чем ядер.
+EVENT_LOOP_WORKERS = ("gevent", "uvicorn.workers.UvicornWorker")
+
+
+def env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def cpu_count():
+    # Учитывает привязку контейнера к ядрам (cpuset).
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def default_workers(worker_class, cpus):
+    if worker_class in EVENT_LOOP_WORKERS:
+        return cpus
+    return 2 * cpus + 1
+
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+# SERVER_MODE=asgi запускает api_yamdb.asgi в воркерах uvicorn.
+if os.environ.get("SERVER_MODE", "wsgi") == "asgi":
+    wsgi_app = "api_yamdb.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "api_yamdb.wsgi:application"
+    worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+    if worker_class not in ("sync", "gthread", "gevent"):
+        raise ValueError(
+            f"GUNICORN_WORKER_CLASS={worker_class}: ожидается sync, "
+            "gthread или gevent"
+        )
+
+workers = env_int(
+    "GUNICORN_WORKERS", default_workers(worker_class, cpu_count())
+)
+# Потоки воркера gthread; с ними стоит задать DB_POOL_SIZE.
+threads = env_int("GUNICORN_THREADS", 4 if worker_class == "gthread" else 1)
+# Одновременные запросы воркера gevent, каждому нужно соединение с базой.
+worker_connections = env_int("GUNICORN_WORKER_CONNECTIONS", 100)
+
+# Приложение импортируется один раз в главном процессе, воркеры
+# получают его при fork и делят память с главным процессом. Воркер
+# gevent подменяет модули стандартной библиотеки уже после fork, и
+# импортированное заранее приложение осталось бы с блокирующими.
+preload_app = (
+    os.environ.get(
+        "GUNICORN_PRELOAD", "0" if worker_class == "gevent" else "1"
+    )
+    == "1"
+)
+
+# Перезапуск воркера после max_requests запросов против утечек памяти;
+# разброс не даёт всем воркерам перезапуститься одновременно.
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+# nginx держит соединения с приложением открытыми до 60 секунд
+# (keepalive_timeout в upstream); gunicorn должен держать их дольше,
+# иначе nginx отправит запрос в соединение, которое уже закрывается.
+# Синхронные воркеры keep-alive не поддерживают.
+keepalive = env_int("GUNICORN_KEEPALIVE", 75)
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+
+
+def on_starting(server):
+    # Файлы метрик прошлого запуска относятся к умершим процессам.
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+
+
+def pre_fork(server, worker):
+    if server.cfg.preload_app:
+        from django.conf import settings
+        from django.db import connections
+
+        # Соединение главного процесса досталось бы всем воркерам.
+        connections.close_all()
+        if settings.DB_POOL_SIZE:
+            # close_all() вернул соединения в пул, а не закрыл их.
+            from api_yamdb.db.postgresql_pool.base import close_pools
+
+            close_pools()
+        # Объекты, загруженные при импорте, уходят из-под сборщика
+        # мусора: он не трогает их страницы, и память остаётся общей.
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if server.cfg.worker_class_str == "gevent":
+        # psycopg2 без этого блокирует весь воркер на время запроса.
+        from psycogreen.gevent import patch_psycopg
+
+        patch_psycopg()
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
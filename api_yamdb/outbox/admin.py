@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from .models import Email
+
+
+class EmailAdmin(admin.ModelAdmin):
+    list_display = (
+        "pk",
+        "subject",
+        "to",
+        "created",
+        "sent_at",
+        "attempts",
+    )
+    search_fields = ("to",)
+    list_filter = ("sent_at",)
+    empty_value_display = "-пусто-"
+
+
+admin.site.register(Email, EmailAdmin)
@@ -0,0 +1,14 @@
+from .models import Email
+
+
+def enqueue_mail(subject, message, from_email, recipient_list):
+    """
+    Ставит письмо в очередь вместо отправки: запрос не ждёт
+    почтовый сервер, письмо отправит команда send_outbox.
+    """
+    return Email.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email,
+        to=",".join(recipient_list),
+    )
@@ -0,0 +1,110 @@
+import time
+from datetime import timedelta
+from smtplib import SMTPException
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from outbox.models import Email
+
+
+class Command(BaseCommand):
+    help = (
+        "Отправляет письма из очереди пачками через одно соединение "
+        "с почтовым сервером, неудачные повторяет с нарастающей паузой."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=5,
+            help="После стольких неудач письмо больше не отправляется.",
+        )
+        parser.add_argument(
+            "--retry-delay",
+            type=int,
+            default=60,
+            help="Пауза перед первым повтором в секундах, далее удваивается.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Не завершаться, а ждать новые письма.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Пауза между проверками очереди в режиме --loop.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = self.drain(
+                options["batch_size"],
+                options["max_attempts"],
+                options["retry_delay"],
+            )
+            if sent or failed:
+                self.stdout.write(f"Отправлено: {sent}, с ошибкой: {failed}")
+            if not options["loop"]:
+                break
+            if not sent and not failed:
+                time.sleep(options["interval"])
+
+    def drain(self, batch_size, max_attempts, retry_delay):
+        sent = failed = 0
+        connection = get_connection(fail_silently=False)
+        try:
+            while True:
+                with transaction.atomic():
+                    emails = list(
+                        Email.objects.filter(
+                            sent_at__isnull=True,
+                            send_after__lte=timezone.now(),
+                            attempts__lt=max_attempts,
+                        )
+                        .select_for_update(skip_locked=True)
+                        .order_by("id")[:batch_size]
+                    )
+                    if not emails:
+                        break
+                    for email in emails:
+                        if self.send(connection, email, retry_delay):
+                            sent += 1
+                        else:
+                            failed += 1
+                    Email.objects.bulk_update(
+                        emails,
+                        ["sent_at", "attempts", "last_error", "send_after"],
+                    )
+        finally:
+            connection.close()
+        return sent, failed
+
+    def send(self, connection, email, retry_delay):
+        message = EmailMessage(
+            email.subject,
+            email.body,
+            email.from_email,
+            email.recipients,
+            connection=connection,
+        )
+        try:
+            # Открытое соединение send_messages не закрывает,
+            # поэтому вся очередь уходит через него.
+            connection.open()
+            if not connection.send_messages([message]):
+                raise SMTPException("Письмо не принято почтовым сервером")
+        except (SMTPException, OSError) as error:
+            email.attempts += 1
+            email.last_error = str(error)
+            email.send_after = timezone.now() + timedelta(
+                seconds=retry_delay * 2 ** (email.attempts - 1)
+            )
+            return False
+        email.sent_at = timezone.now()
+        return True
@@ -0,0 +1,53 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:26
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Email",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("subject", models.CharField(max_length=256)),
+                ("body", models.TextField()),
+                ("from_email", models.CharField(max_length=256)),
+                (
+                    "to",
+                    models.TextField(verbose_name="Получатели через запятую"),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                (
+                    "send_after",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+            ],
+            options={
+                "verbose_name": "Email",
+                "verbose_name_plural": "Emails",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="email",
+            index=models.Index(
+                fields=["sent_at", "send_after"], name="outbox_pending_idx"
+            ),
+        ),
+    ]
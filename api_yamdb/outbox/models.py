@@ -0,0 +1,30 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Email(models.Model):
+    subject = models.CharField(max_length=256)
+    body = models.TextField()
+    from_email = models.CharField(max_length=256)
+    to = models.TextField("Получатели через запятую")
+    created = models.DateTimeField(auto_now_add=True)
+    send_after = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = "Email"
+        verbose_name_plural = "Emails"
+        indexes = [
+            models.Index(
+                fields=["sent_at", "send_after"], name="outbox_pending_idx"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to}"
+
+    @property
+    def recipients(self):
+        return self.to.split(",")
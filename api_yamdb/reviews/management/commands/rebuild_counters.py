@@ -0,0 +1,128 @@
+from math import isclose
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from reviews.models import Review
+from titles.models import SCORES, Title, rating_fields
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает сумму оценок, число отзывов, гистограмму оценок "
+        "и рейтинги произведений по таблице отзывов и число комментариев "
+        "отзывов. С --check только сообщает о расхождениях."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Не исправлять, а только найти расхождения.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Сколько произведений или отзывов обрабатывать "
+            "за один запрос.",
+        )
+
+    def handle(self, *args, **options):
+        titles = self.rebuild_scores(options["batch_size"], options["check"])
+        reviews = self.rebuild_comments(
+            options["batch_size"], options["check"]
+        )
+        if not options["check"]:
+            self.stdout.write(f"Исправлено произведений: {titles}")
+            self.stdout.write(f"Исправлено отзывов: {reviews}")
+        elif titles or reviews:
+            raise CommandError(
+                f"Расхождения в {titles} произведениях и {reviews} отзывах"
+            )
+
+    def rebuild_scores(self, batch_size, check):
+        drifted = 0
+        last_id = Title.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+        for start in range(0, last_id + 1, batch_size):
+            with transaction.atomic():
+                batch = Title.objects.filter(
+                    id__gte=start, id__lt=start + batch_size
+                )
+                if not check:
+                    # Сначала блокируем строки: отзыв, добавленный во время
+                    # пересчёта, сдвинет счётчики уже после нас.
+                    list(batch.select_for_update().values_list("id"))
+                titles = batch.annotate(
+                    **{
+                        f"actual_{score}": Count(
+                            "reviews", filter=Q(reviews__score=score)
+                        )
+                        for score in SCORES
+                    }
+                )
+                changed = []
+                for title in titles:
+                    actual = rating_fields(
+                        {
+                            score: getattr(title, f"actual_{score}")
+                            for score in SCORES
+                        }
+                    )
+                    if self.same_ratings(title, actual):
+                        continue
+                    if check:
+                        self.stdout.write(
+                            f"{title.id}: сумма {title.score_sum} "
+                            f"вместо {actual['score_sum']}, отзывов "
+                            f"{title.reviews_count} вместо "
+                            f"{actual['reviews_count']}, гистограмма "
+                            f"{list(title.histogram().values())}"
+                        )
+                    for field, value in actual.items():
+                        setattr(title, field, value)
+                    changed.append(title)
+                drifted += len(changed)
+                if changed and not check:
+                    Title.objects.bulk_update(changed, list(actual))
+        return drifted
+
+    def same_ratings(self, title, actual):
+        # Взвешенный рейтинг база считает в своей арифметике.
+        return isclose(
+            title.weighted_rating, actual["weighted_rating"]
+        ) and all(
+            getattr(title, field) == value
+            for field, value in actual.items()
+            if field != "weighted_rating"
+        )
+
+    def rebuild_comments(self, batch_size, check):
+        drifted = 0
+        last_id = Review.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+        for start in range(0, last_id + 1, batch_size):
+            with transaction.atomic():
+                batch = Review.objects.filter(
+                    id__gte=start, id__lt=start + batch_size
+                ).order_by()
+                if not check:
+                    list(batch.select_for_update().values_list("id"))
+                reviews = batch.only("id", "comments_count").annotate(
+                    actual_count=Count("comments")
+                )
+                changed = []
+                for review in reviews:
+                    if review.comments_count == review.actual_count:
+                        continue
+                    if check:
+                        self.stdout.write(
+                            f"Отзыв {review.id}: комментариев "
+                            f"{review.comments_count} вместо "
+                            f"{review.actual_count}"
+                        )
+                    review.comments_count = review.actual_count
+                    changed.append(review)
+                drifted += len(changed)
+                if changed and not check:
+                    Review.objects.bulk_update(changed, ["comments_count"])
+        return drifted
@@ -0,0 +1,53 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:54
+
+import reviews.models
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comments_count(apps, schema_editor):
+    Review = apps.get_model("reviews", "Review")
+    Comment = apps.get_model("reviews", "Comment")
+    comments = (
+        Comment.objects.filter(review=OuterRef("pk"))
+        .order_by()
+        .values("review")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    Review.objects.update(comments_count=Coalesce(Subquery(comments), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0003_review_comment_pub_date_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="review",
+            name="comments_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name="comment",
+            name="review",
+            field=models.ForeignKey(
+                on_delete=reviews.models.cascade_with_parent,
+                related_name="comments",
+                to="reviews.Review",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="review",
+            name="title",
+            field=models.ForeignKey(
+                on_delete=reviews.models.cascade_with_parent,
+                related_name="reviews",
+                to="titles.Title",
+            ),
+        ),
+        migrations.RunPython(fill_comments_count, migrations.RunPython.noop),
+    ]
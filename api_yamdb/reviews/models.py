@@ -4,10 +4,21 @@ from titles.models import Title
 from users.models import User
 
 
+def cascade_with_parent(collector, field, sub_objs, using):
+    """
+    CASCADE, который помечает объекты, удаляемые вместе с родителем:
+    их сигналам незачем сдвигать счётчики родителя, его строка
+    удаляется в той же операции.
+    """
+    for obj in sub_objs:
+        obj._parent_deleted = True
+    models.CASCADE(collector, field, sub_objs, using)
+
+
 class Review(models.Model):
     title = models.ForeignKey(
         Title,
-        on_delete=models.CASCADE,
+        on_delete=cascade_with_parent,
         related_name="reviews",
     )
     text = models.TextField()
@@ -23,11 +34,18 @@ class Review(models.Model):
     pub_date = models.DateTimeField(
         "Дата публикации", auto_now_add=True, db_index=True
     )
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = "Rewiew"
         verbose_name_plural = "Rewiews"
         ordering = ["-pub_date"]
+        indexes = [
+            models.Index(
+                fields=["title", "-pub_date", "-id"],
+                name="review_title_pub_date_idx",
+            )
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["title", "author"], name="unique_review"
@@ -37,10 +55,18 @@ class Review(models.Model):
     def __str__(self):
         return self.text[:30]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Оценка на момент загрузки нужна, чтобы при изменении отзыва
+        # сдвинуть сумму оценок произведения на разницу.
+        instance._loaded_score = instance.__dict__.get("score")
+        return instance
+
 
 class Comment(models.Model):
     review = models.ForeignKey(
-        Review, on_delete=models.CASCADE, related_name="comments"
+        Review, on_delete=cascade_with_parent, related_name="comments"
     )
     text = models.TextField()
     author = models.ForeignKey(
@@ -54,6 +80,12 @@ class Comment(models.Model):
         verbose_name = "Comment"
         verbose_name_plural = "Comments"
         ordering = ["-pub_date"]
+        indexes = [
+            models.Index(
+                fields=["review", "-pub_date", "-id"],
+                name="comment_review_pub_date_idx",
+            )
+        ]
 
     def __str__(self):
         return self.text[:30]
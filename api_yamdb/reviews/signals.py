@@ -0,0 +1,48 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from titles.models import Title
+
+from api_yamdb.metrics import RATING_UPDATE
+
+from .models import Comment, Review
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    removed = None
+    if not created:
+        # Без загруженной оценки считаем, что она не менялась.
+        removed = getattr(instance, "_loaded_score", None) or instance.score
+    instance._loaded_score = instance.score
+    if removed != instance.score:
+        with RATING_UPDATE.time():
+            Title.objects.filter(pk=instance.title_id).update_score(
+                added=instance.score, removed=removed
+            )
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    if getattr(instance, "_parent_deleted", False):
+        return
+    with RATING_UPDATE.time():
+        Title.objects.filter(pk=instance.title_id).update_score(
+            removed=instance.score
+        )
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    if created:
+        Review.objects.filter(pk=instance.review_id).update(
+            comments_count=F("comments_count") + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    if not getattr(instance, "_parent_deleted", False):
+        Review.objects.filter(pk=instance.review_id).update(
+            comments_count=F("comments_count") - 1
+        )
@@ -0,0 +1,21 @@
+def bulk_create_dated(model, objs, **kwargs):
+    """
+    bulk_create, который сохраняет даты из объектов. Поля с auto_now_add
+    bulk_create перезаписывает текущим временем и в базе, и в объектах,
+    поэтому даты возвращаются вторым запросом по id. Строки, которые
+    не вставились из-за конфликта, этот UPDATE не трогает, если их id
+    в базе ещё нет.
+    """
+    fields = [
+        field.attname
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now_add", False)
+    ]
+    dates = [[getattr(obj, name) for name in fields] for obj in objs]
+    model.objects.bulk_create(objs, **kwargs)
+    if not fields or not objs:
+        return
+    for obj, values in zip(objs, dates):
+        for name, value in zip(fields, values):
+            setattr(obj, name, value)
+    model.objects.bulk_update(objs, fields)
@@ -0,0 +1,38 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:25
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_score_counters(apps, schema_editor):
+    Title = apps.get_model("titles", "Title")
+    titles = Title.objects.annotate(
+        actual_sum=Sum("reviews__score"), actual_count=Count("reviews")
+    ).filter(actual_count__gt=0)
+    for title in titles.iterator():
+        title.score_sum = title.actual_sum
+        title.reviews_count = title.actual_count
+        title.rating = title.actual_sum // title.actual_count
+        title.save(update_fields=["score_sum", "reviews_count", "rating"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("titles", "0001_initial"),
+        ("reviews", "0002_auto_20220421_2344"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="title",
+            name="reviews_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="title",
+            name="score_sum",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_score_counters, migrations.RunPython.noop),
+    ]
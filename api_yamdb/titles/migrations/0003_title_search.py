@@ -0,0 +1,77 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:40
+
+import sqlite3
+
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX titles_title_name_trgm ON titles_title "
+    "USING gin (UPPER(name) gin_trgm_ops)",
+    "CREATE INDEX titles_title_search ON titles_title "
+    "USING gin (to_tsvector('russian'::regconfig, "
+    "COALESCE(name, '') || ' ' || COALESCE(description, '')))",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS titles_title_search",
+    "DROP INDEX IF EXISTS titles_title_name_trgm",
+]
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE titles_title_fts USING fts5("
+    "name, description, content='titles_title', content_rowid='id', "
+    "tokenize='trigram')",
+    "CREATE TRIGGER titles_title_fts_insert AFTER INSERT ON titles_title "
+    "BEGIN INSERT INTO titles_title_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER titles_title_fts_delete AFTER DELETE ON titles_title "
+    "BEGIN INSERT INTO titles_title_fts(titles_title_fts, rowid, name, "
+    "description) VALUES ('delete', old.id, old.name, old.description); "
+    "END",
+    "CREATE TRIGGER titles_title_fts_update AFTER UPDATE OF name, "
+    "description ON titles_title "
+    "BEGIN INSERT INTO titles_title_fts(titles_title_fts, rowid, name, "
+    "description) VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO titles_title_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "INSERT INTO titles_title_fts(titles_title_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS titles_title_fts_update",
+    "DROP TRIGGER IF EXISTS titles_title_fts_delete",
+    "DROP TRIGGER IF EXISTS titles_title_fts_insert",
+    "DROP TABLE IF EXISTS titles_title_fts",
+]
+
+# Триграммный токенизатор FTS5 появился в SQLite 3.34.
+SQLITE_TRIGRAM_VERSION = (3, 34, 0)
+
+
+def run(statements_by_vendor):
+    def operation(apps, schema_editor):
+        connection = schema_editor.connection
+        if (
+            connection.vendor == "sqlite"
+            and sqlite3.sqlite_version_info < SQLITE_TRIGRAM_VERSION
+        ):
+            return
+        for statement in statements_by_vendor.get(connection.vendor, ()):
+            schema_editor.execute(statement)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("titles", "0002_title_score_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({"postgresql": POSTGRES_FORWARD, "sqlite": SQLITE_FORWARD}),
+            run({"postgresql": POSTGRES_BACKWARD, "sqlite": SQLITE_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("titles", "0003_title_search"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["category", "year"], name="title_category_year_idx"
+            ),
+        ),
+        # Фильтр по жанру идёт от жанра к произведениям, а автоматическая
+        # таблица связи индексирована только по (title_id, genre_id).
+        migrations.RunSQL(
+            "CREATE INDEX titles_title_genre_genre_title_idx "
+            "ON titles_title_genre (genre_id, title_id)",
+            "DROP INDEX titles_title_genre_genre_title_idx",
+        ),
+    ]
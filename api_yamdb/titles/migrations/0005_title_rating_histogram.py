@@ -0,0 +1,136 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:58
+
+from importlib import import_module
+
+import titles.models
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# SQLite добавляет столбцы, пересоздавая таблицу, и теряет триггеры,
+# которые держат в актуальном состоянии индекс FTS5 из 0003_title_search.
+title_search = import_module("titles.migrations.0003_title_search")
+SQLITE_FTS_TRIGGERS = [
+    statement
+    for statement in title_search.SQLITE_FORWARD
+    if statement.startswith("CREATE TRIGGER")
+]
+
+
+def restore_fts_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    title_search.run({"sqlite": SQLITE_FTS_TRIGGERS})(apps, schema_editor)
+
+
+def fill_rating_histogram(apps, schema_editor):
+    Title = apps.get_model("titles", "Title")
+    Review = apps.get_model("reviews", "Review")
+    for score in titles.models.SCORES:
+        counts = (
+            Review.objects.filter(title=OuterRef("pk"), score=score)
+            .order_by()
+            .values("title")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        Title.objects.update(
+            **{
+                titles.models.score_count_field(score): Coalesce(
+                    Subquery(counts), 0
+                )
+            }
+        )
+    fields = ["average_rating", "weighted_rating"]
+    for title in Title.objects.filter(reviews_count__gt=0).iterator():
+        histogram = {
+            score: getattr(title, titles.models.score_count_field(score))
+            for score in titles.models.SCORES
+        }
+        ratings = titles.models.rating_fields(histogram)
+        for field in fields:
+            setattr(title, field, ratings[field])
+        title.save(update_fields=fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("titles", "0004_title_filter_indexes"),
+        ("reviews", "0004_review_comments_count"),
+    ]
+
+    operations = [
+        # При откате триггеры теряются на удалении столбцов.
+        migrations.RunPython(migrations.RunPython.noop, restore_fts_triggers),
+        migrations.AddField(
+            model_name="title",
+            name="average_rating",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                editable=False,
+                max_digits=4,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="title",
+            name="weighted_rating",
+            field=models.FloatField(
+                default=titles.models.default_weighted_rating, editable=False
+            ),
+        ),
+        migrations.AddField(
+            model_name="title",
+            name="score_1_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="title",
+            name="score_2_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="title",
+            name="score_3_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="title",
+            name="score_4_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="title",
+            name="score_5_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="title",
+            name="score_6_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="title",
+            name="score_7_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="title",
+            name="score_8_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="title",
+            name="score_9_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="title",
+            name="score_10_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(restore_fts_triggers, migrations.RunPython.noop),
+        migrations.RunPython(fill_rating_histogram, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 2.2.16 on 2026-10-18 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("titles", "0005_title_rating_histogram"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(fields=["name", "id"], name="title_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(fields=["year", "id"], name="title_year_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["rating", "id"], name="title_rating_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["reviews_count", "id"], name="title_reviews_count_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["average_rating", "id"],
+                name="title_average_rating_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["weighted_rating", "id"],
+                name="title_weighted_rating_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["category", "weighted_rating", "id"],
+                name="title_category_top_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["year", "weighted_rating", "id"],
+                name="title_year_top_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.25 on 2026-10-18 06:45
+
+from django.db import migrations
+from django.db.models.expressions import F, OrderBy
+from titles.models import NullsOrderIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("titles", "0006_title_ordering_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="title",
+            name="title_rating_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="title",
+            name="title_average_rating_idx",
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=NullsOrderIndex(
+                OrderBy(F("rating"), nulls_first=True),
+                OrderBy(F("id")),
+                name="title_rating_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=NullsOrderIndex(
+                OrderBy(F("average_rating"), nulls_first=True),
+                OrderBy(F("id")),
+                name="title_average_rating_idx",
+            ),
+        ),
+    ]
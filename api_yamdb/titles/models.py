@@ -1,7 +1,120 @@
 from datetime import date as dt
+from decimal import ROUND_HALF_UP, Decimal
 
+from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import (Case, DecimalField, ExpressionWrapper, F,
+                              FloatField, IntegerField, Q, When)
+from django.db.models.expressions import OrderBy
+from django.db.models.functions import Cast
+
+# Оценки отзывов; гистограмма хранится по столбцу на оценку.
+SCORES = range(1, 11)
+CENTS = Decimal("0.01")
+
+
+def score_count_field(score):
+    return f"score_{score}_count"
+
+
+SCORE_COUNT_FIELDS = [score_count_field(score) for score in SCORES]
+
+# Поля, по которым можно сортировать список произведений.
+ORDERING_FIELDS = (
+    "name",
+    "year",
+    "rating",
+    "reviews_count",
+    "average_rating",
+    "weighted_rating",
+)
+# У произведений без отзывов эти поля NULL. Без явного NULLS FIRST/LAST
+# Postgres ставил бы их первыми при сортировке по убыванию, над лучшими.
+NULLABLE_ORDERING_FIELDS = ("rating", "average_rating")
+
+
+def ordering_expression(ordering):
+    """
+    Выражение для order_by по "поле" или "-поле": произведения без
+    оценок идут первыми по возрастанию и последними по убыванию на
+    любой базе, как в индексе (поле, id), который читается в обе
+    стороны без сортировки.
+    """
+    field = ordering.lstrip("-")
+    if field not in NULLABLE_ORDERING_FIELDS:
+        return ordering
+    if ordering.startswith("-"):
+        return F(field).desc(nulls_last=True)
+    return F(field).asc(nulls_first=True)
+
+
+class NullsOrderIndex(models.Index):
+    """
+    Индекс из выражений с NULLS FIRST/LAST. SQLite не принимает их
+    в индексе, но и так считает NULL наименьшими: там индекс создаётся
+    без них и читается для тех же сортировок.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "sqlite":
+            return super().create_sql(model, schema_editor, using, **kwargs)
+        return models.Index(
+            *(
+                OrderBy(expression.expression, expression.descending)
+                for expression in self.expressions
+            ),
+            name=self.name,
+        ).create_sql(model, schema_editor, using, **kwargs)
+
+
+def ordering_index(field):
+    name = f"title_{field}_idx"
+    if field in NULLABLE_ORDERING_FIELDS:
+        return NullsOrderIndex(
+            ordering_expression(field), F("id").asc(), name=name
+        )
+    return models.Index(fields=[field, "id"], name=name)
+
+
+def default_weighted_rating():
+    return settings.RATING_PRIOR_MEAN
+
+
+def weighted_rating(score_sum, reviews_count):
+    """
+    Байесовский рейтинг для ранжирования: к отзывам добавляются
+    RATING_PRIOR_WEIGHT отзывов со средней оценкой RATING_PRIOR_MEAN,
+    и у произведения с парой десяток не будет рейтинга выше, чем
+    у произведения с сотней девяток. Работает и с числами,
+    и с выражениями для UPDATE.
+    """
+    weight = settings.RATING_PRIOR_WEIGHT
+    return (weight * settings.RATING_PRIOR_MEAN + score_sum) / (
+        weight + reviews_count
+    )
+
+
+def rating_fields(histogram):
+    """Поля рейтинга произведения по гистограмме {оценка: отзывов}."""
+    reviews_count = sum(histogram.values())
+    score_sum = sum(score * count for score, count in histogram.items())
+    fields = {
+        score_count_field(score): histogram.get(score, 0) for score in SCORES
+    }
+    fields.update(
+        score_sum=score_sum,
+        reviews_count=reviews_count,
+        rating=None,
+        average_rating=None,
+        weighted_rating=weighted_rating(score_sum, reviews_count),
+    )
+    if reviews_count:
+        fields["rating"] = score_sum // reviews_count
+        fields["average_rating"] = (
+            Decimal(score_sum) / reviews_count
+        ).quantize(CENTS, ROUND_HALF_UP)
+    return fields
 
 
 class Category(models.Model):
@@ -20,6 +133,54 @@ class Genre(models.Model):
         return self.name
 
 
+class TitleQuerySet(models.QuerySet):
+    def update_score(self, added=None, removed=None):
+        """
+        Атомарно добавляет оценку added и убирает оценку removed:
+        сдвигает сумму оценок, число отзывов и гистограмму и в том же
+        UPDATE пересчитывает рейтинг, точное и взвешенное среднее.
+        """
+        count_delta = (added is not None) - (removed is not None)
+        score_sum = F("score_sum") + (added or 0) - (removed or 0)
+        reviews_count = F("reviews_count") + count_delta
+        # В WHEN стоит значение до UPDATE.
+        has_reviews = Q(reviews_count__gt=-count_delta)
+        # Среднее в сотых с округлением половины вверх, как в
+        # rating_fields(): целочисленное деление одинаково во всех базах.
+        average_cents = (score_sum * 200 + reviews_count) / (reviews_count * 2)
+        histogram = {}
+        if added is not None and added != removed:
+            histogram[score_count_field(added)] = (
+                F(score_count_field(added)) + 1
+            )
+        if removed is not None and removed != added:
+            histogram[score_count_field(removed)] = (
+                F(score_count_field(removed)) - 1
+            )
+        return self.update(
+            score_sum=score_sum,
+            reviews_count=reviews_count,
+            rating=Case(
+                When(has_reviews, then=score_sum / reviews_count),
+                default=None,
+                output_field=IntegerField(),
+            ),
+            average_rating=Case(
+                When(
+                    has_reviews,
+                    then=Cast(average_cents, FloatField()) / 100,
+                ),
+                default=None,
+                output_field=DecimalField(),
+            ),
+            weighted_rating=ExpressionWrapper(
+                weighted_rating(Cast(score_sum, FloatField()), reviews_count),
+                output_field=FloatField(),
+            ),
+            **histogram,
+        )
+
+
 class Title(models.Model):
     name = models.CharField(max_length=256)
     year = models.PositiveIntegerField(
@@ -27,11 +188,55 @@ class Title(models.Model):
         validators=[MinValueValidator(1), MaxValueValidator(dt.today().year)],
     )
     rating = models.IntegerField(default=None, null=True, blank=True)
+    score_sum = models.PositiveIntegerField(default=0, editable=False)
+    reviews_count = models.PositiveIntegerField(default=0, editable=False)
+    average_rating = models.DecimalField(
+        max_digits=4,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    weighted_rating = models.FloatField(
+        default=default_weighted_rating, editable=False
+    )
     description = models.TextField(blank=True)
     genre = models.ManyToManyField(Genre)
     category = models.ForeignKey(
         Category, on_delete=models.SET_NULL, related_name="titles", null=True
     )
 
+    objects = TitleQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["category", "year"], name="title_category_year_idx"
+            ),
+            # Сортировки списка: id в конце держит порядок стабильным
+            # между страницами, индекс читается в обе стороны.
+            *(ordering_index(field) for field in ORDERING_FIELDS),
+            # Топ внутри категории или года без сортировки в памяти.
+            models.Index(
+                fields=["category", "weighted_rating", "id"],
+                name="title_category_top_idx",
+            ),
+            models.Index(
+                fields=["year", "weighted_rating", "id"],
+                name="title_year_top_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.name
+
+    def histogram(self):
+        return {
+            score: getattr(self, score_count_field(score)) for score in SCORES
+        }
+
+
+for field in SCORE_COUNT_FIELDS:
+    Title.add_to_class(
+        field, models.PositiveIntegerField(default=0, editable=False)
+    )
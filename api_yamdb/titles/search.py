@@ -0,0 +1,106 @@
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVector, TrigramSimilarity)
+from django.db import connections
+from django.db.models import BooleanField, ExpressionWrapper, F, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+SEARCH_CONFIG = "russian"
+
+FTS_TABLE = "titles_title_fts"
+
+# Триграммный токенизатор FTS5 не находит подстроки короче трёх символов.
+FTS_MIN_LENGTH = 3
+
+
+def has_fts_table(alias):
+    """
+    Есть ли в базе FTS5-таблица. Её создаёт миграция 0003_title_search,
+    только если SQLite на момент миграции поддерживал триграммы, так что
+    версии библиотеки в процессе верить нельзя. Схема читается раз на
+    соединение напрямую через драйвер, как PRAGMA при открытии
+    соединения, и не входит в бюджет запросов представления.
+    """
+    connection = connections[alias]
+    if not hasattr(connection, "has_title_fts"):
+        connection.ensure_connection()
+        cursor = connection.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            [FTS_TABLE],
+        )
+        connection.has_title_fts = cursor.fetchone() is not None
+    return connection.has_title_fts
+
+
+def fts_phrase(value):
+    return '"{}"'.format(value.replace('"', '""'))
+
+
+def fts_filter(queryset, match):
+    """Оставляет найденные FTS5 произведения, лучшие по bm25 первыми."""
+    # id__in=RawSQL(...) дал бы "IN ((SELECT ...))", а это сравнение
+    # с одним значением, а не с подзапросом.
+    found = RawSQL(
+        f"titles_title.id IN (SELECT rowid FROM {FTS_TABLE} "
+        f"WHERE {FTS_TABLE} MATCH %s)",
+        [match],
+    )
+    return queryset.filter(
+        ExpressionWrapper(found, output_field=BooleanField())
+    ).annotate(
+        relevance=RawSQL(
+            f"SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = titles_title.id",
+            [match],
+            output_field=FloatField(),
+        )
+    )
+
+
+def filter_name(queryset, value):
+    """
+    Подстрока в названии без учёта регистра.
+    Postgres: GIN-индекс pg_trgm по UPPER(name), порядок по похожести.
+    SQLite: FTS5 с триграммным токенизатором.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        queryset = queryset.filter(name__icontains=value).annotate(
+            relevance=TrigramSimilarity("name", value)
+        )
+    elif (
+        vendor == "sqlite"
+        and len(value) >= FTS_MIN_LENGTH
+        and has_fts_table(queryset.db)
+    ):
+        queryset = fts_filter(queryset, f"name : {fts_phrase(value)}")
+    else:
+        return queryset.filter(name__icontains=value)
+    return queryset.order_by(F("relevance").desc(), "id")
+
+
+def search_titles(queryset, value):
+    """
+    Полнотекстовый поиск по названию и описанию с ранжированием.
+    Postgres: функциональный GIN-индекс по to_tsvector.
+    SQLite: FTS5, каждое слово ищется как подстрока.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        vector = SearchVector("name", "description", config=SEARCH_CONFIG)
+        query = SearchQuery(value, config=SEARCH_CONFIG)
+        queryset = (
+            queryset.annotate(document=vector)
+            .filter(document=query)
+            .annotate(relevance=SearchRank(vector, query))
+        )
+        return queryset.order_by(F("relevance").desc(), "id")
+
+    words = [word for word in value.split() if len(word) >= FTS_MIN_LENGTH]
+    if vendor == "sqlite" and words and has_fts_table(queryset.db):
+        queryset = fts_filter(queryset, " ".join(map(fts_phrase, words)))
+        return queryset.order_by(F("relevance").desc(), "id")
+    for word in value.split():
+        queryset = queryset.filter(
+            Q(name__icontains=word) | Q(description__icontains=word)
+        )
+    return queryset
@@ -14,3 +14,11 @@ class User(AbstractUser):
         blank=True,
     )
     role = models.CharField(max_length=100, choices=ROLE_CHOICES)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Имя на момент загрузки нужно, чтобы сбрасывать кеш отзывов
+        # и комментариев автора только при его переименовании.
+        instance._loaded_username = instance.__dict__.get("username")
+        return instance